@@ -0,0 +1,55 @@
+# Description: Benchmark the serial and thread pooled resampling of align.
+# Usage: python benchmarks/bench_align_parallel.py [--signals 64] [--samples 1e6] [--workers 2 4 8]
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from iplotProcessing.common.interpolation import InterpolationKind
+from iplotProcessing.core import BufferObject, Signal
+from iplotProcessing.math.pre_processing.grid_mixing import align
+
+
+def make_signals(num_signals: int, num_samples: int):
+    rng = np.random.default_rng(0)
+    signals = []
+    for i in range(num_signals):
+        # magnetic channels sampled with slightly different clocks
+        step = 1000 + (i % 7)
+        t = np.arange(num_samples, dtype=np.int64) * step + rng.integers(0, step)
+        sig = Signal()
+        sig.label = f"ch{i}:ds"
+        sig.data_store[0] = BufferObject(input_arr=t, unit='ns')
+        sig.data_store[1] = BufferObject(input_arr=rng.normal(size=num_samples), unit='T')
+        signals.append(sig)
+    return signals
+
+
+def timeit(num_signals: int, num_samples: int, kind: str, workers: int = None):
+    signals = make_signals(num_signals, num_samples)
+    start = time.perf_counter()
+    result = align(signals, signals[0], kind=kind, workers=workers)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel alignment.")
+    parser.add_argument('--signals', type=int, default=64)
+    parser.add_argument('--samples', type=float, default=1e5)
+    parser.add_argument('--kind', default=InterpolationKind.LINEAR)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{args.signals} signals x {int(args.samples)} samples, kind={args.kind}, {os.cpu_count()} cpus")
+    serial, reference = timeit(args.signals, int(args.samples), args.kind)
+    print(f"{'serial':>10}: {serial:.3f} s")
+    for workers in args.workers:
+        elapsed, result = timeit(args.signals, int(args.samples), args.kind, workers)
+        same = all(np.array_equal(result[k]['data'], reference[k]['data']) for k in reference)
+        print(f"{workers:>3} workers: {elapsed:.3f} s, speedup {serial / elapsed:.2f}x, identical: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# Description: Benchmark in-place augmented operators on signals against allocating binary operators.
+# Usage: python benchmarks/bench_augmented.py [--channels 200] [--samples 1e6]
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from iplotProcessing.core import BufferObject, Signal
+
+
+def make_signal(time_base: BufferObject, data: np.ndarray) -> Signal:
+    sig = Signal()
+    sig.data_store[0] = time_base
+    sig.data_store[1] = BufferObject(input_arr=data, unit='V')
+    return sig
+
+
+def accumulate(channels, inplace: bool):
+    """Sum the channels. Returns the sum, the elapsed time, the number of data buffers allocated for the sum
+    and the peak of the traced allocations in MB."""
+    acc = make_signal(channels[0].time, np.zeros(channels[0].data.size))
+    allocations = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    for ch in channels:
+        previous = acc.data
+        if inplace:
+            acc += ch
+        else:
+            acc = acc + ch
+        allocations += acc.data is not previous
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return acc, elapsed, allocations, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark augmented operators.")
+    parser.add_argument('--channels', type=int, default=200)
+    parser.add_argument('--samples', type=float, default=1e6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    time_base = BufferObject(input_arr=np.arange(int(args.samples), dtype=np.int64), unit='ns')
+    channels = [make_signal(time_base, rng.normal(size=int(args.samples))) for _ in range(args.channels)]
+
+    print(f"sum of {args.channels} channels x {int(args.samples)} samples")
+    results = {}
+    for name, inplace in (('acc = acc + ch', False), ('acc += ch', True)):
+        acc, elapsed, allocations, peak = accumulate(channels, inplace)
+        results[name] = acc.data
+        print(f"{name:>15}: {elapsed:.3f} s, {allocations} buffers allocated, peak {peak:.1f} MB")
+    print(f"identical: {np.array_equal(*results.values())}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# Description: Benchmark a table of expressions evaluated row by row with the parser and with the batch evaluator.
+# Usage: python benchmarks/bench_batch_evaluation.py [--rows 20] [--samples 1e6] [--refreshes 5]
+
+import argparse
+import time
+
+import numpy as np
+
+from iplotProcessing.tools import BatchEvaluator, Parser
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batch evaluation of expressions.")
+    parser.add_argument('--rows', type=int, default=20)
+    parser.add_argument('--samples', type=float, default=1e6)
+    parser.add_argument('--refreshes', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    values = {"ip": rng.random(int(args.samples)) * 1e6, "bt": rng.random(int(args.samples))}
+    rows = {f"row{i}": f"np.sqrt(${{ip}}/1e6 * ${{bt}}) * {i + 1}" for i in range(args.rows)}
+
+    p = Parser()
+    start = time.perf_counter()
+    for _ in range(args.refreshes):
+        rowwise = {alias: p.clear_expr().set_expression(expr).substitute_var(values).eval_expr().result
+                   for alias, expr in rows.items()}
+    rowwise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = BatchEvaluator(rows)
+    for _ in range(args.refreshes):
+        batched = batch.evaluate(values)
+    batch_time = time.perf_counter() - start
+
+    print(f"{args.rows} rows of {int(args.samples)} samples, {args.refreshes} refreshes, "
+          f"{batch.shared} shared subexpressions")
+    print(f" row by row: {rowwise_time:.3f} s")
+    print(f"      batch: {batch_time:.3f} s")
+    print(f"identical: {all(np.array_equal(rowwise[k], batched[k]) for k in rows)}")
+
+
+if __name__ == '__main__':
+    main()
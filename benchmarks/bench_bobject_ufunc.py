@@ -0,0 +1,39 @@
+# Description: Benchmark the per call overhead of ufuncs on buffer objects against plain ndarrays.
+# Usage: python benchmarks/bench_bobject_ufunc.py [--sizes 1 16 1024] [--number 100000]
+
+import argparse
+import timeit
+
+import numpy as np
+
+from iplotProcessing.core import BufferObject
+
+
+def per_call(stmt, number: int) -> float:
+    """Best of 5 runs, in microseconds per call."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark buffer object ufunc overhead.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 16, 1024])
+    parser.add_argument('--number', type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'op':>10} {'ndarray':>10} {'fast path':>10} {'generic':>10}  (us per call)")
+    for size in args.sizes:
+        arr = np.linspace(1., 2., size)
+        buf = BufferObject(input_arr=arr.copy(), unit='V')
+        cases = {
+            'a + b': (lambda: arr + arr, lambda: buf + buf, lambda: np.add(buf, buf, where=True)),
+            'a * 2.0': (lambda: arr * 2.0, lambda: buf * 2.0, lambda: np.multiply(buf, 2.0, where=True)),
+            'sin(a)': (lambda: np.sin(arr), lambda: np.sin(buf), lambda: np.sin(buf, where=True)),
+        }
+        # where=True is a no-op keyword that forces the generic __array_ufunc__ path.
+        for op, (plain, fast, generic) in cases.items():
+            print(f"{size:>6} {op:>10} {per_call(plain, args.number):>10.3f} {per_call(fast, args.number):>10.3f} "
+                  f"{per_call(generic, args.number):>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
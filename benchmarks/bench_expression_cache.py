@@ -0,0 +1,41 @@
+# Description: Benchmark the set up of repeated expressions by the parser with and without the compiled expression cache.
+# Usage: python benchmarks/bench_expression_cache.py [--rows 20] [--refreshes 500]
+
+import argparse
+import time
+
+from iplotProcessing.tools import Parser
+
+EXPRESSIONS = ["${ip}/1e6", "np.sqrt(${bx} * ${bx})", "${ip} - ${ip_ref} + 10ms", "np.mean(${te}) * ${ne}",
+               "np.abs(${a} - ${b}) / (${a} + ${b})"]
+
+
+def set_up(parser: Parser, expressions, refreshes: int, cached: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        if not cached:
+            parser.cache_clear()
+        for expr in expressions:
+            parser.clear_expr().set_expression(expr)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled expression cache of the parser.")
+    parser.add_argument('--rows', type=int, default=20)
+    parser.add_argument('--refreshes', type=int, default=500)
+    args = parser.parse_args()
+
+    expressions = [EXPRESSIONS[i % len(EXPRESSIONS)] for i in range(args.rows)]
+    p = Parser()
+    calls = args.rows * args.refreshes
+    uncached = set_up(p, expressions, args.refreshes, cached=False)
+    p.cache_clear()
+    cached = set_up(p, expressions, args.refreshes, cached=True)
+    print(f"{calls} set_expression calls of {len(set(expressions))} distinct expressions")
+    print(f"no cache: {uncached:.3f} s, {uncached / calls * 1e6:.1f} us per call")
+    print(f"   cache: {cached:.3f} s, {cached / calls * 1e6:.1f} us per call, {p.cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
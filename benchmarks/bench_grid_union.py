@@ -0,0 +1,63 @@
+# Description: Benchmark the grid union against the former list based implementation.
+# Usage: python benchmarks/bench_grid_union.py [--max-size 1e8] [--legacy-max-size 1e6]
+
+import argparse
+import time
+
+import numpy as np
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.math.pre_processing.grid_mixing import union
+
+
+def legacy_union(arrays):
+    tvec = []
+    vdtype = np.int64
+    for arr in arrays:
+        tvec.extend(arr.tolist())
+        if 'float' in str(arr.dtype):
+            vdtype = np.float64
+    return np.unique(np.array(tvec, dtype=vdtype))
+
+
+def make_bases(size: int, num_bases: int = 3):
+    t0 = 1_700_000_000_000_000_000
+    bases = []
+    for i in range(num_bases):
+        # overlapping, differently sampled ns time bases
+        step = 1000 + 7 * i
+        bases.append(BufferObject(t0 + i * 333 + np.arange(size, dtype=np.int64) * step, unit='ns'))
+    return bases
+
+
+def timeit(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the grid union.")
+    parser.add_argument('--max-size', type=float, default=1e7)
+    parser.add_argument('--legacy-max-size', type=float, default=1e6)
+    parser.add_argument('--num-bases', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'samples/base':>14} {'union [s]':>12} {'legacy [s]':>12} {'speedup':>8}")
+    size = 1000
+    while size <= args.max_size:
+        bases = make_bases(size, args.num_bases)
+        t_new = timeit(union, bases, repeat=3 if size < 1e7 else 1)
+        if size <= args.legacy_max_size:
+            t_old = timeit(legacy_union, bases, repeat=3 if size < 1e6 else 1)
+            print(f"{size:>14d} {t_new:>12.5f} {t_old:>12.5f} {t_old / t_new:>7.1f}x")
+        else:
+            print(f"{size:>14d} {t_new:>12.5f} {'-':>12} {'-':>8}")
+        size *= 10
+
+
+if __name__ == '__main__':
+    main()
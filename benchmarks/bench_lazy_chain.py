@@ -0,0 +1,43 @@
+# Description: Benchmark the eager and lazy evaluation of a chain of elementwise operators on buffer objects.
+# Usage: python benchmarks/bench_lazy_chain.py [--samples 1e7] [--chunk 65536]
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.core.lazy import lazy
+
+
+def measure(func):
+    """Elapsed time in s and peak of the traced allocations in MB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lazy expression evaluation.")
+    parser.add_argument('--samples', type=float, default=1e7)
+    parser.add_argument('--chunk', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    a, b, c, d = [BufferObject(input_arr=rng.random(int(args.samples)), unit='V') for _ in range(4)]
+
+    eager = measure(lambda: (a + b) * c - d)
+    lazy_ = measure(lambda: ((lazy(a) + b) * c - d).evaluate(args.chunk))
+    print(f"(a + b) * c - d on {int(args.samples)} samples")
+    for name, (elapsed, peak, _) in (('eager', eager), ('lazy', lazy_)):
+        print(f"{name:>6}: {elapsed:.3f} s, peak {peak:.1f} MB")
+    print(f"identical: {np.array_equal(eager[2], lazy_[2])}")
+
+
+if __name__ == '__main__':
+    main()
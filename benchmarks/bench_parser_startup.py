@@ -0,0 +1,53 @@
+# Description: Benchmark the start up of the expression parser, with the lazy namespace and with all modules loaded.
+#   A deep lookup is the validation of a name that is not a top level member, it uses the member index file
+#   in the user cache directory (IPLOT_CACHE_PATH) when it is up to date.
+# Usage: python benchmarks/bench_parser_startup.py [--repeat 3]
+
+import argparse
+import os
+import subprocess
+import sys
+
+from iplotProcessing.tools import parsers
+
+SCRIPT = """
+import time
+start = time.perf_counter()
+from iplotProcessing.tools import Parser
+parser = Parser()
+{load}
+ready = time.perf_counter()
+parser.clear_expr().set_expression("np.sin(${{x}}) + ${{y}} / 1e6").substitute_var({{"x": 1., "y": 2.}}).eval_expr()
+evaluated = time.perf_counter()
+parser.is_supported("iplot_undefined_name")
+print(ready - start, evaluated - ready, time.perf_counter() - evaluated)
+"""
+
+
+def run(load: str):
+    """Start up, first evaluation and deep lookup times in s, measured in a new interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    out = subprocess.run([sys.executable, "-c", SCRIPT.format(load=load)], capture_output=True, text=True, env=env,
+                         check=True).stdout
+    return [float(v) for v in out.split()[-3:]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parser start up.")
+    parser.add_argument('--repeat', type=int, default=3, help="at least 2, the first run builds the index")
+    args = parser.parse_args()
+
+    index_path = parsers.MEMBER_INDEX_JSON
+    for name, load in (('lazy', ''), ('loaded', 'parser.supported_members.load_all()')):
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        runs = [run(load) for _ in range(args.repeat)]
+        startup = min(r[0] for r in runs)
+        first = min(r[1] for r in runs)
+        indexed = min(r[2] for r in runs[1:])
+        print(f"{name:>6}: start up {startup:.3f} s, first evaluation {first * 1e3:.1f} ms, "
+              f"deep lookup without index {runs[0][2] * 1e3:.1f} ms, with index {indexed * 1e3:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+# Description: Define block reductions.
+
+class BlockReduction:
+    MIN = "min"
+    MAX = "max"
+    MEAN = "mean"
+    # population standard deviation, ddof=0
+    STD = "std"
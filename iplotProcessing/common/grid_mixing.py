@@ -4,3 +4,9 @@
 class GridAlignmentMode:
     INTERSECTION = "intersection"
     UNION = "union"
+    # real samples of every base inside the window where all bases overlap
+    OVERLAP_UNION = "overlap-union"
+    # real samples of the densest base inside the window where all bases overlap
+    OVERLAP_DENSEST = "overlap-densest"
+    # union of the bases reduced to a point budget inside a visible window, for plotting
+    BUDGET = "budget"
@@ -0,0 +1,82 @@
+# Description: Precision policy of compact buffer objects, ex: 16-bit ADC channels stored as int16 instead of float64.
+#   Data is kept in a compact storage dtype and only upcast inside the kernels that need it:
+#   - add, subtract, multiply, power and shifts of integers narrower than 32 bits are computed in int64,
+#     so int16 + int16 does not wrap around. int32 and int64 arithmetic and integer arithmetic with a float operand
+#     follow numpy, so int32 buffers keep their size and int32 += int32 runs in place.
+#   - sum and product reductions (np.sum, np.mean, np.std, ...) of float16/float32 accumulate in float64.
+#     Integer sums accumulate in int64, as in numpy.
+#   - min, max, comparisons and float32 arithmetic stay in the storage dtype.
+#   - interpolation upcasts integers to float64 and keeps float32 (see math/compute/interpolation.py).
+#   - block means and standard deviations accumulate in float64 (see math/pre_processing/binning.py).
+
+import typing
+
+import numpy as np
+
+# Ufuncs computed in int64 on integers narrower than int32, ex: int16 ADC samples
+WIDENED_UFUNCS = (np.add, np.subtract, np.multiply, np.power, np.left_shift, np.square, np.negative)
+
+# Ufuncs whose reductions accumulate narrow floats in float64
+ACCUMULATED_UFUNCS = (np.add, np.multiply)
+
+# Candidate storage dtypes, the first one that holds the values exactly is used.
+INTEGER_STORAGE = (np.int8, np.int16, np.int32)
+
+
+def arithmetic_dtype(ufunc: np.ufunc, inputs: typing.Sequence) -> typing.Optional[np.dtype]:
+    """int64 when ufunc would compute on integer operands only, one of them an array narrower than int32,
+    else None: numpy decides."""
+    if ufunc not in WIDENED_UFUNCS:
+        return None
+    narrow = False
+    for value in inputs:
+        dtype = getattr(value, 'dtype', None)
+        if dtype is None:
+            if not isinstance(value, (int, bool)):
+                return None
+        elif dtype.kind not in 'iu' or (dtype.kind == 'u' and dtype.itemsize == 8):
+            return None
+        elif dtype.itemsize < 4 and not isinstance(value, np.generic):
+            # an array, or an array expression
+            narrow = True
+    return np.dtype(np.int64) if narrow else None
+
+
+def accumulation_dtype(ufunc: np.ufunc, dtype: np.dtype) -> typing.Optional[np.dtype]:
+    """float64 for sum/product reductions of float16/float32, else None: numpy decides."""
+    if ufunc in ACCUMULATED_UFUNCS and dtype.kind == 'f' and dtype.itemsize < 8:
+        return np.dtype(np.float64)
+    return None
+
+
+def compact_dtype(values: np.ndarray) -> np.dtype:
+    """The smallest dtype that holds values exactly: int8/16/32 for integer values, float32 when
+    the values survive a round trip, otherwise the dtype of values."""
+    values = np.asarray(values)
+    if not values.size or values.dtype.kind not in 'iuf':
+        return values.dtype
+    vmin, vmax = values.min(), values.max()
+    if values.dtype.kind == 'f' and not (np.isfinite(vmin) and np.isfinite(vmax) and np.all(values == np.trunc(values))):
+        if values.dtype.itemsize > 4 and np.array_equal(values.astype(np.float32), values):
+            return np.dtype(np.float32)
+        return values.dtype
+    for dtype in INTEGER_STORAGE:
+        info = np.iinfo(dtype)
+        if info.min <= vmin and vmax <= info.max:
+            return np.dtype(dtype) if np.dtype(dtype).itemsize < values.dtype.itemsize else values.dtype
+    return values.dtype
+
+
+def to_storage(values: np.ndarray, dtype=None) -> np.ndarray:
+    """values in the storage dtype, compact_dtype(values) by default.
+    Integer storage must hold the values exactly, float storage may round them."""
+    values = np.asarray(values)
+    dtype = compact_dtype(values) if dtype is None else np.dtype(dtype)
+    if dtype == values.dtype:
+        return values
+    if dtype.kind in 'iu' and values.size:
+        info = np.iinfo(dtype)
+        vmin, vmax = values.min(), values.max()
+        if vmin < info.min or vmax > info.max or (values.dtype.kind == 'f' and np.any(values != np.trunc(values))):
+            raise ValueError(f"The values do not fit in {dtype} without loss")
+    return values.astype(dtype)
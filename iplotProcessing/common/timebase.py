@@ -0,0 +1,51 @@
+# Description: Native time base arithmetic. Keeps int64 (ex: ns since epoch) and datetime64 time bases
+#   in their own dtype, absolute CODAC timestamps (~1.7e18 ns) do not fit in the 53 bits mantissa of a float64.
+
+import numpy as np
+import typing
+
+from iplotLogging import setupLogger
+
+logger = setupLogger.get_logger(__name__, "INFO")
+
+
+def is_time_dtype(dtype) -> bool:
+    return np.issubdtype(dtype, np.datetime64) or np.issubdtype(dtype, np.timedelta64)
+
+
+def common_dtype(arrays: typing.List[np.ndarray]) -> np.dtype:
+    """The dtype that holds all the bases without loss.
+    Integer and datetime64 bases stay integer and datetime64. Mixing integer and float bases falls back
+    to float64, which is logged since it loses precision on absolute timestamps."""
+    dtypes = [arr.dtype for arr in arrays]
+    vdtype = np.result_type(*dtypes)
+    if np.issubdtype(vdtype, np.inexact) and any(np.issubdtype(dtype, np.integer) for dtype in dtypes):
+        logger.warning(f"Mixing integer and floating point time bases {set(str(d) for d in dtypes)}, "
+                       f"using {vdtype}")
+    return vdtype
+
+
+def offsets(arr: np.ndarray, origin) -> np.ndarray:
+    """Float64 offsets of arr relative to origin.
+    The difference is taken in the native dtype, only the (small) offsets are converted to float."""
+    return np.asarray(np.asarray(arr) - origin, dtype=np.float64)
+
+
+def linspace(vmin, vmax, num: int, dtype=None, start: int = 0, stop: int = None) -> np.ndarray:
+    """np.linspace(vmin, vmax, num, dtype=dtype)[start:stop] computed in the native dtype.
+    For integer and datetime64 dtypes, the float offsets from vmin are floored before they are added
+    to vmin, so the values are exact to the unit and the last one is vmax."""
+    dtype = np.result_type(vmin, vmax) if dtype is None else np.dtype(dtype)
+    if np.issubdtype(dtype, np.inexact):
+        return np.linspace(vmin, vmax, num, dtype=dtype)[start:stop]
+
+    stop = num if stop is None else min(stop, num)
+    vmin = np.asarray(vmin).astype(dtype)
+    span = int(np.asarray(np.asarray(vmax).astype(dtype) - vmin).astype(np.int64))
+    k = np.arange(start, stop)
+    steps = np.floor(k * (span / (num - 1))).astype(np.int64) if num > 1 else np.zeros(k.size, dtype=np.int64)
+    steps[k == num - 1] = span
+
+    if np.issubdtype(dtype, np.datetime64):
+        return vmin + steps.astype(f"m8[{np.datetime_data(dtype)[0]}]")
+    return (vmin + steps).astype(dtype, copy=False)
@@ -1,8 +1,33 @@
 # Description: Standard date, time units used in pandas and numpy.
 # Author: Jaswant Sai Panchumarti
 
+import functools
+import typing
+from fractions import Fraction
+
 DATE = ['Y', 'M', 'W', 'D']
 TIME = ['h', 'm', 's']
 PRECISE_TIME = ['ms', 'us', 'ns']
 DATE_TIME = [*DATE, *TIME]
 DATE_TIME_PRECISE = [*DATE_TIME, *PRECISE_TIME]
+
+# Length of the units in ns. Y and M are the average gregorian year and month, as in numpy.
+UNIT_NS = {
+    'Y': 31556952 * 10 ** 9,
+    'M': 2629746 * 10 ** 9,
+    'W': 604800 * 10 ** 9,
+    'D': 86400 * 10 ** 9,
+    'h': 3600 * 10 ** 9,
+    'm': 60 * 10 ** 9,
+    's': 10 ** 9,
+    'ms': 10 ** 6,
+    'us': 10 ** 3,
+    'ns': 1,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_conversion_factor(from_unit: str, to_unit: str) -> typing.Union[int, float]:
+    """The factor that converts values in from_unit to to_unit, an int when the ratio is a whole number."""
+    ratio = Fraction(UNIT_NS[from_unit], UNIT_NS[to_unit])
+    return ratio.numerator if ratio.denominator == 1 else float(ratio)
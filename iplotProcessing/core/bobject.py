@@ -1,8 +1,24 @@
 # Description: Combine unit attribute with numpy array
 # Author: Jaswant Sai Panchumarti
 
+import pickle
+
 import numpy as np
 
+from iplotProcessing.common import precision
+from iplotProcessing.common.binning import BlockReduction
+from iplotProcessing.math.expressions import augmented
+
+# Operand types that ndarray.__array_ufunc__ handles without deferring to another implementation.
+_FAST_TYPES = (np.ndarray, int, float, complex, bool, np.float64, np.float32, np.int64, np.int32)
+
+
+def _rebuild(buffer, dtype: np.dtype, shape: tuple, order: str, attrs: dict) -> 'BufferObject':
+    """Unpickle a buffer object from its raw bytes, without a copy when the bytes were sent out-of-band."""
+    obj = np.frombuffer(buffer, dtype=dtype).reshape(shape, order=order).view(BufferObject)
+    obj.__dict__.update(attrs)
+    return obj
+
 
 class BufferObject(np.ndarray):
     """A container of the data values
@@ -24,6 +40,78 @@ class BufferObject(np.ndarray):
         super().__init__(**kwargs)
         self.unit = unit
 
+    # In-place when the result fits in the buffer, otherwise a new buffer object is returned and a memory map
+    # or shared memory under this buffer is not written, see math/expressions/augmented.py.
+    __iadd__ = augmented.add
+    __isub__ = augmented.sub
+    __imul__ = augmented.mul
+    __itruediv__ = augmented.truediv
+    __ifloordiv__ = augmented.floordiv
+    __imod__ = augmented.mod
+    __ipow__ = augmented.power
+    __ilshift__ = augmented.lshift
+    __irshift__ = augmented.rshift
+    __iand__ = augmented.logical_and
+    __ixor__ = augmented.logical_xor
+    __ior__ = augmented.logical_or
+
+    def __reduce_ex__(self, protocol):
+        """Pickle the unit and the other attributes with the data. With protocol 5, the data of a contiguous
+        buffer is exposed as an out-of-band pickle.PickleBuffer, so a buffer_callback can move it without a copy."""
+        if protocol < 5 or self.dtype.hasobject or not (self.flags.c_contiguous or self.flags.f_contiguous):
+            return self.__reduce__()
+        order = 'F' if self.flags.f_contiguous and not self.flags.c_contiguous else 'C'
+        # raw bytes, since datetime64 arrays do not export a buffer.
+        data = self.view(np.ndarray).ravel(order='K').view(np.uint8)
+        return _rebuild, (pickle.PickleBuffer(data), self.dtype, self.shape, order, dict(self.__dict__))
+
+    def __reduce__(self):
+        reconstruct, args, state = super().__reduce__()
+        return reconstruct, args, (state, dict(self.__dict__))
+
+    def __setstate__(self, state):
+        # pickles written before __reduce__ was defined hold the ndarray state only.
+        if len(state) == 2 and isinstance(state[1], dict):
+            state, attrs = state
+            self.__dict__.update(attrs)
+        super().__setstate__(state)
+
+    def compact(self, storage_dtype=None) -> 'BufferObject':
+        """The buffer in storage_dtype, by default the smallest dtype that holds the values exactly,
+        ex: int16 for 16-bit ADC values. See common/precision.py for the dtypes used in computations."""
+        obj = precision.to_storage(self.view(np.ndarray), storage_dtype).view(BufferObject)
+        obj.__dict__.update(self.__dict__)
+        return obj
+
+    def block_reduce(self, time=None, block_size: int = None, block_duration=None,
+                     reductions=(BlockReduction.MIN, BlockReduction.MAX)) -> tuple:
+        """Reduce the buffer per block of samples or per time window of the time base, by default the sample
+        indices. Returns the time base of the blocks and a buffer object per reduction, see
+        math/pre_processing/binning.py."""
+        from iplotProcessing.math.pre_processing.binning import block_reduce
+        time = np.arange(self.shape[0] if self.ndim else 0) if time is None else time
+        return block_reduce(time, self, block_size, block_duration, reductions)
+
+    @classmethod
+    def from_memmap(cls, mm: np.memmap, unit: str = '') -> 'BufferObject':
+        """A buffer object on top of the memory map mm. Nothing is read, pages are loaded
+        when the elements are accessed, ex: for the slice of a time window."""
+        obj = mm.view(cls)
+        obj.unit = unit
+        return obj
+
+    @classmethod
+    def from_file(cls, filename: str, unit: str = '', dtype=None, shape=None, offset: int = 0,
+                  mode: str = 'r') -> 'BufferObject':
+        """Memory map an archived signal, either a .npy file or a raw binary file of dtype (float64 by default).
+        The file is not read in, see from_memmap."""
+        if str(filename).endswith('.npy'):
+            mm = np.load(filename, mmap_mode=mode)
+        else:
+            mm = np.memmap(filename, dtype=np.float64 if dtype is None else dtype, mode=mode, offset=offset,
+                           shape=shape)
+        return cls.from_memmap(mm, unit=unit)
+
     def __array_finalize__(self, obj):
         if obj is None:
             return
@@ -35,6 +123,11 @@ class BufferObject(np.ndarray):
         """this implementation of __array_ufunc__ makes sure that all custom attributes
         are maintained when a ufunc operation is performed on our class."""
 
+        if method == '__call__' and not kwargs and ufunc.nout == 1 and len(inputs) <= 2:
+            result = self._fast_call(ufunc, inputs)
+            if result is not NotImplemented:
+                return result
+
         args = ((i.view(np.ndarray) if isinstance(i, BufferObject) else i)
                 for i in inputs)
         """
@@ -50,6 +143,15 @@ class BufferObject(np.ndarray):
                 o, BufferObject) else o) for o in outputs)
         else:
             outputs = (None,) * ufunc.nout
+        if 'out' not in kwargs and kwargs.get('dtype') is None and kwargs.get('signature') is None:
+            # compact storage dtypes are upcast where needed, see common/precision.py
+            dtype = None
+            if method == '__call__':
+                dtype = precision.arithmetic_dtype(ufunc, inputs)
+            elif method in ('reduce', 'accumulate', 'reduceat'):
+                dtype = precision.accumulation_dtype(ufunc, np.asarray(inputs[0]).dtype)
+            if dtype is not None:
+                kwargs['dtype'] = dtype
         results = super().__array_ufunc__(ufunc, method, *args,
                                           **kwargs)  # pylint: disable=no-member
         if results is NotImplemented:
@@ -107,6 +209,34 @@ class BufferObject(np.ndarray):
             #                 result.unit = 'ns'
         return results[0] if len(results) == 1 else results
 
+    def _fast_call(self, ufunc, inputs):
+        """Plain call of a single output ufunc on one or two operands, ex: a + b or np.sin(a).
+        Skips the generic handling of out, at and multiple outputs, which dominates for small arrays."""
+        if len(inputs) == 1:
+            if type(inputs[0]) is not BufferObject:
+                return NotImplemented
+            args = (inputs[0].view(np.ndarray),)
+        else:
+            a, b = inputs
+            if type(a) not in _FAST_TYPES and type(a) is not BufferObject \
+                    or type(b) not in _FAST_TYPES and type(b) is not BufferObject:
+                return NotImplemented
+            args = (a.view(np.ndarray) if type(a) is BufferObject else a,
+                    b.view(np.ndarray) if type(b) is BufferObject else b)
+
+        dtype = precision.arithmetic_dtype(ufunc, args) if ufunc in precision.WIDENED_UFUNCS else None
+        result = ufunc(*args) if dtype is None else ufunc(*args, dtype=dtype)
+
+        # Cast a scalar or 0D array to a shape (1,) buffer object.
+        if not isinstance(result, np.ndarray) or not result.ndim:
+            result = np.asarray(result).reshape(1)
+        result = result.view(BufferObject)
+        if len(self.__dict__) > 1:
+            result.__dict__.update(self.__dict__)
+        # [IDV-280](https://jira.iter.org/browse/IDV-280). Clear unit attribute when processing occurs.
+        result.unit = ''
+        return result
+
     def _copy_attrs_to(self, target):
         """copies all attributes of self to the target object. target must be a (subclass of) ndarray"""
         target = target.view(BufferObject)
@@ -0,0 +1,240 @@
+# Description: Opt-in lazy evaluation of elementwise expressions on buffer objects and signals.
+#   Operators on a LazyExpr build a small graph of ufunc calls instead of computing right away.
+#   The graph is evaluated in cache sized chunks of the output into a single output buffer,
+#   so a long chain like (a + b) * c - d does not allocate a full size temporary at every step.
+
+import numpy as np
+
+from iplotProcessing.common import precision
+from iplotProcessing.core.bobject import BufferObject
+from iplotProcessing.core.signal import Signal
+from iplotProcessing.math.expressions import binary, reflected, unary
+
+# Number of output elements computed per chunk. The temporaries of a chunk stay in the cpu cache.
+CHUNK_ELEMENTS = 1 << 16
+
+
+class LazyExpr:
+    """A node of an elementwise expression graph: a ufunc applied to operands, or a leaf holding an array.
+    Operands are lazy expressions, arrays or scalars. The shape and dtype of the result are known up front."""
+
+    __slots__ = ('ufunc', 'operands', 'shape', 'dtype', 'kwargs')
+
+    def __init__(self, value=None, ufunc: np.ufunc = None, operands: tuple = ()):
+        self.ufunc = ufunc
+        self.kwargs = {}
+        if ufunc is None:
+            value = value if isinstance(value, np.ndarray) else np.asarray(value)
+            self.operands = (value,)
+            self.shape = value.shape
+            self.dtype = value.dtype
+        else:
+            self.operands = operands
+            self.shape = np.broadcast_shapes(*[np.shape(op) for op in operands])
+            # narrow integers are widened as in the eager call, see common/precision.py
+            dtype = precision.arithmetic_dtype(ufunc, operands)
+            if dtype is not None:
+                self.kwargs = {'dtype': dtype}
+            # result dtype of the ufunc, with the same scalar promotion rules as the eager call.
+            dummies = [np.zeros(1, dtype=op.dtype) if isinstance(op, (LazyExpr, np.ndarray)) else op
+                       for op in operands]
+            with np.errstate(all='ignore'):
+                self.dtype = np.asarray(ufunc(*dummies, **self.kwargs)).dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        name = 'leaf' if self.ufunc is None else self.ufunc.__name__
+        return f"LazyExpr({name}, shape={self.shape}, dtype={self.dtype})"
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs or ufunc.nout != 1 or ufunc.signature is not None:
+            # reductions, out=, matmul, ... are computed right away.
+            inputs = [evaluate(i) for i in inputs]
+            if 'out' in kwargs:
+                kwargs['out'] = tuple(evaluate(o) for o in kwargs['out'])
+            return getattr(ufunc, method)(*inputs, **kwargs)
+        if any(isinstance(i, Signal) for i in inputs):
+            return NotImplemented
+        return LazyExpr(ufunc=ufunc, operands=tuple(_as_operand(i) for i in inputs))
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.evaluate(), dtype=dtype)
+
+    def evaluate(self, chunk_size: int = None, out: np.ndarray = None) -> BufferObject:
+        """Compute the expression, chunk_size elements of the output at a time (CHUNK_ELEMENTS by default).
+        A leaf returns its array. Like any processing, the result has no unit (IDV-280)."""
+        if self.ufunc is None:
+            return self.operands[0]
+        if out is None:
+            out = np.empty(self.shape, dtype=self.dtype).view(BufferObject)
+        elif out.shape != self.shape:
+            raise ValueError(f"Output shape {out.shape} does not match the expression shape {self.shape}")
+
+        rows = self.shape[0] if self.ndim else 0
+        if rows < 2:
+            np.copyto(out, _evaluate_full(self, {}), casting='unsafe')
+        else:
+            row_size = max(1, self.size // rows)
+            chunk_rows = max(1, (CHUNK_ELEMENTS if chunk_size is None else chunk_size) // row_size)
+            _evaluate_chunked(self, out, chunk_rows)
+
+        if isinstance(out, BufferObject):
+            out.unit = ''
+        return out
+
+    __add__ = binary.add
+    __sub__ = binary.sub
+    __mul__ = binary.mul
+    __matmul__ = binary.matmul
+    __truediv__ = binary.truediv
+    __floordiv__ = binary.floordiv
+    __mod__ = binary.mod
+    __divmod__ = binary.div_mod
+    __pow__ = binary.power
+    __lshift__ = binary.lshift
+    __rshift__ = binary.rshift
+    __and__ = binary.logical_and
+    __xor__ = binary.logical_xor
+    __or__ = binary.logical_or
+
+    __radd__ = reflected.add
+    __rsub__ = reflected.sub
+    __rmul__ = reflected.mul
+    __rmatmul__ = reflected.matmul
+    __rtruediv__ = reflected.truediv
+    __rfloordiv__ = reflected.floordiv
+    __rmod__ = reflected.mod
+    __rdivmod__ = reflected.div_mod
+    __rpow__ = reflected.power
+    __rlshift__ = reflected.lshift
+    __rrshift__ = reflected.rshift
+    __rand__ = reflected.logical_and
+    __rxor__ = reflected.logical_xor
+    __ror__ = reflected.logical_or
+
+    __neg__ = unary.neg
+    __abs__ = unary.absolute
+    __invert__ = unary.invert
+
+
+def _as_operand(value):
+    if isinstance(value, (LazyExpr, np.ndarray)):
+        return value
+    if np.isscalar(value):
+        return value
+    return np.asarray(value)
+
+
+def _value(op, values: dict):
+    return values[id(op)] if isinstance(op, LazyExpr) else op
+
+
+def _evaluate_full(expr: LazyExpr, values: dict):
+    """Evaluate expr in one pass, every node once."""
+    if id(expr) in values:
+        return values[id(expr)]
+    if expr.ufunc is None:
+        result = expr.operands[0]
+    else:
+        for op in expr.operands:
+            if isinstance(op, LazyExpr):
+                _evaluate_full(op, values)
+        result = expr.ufunc(*[np.asarray(_value(op, values)) if isinstance(op, (LazyExpr, np.ndarray)) else op
+                              for op in expr.operands], **expr.kwargs)
+    values[id(expr)] = result
+    return result
+
+
+def _evaluate_chunked(expr: LazyExpr, out: np.ndarray, chunk_rows: int):
+    """Evaluate expr by slices of chunk_rows along the first axis of the output.
+    Nodes that broadcast along the first axis do not depend on the slice and are evaluated once beforehand."""
+    rows = expr.shape[0]
+    constants = {}
+    steps = []
+    seen = set()
+
+    def is_chunked(node) -> bool:
+        return len(np.shape(node)) == expr.ndim and np.shape(node)[0] == rows
+
+    def visit(node: LazyExpr):
+        if id(node) in seen:
+            return
+        seen.add(id(node))
+        if not is_chunked(node):
+            _evaluate_full(node, constants)
+            return
+        if node.ufunc is not None:
+            for op in node.operands:
+                if isinstance(op, LazyExpr):
+                    visit(op)
+            steps.append(node)
+
+    visit(expr)
+    # scratch buffers of the intermediate nodes, reused for every chunk.
+    scratch = {id(node): np.empty((min(chunk_rows, rows),) + node.shape[1:], dtype=node.dtype)
+               for node in steps[:-1]}
+    dest = out.view(np.ndarray)
+
+    def operand(op, start: int, stop: int, values: dict):
+        if isinstance(op, LazyExpr):
+            if id(op) in values:
+                return values[id(op)]
+            if id(op) in constants:
+                return np.asarray(constants[id(op)])
+            return np.asarray(op.operands[0])[start:stop]
+        if isinstance(op, np.ndarray) and is_chunked(op):
+            return op.view(np.ndarray)[start:stop]
+        return op.view(np.ndarray) if isinstance(op, np.ndarray) else op
+
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+        values = {}
+        for node in steps:
+            target = dest[start:stop] if node is expr else scratch[id(node)][:stop - start]
+            node.ufunc(*[operand(op, start, stop, values) for op in node.operands], out=target, casting='unsafe',
+                       **node.kwargs)
+            values[id(node)] = target
+
+
+def lazy(obj):
+    """Switch obj to lazy evaluation. A buffer object or an array becomes a LazyExpr leaf.
+    A signal is copied with its dependent data as LazyExpr leaves, its independent data is kept."""
+    if isinstance(obj, LazyExpr):
+        return obj
+    if isinstance(obj, Signal):
+        sig = type(obj)()
+        sig._alias_map = dict(obj.alias_map)
+        sig._data = list(obj.data_store)
+        for idx in obj.dependent_accessors:
+            sig._data[idx] = LazyExpr(obj.data_store[idx])
+        return sig
+    return LazyExpr(obj)
+
+
+def evaluate(obj, chunk_size: int = None):
+    """Compute the lazy expressions of obj. A LazyExpr becomes a buffer object.
+    A signal gets its lazy dependent data computed in place and is returned. Anything else is returned as is."""
+    if isinstance(obj, LazyExpr):
+        return obj.evaluate(chunk_size)
+    if isinstance(obj, Signal):
+        for idx, value in enumerate(obj.data_store):
+            if isinstance(value, LazyExpr):
+                obj.data_store[idx] = value.evaluate(chunk_size)
+        return obj
+    return obj
+
+
+def is_lazy(obj) -> bool:
+    if isinstance(obj, Signal):
+        return any(isinstance(value, LazyExpr) for value in obj.data_store)
+    return isinstance(obj, LazyExpr)
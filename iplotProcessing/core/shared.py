@@ -0,0 +1,118 @@
+# Description: Buffer objects allocated in shared memory, handed to worker processes without copying the data.
+#   The process that allocates a buffer owns the segment and unlinks it once the buffer, its views and its handles
+#   are gone. Other processes attach to the segment through a picklable SharedHandle and only close it.
+
+import sys
+import threading
+import typing
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .bobject import BufferObject
+
+_TRACKER_LOCK = threading.Lock()
+
+
+class _SharedRoot(np.ndarray):
+    """The ndarray directly on top of a shared memory segment. Every buffer object and view refers to it,
+    so the segment is released when it is collected."""
+    _shm = None
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Before python 3.13, attaching registers the segment with the resource tracker,
+    # which would unlink it when the attaching process exits.
+    with _TRACKER_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _release(shm: shared_memory.SharedMemory, unlink: bool):
+    shm.close()
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _wrap(shm: shared_memory.SharedMemory, shape: tuple, dtype, unit: str, owner: bool) -> BufferObject:
+    root = np.ndarray(shape, dtype=dtype, buffer=shm.buf).view(_SharedRoot)
+    root._shm = shm
+    weakref.finalize(root, _release, shm, owner)
+    obj = root.view(BufferObject)
+    obj.unit = unit
+    return obj
+
+
+def _get_root(buffer: np.ndarray) -> typing.Optional[_SharedRoot]:
+    base = buffer
+    while base is not None and not isinstance(base, _SharedRoot):
+        base = base.base
+    return base
+
+
+class SharedHandle:
+    """A picklable reference to a buffer object in shared memory: the segment name, shape, dtype and unit.
+    In the owner process, the handle keeps the segment alive. Call attach in another process to get
+    a buffer object on the same memory."""
+
+    __slots__ = ('name', 'shape', 'dtype', 'unit', '_root')
+
+    def __init__(self, name: str, shape: tuple, dtype: str, unit: str = '', root: _SharedRoot = None):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.unit = unit
+        self._root = root
+
+    def __reduce__(self):
+        return SharedHandle, (self.name, self.shape, self.dtype, self.unit)
+
+    def __repr__(self) -> str:
+        return f"SharedHandle(name={self.name!r}, shape={self.shape}, dtype={self.dtype!r}, unit={self.unit!r})"
+
+    def attach(self) -> BufferObject:
+        """A buffer object on the shared segment. No data is copied."""
+        if self._root is not None:
+            obj = self._root.view(BufferObject)
+            obj.unit = self.unit
+            return obj
+        return _wrap(_open(self.name), self.shape, self.dtype, self.unit, owner=False)
+
+
+def allocate_shared(shape, dtype=np.float64, unit: str = '') -> BufferObject:
+    """A zero initialized buffer object in a new shared memory segment owned by this process."""
+    shape = (shape,) if np.isscalar(shape) else tuple(shape)
+    dtype = np.dtype(dtype)
+    nbytes = max(1, int(np.prod(shape, dtype=np.int64)) * dtype.itemsize)
+    shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    return _wrap(shm, shape, dtype, unit, owner=True)
+
+
+def to_shared(arr: np.ndarray, unit: str = None) -> BufferObject:
+    """Copy arr into a new shared memory segment. The unit of arr is kept unless unit is given."""
+    unit = getattr(arr, 'unit', '') if unit is None else unit
+    arr = np.asarray(arr)
+    obj = allocate_shared(arr.shape, arr.dtype, unit)
+    obj[...] = arr
+    return obj
+
+
+def get_handle(buffer: BufferObject) -> SharedHandle:
+    """The handle of a buffer object allocated by allocate_shared or to_shared, or attached from a handle."""
+    root = _get_root(buffer)
+    if root is None:
+        raise ValueError("The buffer is not in shared memory")
+    if buffer.shape != root.shape or buffer.__array_interface__['data'] != root.__array_interface__['data']:
+        raise ValueError("Only a whole shared buffer has a handle, not a view on a part of it")
+    return SharedHandle(root._shm.name, root.shape, root.dtype.str, getattr(buffer, 'unit', ''), root)
@@ -13,6 +13,105 @@ logger = setupLogger.get_logger(__name__, "INFO")
 SignalT = typing.TypeVar("SignalT", bound="Signal")
 
 
+class _CountedDict(dict):
+    """A dict that counts the modifications of all its instances in _CountedDict.generation."""
+
+    __slots__ = ()
+    generation = 0
+
+    @staticmethod
+    def _modified():
+        _CountedDict.generation += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._modified()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._modified()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        super().clear()
+        self._modified()
+
+    def pop(self, *args):
+        self._modified()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._modified()
+        return super().popitem()
+
+
+class AliasEntry(_CountedDict):
+    """An entry of an alias map, ex: {'idx': 1, 'independent': True}."""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return AliasEntry, (dict(self),)
+
+
+class AliasMap(_CountedDict):
+    """The alias map of a signal, a dict entry is stored as a copy in an AliasEntry. A new map is not counted as a
+    modification, the entries that already are AliasEntry objects are shared with the source map."""
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for key, value in self.items():
+            if type(value) is not AliasEntry:
+                dict.__setitem__(self, key, self._entry(value))
+
+    @staticmethod
+    def _entry(value):
+        return value if isinstance(value, AliasEntry) or not isinstance(value, dict) else AliasEntry(value)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self._entry(value))
+
+    def __reduce__(self):
+        return AliasMap, (dict(self),)
+
+
+class _Accessors:
+    """The accessor lists and the alias to index mapping of an alias map, valid while no alias map or entry changes."""
+
+    __slots__ = ('alias_map', 'generation', 'dependent', 'independent', 'index')
+
+    def __init__(self, alias_map: AliasMap):
+        self.alias_map = alias_map
+        self.generation = _CountedDict.generation
+        self.dependent = [v.get('idx') for v in alias_map.values() if not v.get('independent')]
+        self.independent = [v.get('idx') for v in alias_map.values() if v.get('independent')]
+        self.index = {k: v.get('idx') for k, v in alias_map.items()}
+
+    def copy(self, alias_map: AliasMap) -> "_Accessors":
+        """The same accessors for alias_map, a copy of self.alias_map."""
+        accessors = _Accessors.__new__(_Accessors)
+        accessors.alias_map = alias_map
+        accessors.generation = self.generation
+        accessors.dependent = self.dependent
+        accessors.independent = self.independent
+        accessors.index = self.index
+        return accessors
+
+
 class Signal:
     """Provides data, unit handling for multi-dimensional signal processing methods.
     Multi-dimensional buffer objects are stored in an internal list.
@@ -57,14 +156,14 @@ class Signal:
 
     def __init__(self):
         self._data = [BufferObject(), BufferObject(), BufferObject()]
-        self._alias_map = {
-            'time': {'idx': 0, 'independent': True},
-            'data': {'idx': 1},
-        }
+        self._alias_map = AliasMap({
+            'time': AliasEntry({'idx': 0, 'independent': True}),
+            'data': AliasEntry({'idx': 1}),
+        })
 
     @property
     def alias_map(self) -> Dict[str, Any]:
-        return self._alias_map
+        return self._get_accessors().alias_map
 
     @property
     def data_store(self) -> List[BufferObject]:
@@ -72,30 +171,45 @@ class Signal:
 
     @property
     def time(self) -> BufferObject:
-        return self._data_store[0]
+        return self.__getattr__('time')
+
+    def _get_accessors(self) -> _Accessors:
+        """The cached accessors, computed again after the alias map was replaced or an alias map or entry changed."""
+        d = self.__dict__
+        accessors = d.get('_accessors')
+        alias_map = d['_alias_map']
+        if accessors is None or accessors.alias_map is not alias_map or accessors.generation != _CountedDict.generation:
+            if type(alias_map) is not AliasMap:
+                # a plain dict was assigned to _alias_map, track it from now on.
+                alias_map = d['_alias_map'] = AliasMap(alias_map)
+            accessors = d['_accessors'] = _Accessors(alias_map)
+        return accessors
 
     @property
     def dependent_accessors(self) -> List[int]:
-        accessors = []
-        for v in self._alias_map.values():
-            idx = v.get('idx')
-            if not v.get('independent'):
-                accessors.append(idx)
-        return accessors
+        return list(self._get_accessors().dependent)
 
     @property
     def independent_accessors(self) -> List[int]:
-        accessors = []
-        for v in self._alias_map.values():
-            idx = v.get('idx')
-            if v.get('independent'):
-                accessors.append(idx)
-        return accessors
+        return list(self._get_accessors().independent)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the distinct buffers of the signal."""
+        buffers = {id(buf): buf for buf in self._data if isinstance(buf, BufferObject)}
+        return sum(buf.nbytes for buf in buffers.values())
+
+    def compact(self, storage_dtype=None) -> SignalT:
+        """Store the dependent data in storage_dtype, see BufferObject.compact. The independent data is kept."""
+        for idx in self._get_accessors().dependent:
+            if isinstance(self._data[idx], BufferObject):
+                self._data[idx] = self._data[idx].compact(storage_dtype)
+        return self
 
     @property
     def rank(self) -> int:
         rank = 0
-        for i in self.dependent_accessors:
+        for i in self._get_accessors().dependent:
             rank += self._data[i].ndim
         return rank
 
@@ -148,20 +262,32 @@ class Signal:
     __invert__ = unary.invert
 
     def __getattr__(self, name: str) -> BufferObject:
-        if '_alias_map' not in self.__dict__ or name not in self.__dict__['_alias_map']:
-            try:
-                return self.__dict__[name]
-            except KeyError:
-                raise AttributeError(name)
-        else:
-            idx = self.__dict__['_alias_map'][name].get('idx')
-            return self._data[idx]
+        d = self.__dict__
+        accessors = d.get('_accessors')
+        if accessors is None or accessors.generation != _CountedDict.generation \
+                or accessors.alias_map is not d.get('_alias_map'):
+            accessors = self._get_accessors() if '_alias_map' in d else None
+        if accessors is not None:
+            idx = accessors.index.get(name)
+            if idx is not None:
+                return d['_data'][idx]
+        try:
+            return d[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        state.pop('_accessors', None)
+        return state
 
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
         result_signals = [type(self)() for _ in range(ufunc.nout)]
-        indep_accessors = self.independent_accessors
+        accessors = self._get_accessors()
+        indep_accessors = accessors.independent
         for sig in result_signals:
-            sig._alias_map = dict(self._alias_map)
+            sig._alias_map = AliasMap(accessors.alias_map)
+            sig._accessors = accessors.copy(sig._alias_map)
             sig._data.clear()
             for i in range(len(self._data)):
                 if i in indep_accessors:
@@ -169,17 +295,24 @@ class Signal:
                 else:
                     sig._data.append(BufferObject())
 
-        for idx in self.dependent_accessors:
-            args = ((i._data[idx] if isinstance(i, Signal) else i)
-                    for i in inputs)
-            outputs = kwargs.pop('out', None)
-            if outputs:
+        signal_outputs = kwargs.pop('out', None)
+        for idx in accessors.dependent:
+            args = tuple((i._data[idx] if isinstance(i, Signal) else i)
+                         for i in inputs)
+            if signal_outputs:
+                outputs = signal_outputs
                 kwargs['out'] = tuple((o._data[idx] if isinstance(
                     o, Signal) else o) for o in outputs)
             else:
                 outputs = (None,) * ufunc.nout
 
             results = self._data[idx].__array_ufunc__(ufunc, method, *args, **kwargs)  # pylint: disable=no-member
+            for arg in args:
+                # the data of another operand may implement the ufunc, ex: a lazy expression.
+                if results is not NotImplemented:
+                    break
+                if arg is not self._data[idx] and not isinstance(arg, BufferObject) and hasattr(arg, '__array_ufunc__'):
+                    results = arg.__array_ufunc__(ufunc, method, *args, **kwargs)
 
             if results is NotImplemented:
                 return NotImplemented
@@ -197,4 +330,7 @@ class Signal:
                     result_signals[iout]._data[idx] = result
                 iout += 1
 
+        if signal_outputs:
+            result_signals = [result if output is None else output
+                              for result, output in zip(result_signals, signal_outputs)]
         return result_signals[0] if len(result_signals) == 1 else result_signals
@@ -0,0 +1,191 @@
+# Description: Resample data onto a new base with bracket indices computed once by np.searchsorted.
+#   The brackets of a source base are reused by every dependent array sampled on it.
+
+import numpy as np
+import typing
+from scipy.interpolate import interp1d
+
+from iplotProcessing.common import timebase
+from iplotProcessing.common.interpolation import InterpolationKind
+
+# Target size of the temporaries of chunked resampling
+CHUNK_BYTES = 1 << 24
+
+# Kinds resampled with bracket indices and weights. The others (splines) need scipy.
+SEARCHSORTED_KINDS = (InterpolationKind.LINEAR, InterpolationKind.SLINEAR, InterpolationKind.NEAREST,
+                      InterpolationKind.NEAREST_UP, InterpolationKind.ZERO, InterpolationKind.PREVIOUS,
+                      InterpolationKind.NEXT)
+
+
+class Resampler:
+    """Bracket indices and weights of a 1D source base onto a new base.
+
+    The brackets are computed once with np.searchsorted. Resampling an array is then a gather for the
+    previous, next, nearest, nearest-up and zero kinds and a gather followed by a fused multiply-add
+    for the linear and slinear kinds. Out of range values are extrapolated like
+    scipy.interpolate.interp1d(..., fill_value='extrapolate') does. An unsorted source base is sorted
+    once and the indices point back to the unsorted samples.
+    """
+
+    def __init__(self, x: np.ndarray, x_new: np.ndarray, kind: str = InterpolationKind.LINEAR):
+        if kind not in SEARCHSORTED_KINDS:
+            raise ValueError(f"Unsupported interpolation kind: {kind}")
+
+        x = np.asarray(x)
+        x_new = np.asarray(x_new)
+        if timebase.is_time_dtype(x.dtype) and x_new.dtype != x.dtype:
+            # the finer of the two units, casting x_new to the unit of x would truncate it.
+            dtype = np.result_type(x.dtype, x_new.dtype)
+            x = x.astype(dtype, copy=False)
+            x_new = x_new.astype(dtype, copy=False)
+        self.kind = kind
+        self.size = x.size
+        self.index = None
+        self.weight = None
+        self.invalid = None
+        # upper bracket indices of the linear kinds, when these are not index + 1 (unsorted base).
+        self.next = None
+
+        if x.size < 2:
+            # a single sample extends to the whole base, without any sample there is nothing to resample.
+            self.index = np.zeros(x_new.shape, dtype=np.intp)
+            if not x.size:
+                self.invalid = np.ones(x_new.shape, dtype=bool)
+            return
+
+        order = None
+        if not np.all(x[1:] >= x[:-1]):
+            order = np.argsort(x, kind='stable')
+            x = x[order]
+
+        if kind == InterpolationKind.PREVIOUS:
+            self.index = np.searchsorted(x, x_new, side='right') - 1
+            self.invalid = self.index < 0
+        elif kind == InterpolationKind.NEXT:
+            self.index = np.searchsorted(x, x_new, side='left')
+            self.invalid = self.index == x.size
+        elif kind == InterpolationKind.ZERO:
+            self.index = np.clip(np.searchsorted(x, x_new, side='right') - 1, 0, x.size - 1)
+        else:
+            lo = np.clip(np.searchsorted(x, x_new, side='right') - 1, 0, x.size - 2)
+            x0 = x[lo]
+            # offsets from the bracket start in the native dtype, exact for int64 and datetime64 bases.
+            weight = timebase.offsets(x_new, x0)
+            weight /= timebase.offsets(x[lo + 1], x0)
+            if kind == InterpolationKind.NEAREST:
+                self.index = lo + (weight > 0.5)
+            elif kind == InterpolationKind.NEAREST_UP:
+                self.index = lo + (weight >= 0.5)
+            else:
+                self.index = lo
+                self.weight = weight
+                if order is not None:
+                    self.next = order[lo + 1]
+
+        if self.invalid is not None:
+            if self.invalid.any():
+                np.clip(self.index, 0, x.size - 1, out=self.index)
+            else:
+                self.invalid = None
+        if order is not None:
+            self.index = order[self.index]
+
+    def chunk(self, start: int, stop: int) -> typing.Tuple['Resampler', int, int]:
+        """Restrict the resampler to x_new[start:stop].
+        Returns the restricted resampler, which reads the source samples [first, last) only, first and last."""
+        sub = object.__new__(Resampler)
+        sub.kind = self.kind
+        sub.size = self.size
+        index = self.index[start:stop]
+        upper = None if self.next is None else self.next[start:stop]
+        if not self.size or not index.size:
+            first = last = 0
+        elif upper is None:
+            first = int(index.min())
+            last = int(index.max()) + (2 if self.weight is not None else 1)
+        else:
+            first = int(min(index.min(), upper.min()))
+            last = int(max(index.max(), upper.max())) + 1
+        sub.index = index - first
+        sub.next = None if upper is None else upper - first
+        sub.weight = None if self.weight is None else self.weight[start:stop]
+        sub.invalid = None if self.invalid is None else self.invalid[start:stop]
+        return sub, first, last
+
+    def __call__(self, y: np.ndarray, axis: int = -1) -> np.ndarray:
+        """Resample y along axis. Stack several arrays sampled on the same base to resample them in one pass."""
+        y = np.asarray(y)
+        # integer samples are converted after the gather, only the resampled values are.
+        dtype = None if np.issubdtype(y.dtype, np.inexact) else np.float64
+
+        axis = axis % max(y.ndim, 1)
+        if not self.size:
+            shape = list(y.shape)
+            shape[axis] = self.index.size
+            return np.full(shape, np.nan)
+
+        y0 = y.take(self.index, axis=axis)
+        if dtype is not None:
+            y0 = y0.astype(dtype)
+        if self.weight is not None:
+            weight = self.weight.reshape([-1 if j == axis else 1 for j in range(y.ndim)])
+            # y0 + w * (y1 - y0)
+            out = y.take(self.index + 1 if self.next is None else self.next, axis=axis)
+            if dtype is not None:
+                out = out.astype(dtype)
+            out -= y0
+            out *= weight
+            out += y0
+            return out
+
+        if self.invalid is not None:
+            invalid = self.invalid.reshape([-1 if j == axis else 1 for j in range(y.ndim)])
+            y0[np.broadcast_to(invalid, y0.shape)] = np.nan
+        return y0
+
+
+def resample(x: np.ndarray, y: np.ndarray, x_new: np.ndarray, kind: str = InterpolationKind.LINEAR,
+             axis: int = -1) -> np.ndarray:
+    """Resample y sampled on x onto x_new along axis."""
+    return Resampler(x, x_new, kind)(y, axis=axis)
+
+
+def resample_2d(x0: np.ndarray, x1: np.ndarray, z: np.ndarray, x0_new: np.ndarray, x1_new: np.ndarray,
+                kind: str = InterpolationKind.LINEAR, chunk_size: int = None) -> np.ndarray:
+    """Resample z sampled on the rectilinear grid (x0, x1), ex: Te(t, r), onto the grid (x0_new, x1_new).
+
+    The two axes are interpolated separately. The output is computed in chunks of chunk_size slices
+    along the first axis and every chunk only reads the source slices it needs, so the temporaries
+    stay bounded by the chunk size. The default chunk size keeps a chunk around CHUNK_BYTES.
+    Spline kinds are delegated to scipy.interpolate.interp1d along each axis without chunking.
+    """
+    z = np.asarray(z)
+    x0_new = np.asarray(x0_new)
+    x1_new = np.asarray(x1_new)
+
+    if kind not in SEARCHSORTED_KINDS:
+        z = interp1d(x1, z, kind=kind, axis=1, fill_value='extrapolate')(x1_new)
+        return interp1d(x0, z, kind=kind, axis=0, fill_value='extrapolate')(x0_new)
+
+    along_x0 = Resampler(x0, x0_new, kind)
+    along_x1 = Resampler(x1, x1_new, kind)
+    dtype = z.dtype if np.issubdtype(z.dtype, np.inexact) else np.float64
+    out = np.empty((x0_new.size, x1_new.size), dtype=dtype)
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_BYTES // max(1, x1_new.size * out.itemsize))
+
+    for start in range(0, x0_new.size, chunk_size):
+        stop = min(start + chunk_size, x0_new.size)
+        sub, first, last = along_x0.chunk(start, stop)
+        out[start:stop] = sub(along_x1(z[first:last], axis=1), axis=0)
+
+    return out
+
+
+def resample_many(resampler: Resampler, arrays: typing.List[np.ndarray]) -> typing.List[np.ndarray]:
+    """Resample several 1D arrays sampled on the same base in one vectorized pass.
+    When the new base is smaller than the source one, ex: a reduced base for plotting, the arrays are
+    resampled one by one instead, since stacking them would cost more than the resampling."""
+    if len(arrays) < 2 or resampler.index.size < resampler.size:
+        return [resampler(arr) for arr in arrays]
+    return list(resampler(np.stack(arrays)))
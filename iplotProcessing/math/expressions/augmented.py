@@ -1,20 +1,61 @@
 # Description: Define operators that accept two arguments and return the modified value.
-#                We forward all calls to the binary ops
+#                The result is written into the dependent buffers of obj when the dtype and shape of the
+#                result match them. Otherwise, we forward the call to the binary ops and the name is
+#                rebound to a new buffer, ex: int_buffer += 0.5 or a compact int16 buffer += 1. The memory map
+#                or shared memory under the old buffer is then left unchanged.
+#                ufunc.resolve_dtypes needs numpy >= 1.24.
 # Author: Jaswant Sai Panchumarti
 
+import numpy as np
+
+from iplotProcessing.common import precision
+
+
+def _targets(obj, other) -> list:
+    """The (output buffer, other operand) pairs written by an in-place operation on obj."""
+    if isinstance(obj, np.ndarray):
+        return [(obj, other)]
+    if hasattr(obj, 'dependent_accessors'):
+        # a signal, only its dependent data is modified.
+        return [(obj.data_store[idx], other.data_store[idx] if hasattr(other, 'dependent_accessors') else other)
+                for idx in obj.dependent_accessors]
+    return []
+
+
+def _fits(ufunc: np.ufunc, out, other) -> bool:
+    if not isinstance(out, np.ndarray) or not out.flags.writeable:
+        return False
+    if not isinstance(other, np.ndarray) and not isinstance(other, (int, float, complex, np.generic)):
+        return False
+    try:
+        other_dtype = other.dtype if isinstance(other, (np.ndarray, np.generic)) else type(other)
+        result_dtype = ufunc.resolve_dtypes((out.dtype, other_dtype, None))[-1]
+        shape = np.broadcast_shapes(out.shape, np.shape(other))
+    except (TypeError, ValueError):
+        return False
+    # narrow integers are widened by the precision policy, the result does not fit in place.
+    widened = precision.arithmetic_dtype(ufunc, (out, other))
+    return result_dtype == out.dtype and shape == out.shape and (widened is None or widened == out.dtype)
+
+
+def _inplace(ufunc: np.ufunc, obj, other, fallback):
+    targets = _targets(obj, other)
+    if targets and all(_fits(ufunc, out, arg) for out, arg in targets):
+        ufunc(obj, other, out=obj)
+        return obj
+    return fallback(other)
+
+
 def add(obj, other):
-    obj = obj.__add__(other)
-    return obj
+    return _inplace(np.add, obj, other, obj.__add__)
 
 
 def sub(obj, other):
-    obj = obj.__sub__(other)
-    return obj
+    return _inplace(np.subtract, obj, other, obj.__sub__)
 
 
 def mul(obj, other):
-    obj = obj.__mul__(other)
-    return obj
+    return _inplace(np.multiply, obj, other, obj.__mul__)
 
 
 def matmul(obj, other):
@@ -23,18 +64,15 @@ def matmul(obj, other):
 
 
 def truediv(obj, other):
-    obj = obj.__truediv__(other)
-    return obj
+    return _inplace(np.true_divide, obj, other, obj.__truediv__)
 
 
 def floordiv(obj, other):
-    obj = obj.__floordiv__(other)
-    return obj
+    return _inplace(np.floor_divide, obj, other, obj.__floordiv__)
 
 
 def mod(obj, other):
-    obj = obj.__mod__(other)
-    return obj
+    return _inplace(np.mod, obj, other, obj.__mod__)
 
 
 def div_mod(obj, other):
@@ -43,30 +81,24 @@ def div_mod(obj, other):
 
 
 def power(obj, other):
-    obj = obj.__pow__(other)
-    return obj
+    return _inplace(np.power, obj, other, obj.__pow__)
 
 
 def lshift(obj, other):
-    obj = obj.__lshift__(other)
-    return obj
+    return _inplace(np.left_shift, obj, other, obj.__lshift__)
 
 
 def rshift(obj, other):
-    obj = obj.__rshift____(other)
-    return obj
+    return _inplace(np.right_shift, obj, other, obj.__rshift__)
 
 
 def logical_and(obj, other):
-    obj = obj.__and__(other)
-    return obj
+    return _inplace(np.logical_and, obj, other, obj.__and__)
 
 
 def logical_or(obj, other):
-    obj = obj.__or__(other)
-    return obj
+    return _inplace(np.logical_or, obj, other, obj.__or__)
 
 
 def logical_xor(obj, other):
-    obj = obj.__xor__(other)
-    return obj
+    return _inplace(np.logical_xor, obj, other, obj.__xor__)
@@ -0,0 +1,156 @@
+# Description: Reduce signals per block of samples, ex: min/max envelopes of long signals for plotting.
+#   Blocks are either a fixed number of samples or fixed time windows. All blocks are reduced together with
+#   ufunc.reduceat kernels, a chunk of blocks at a time, so the temporaries stay bounded for 100M-sample signals.
+
+import typing
+
+import numpy as np
+
+from iplotProcessing.common.binning import BlockReduction
+from iplotProcessing.common.errors import InvalidNDims
+from iplotProcessing.core import BufferObject, Signal
+
+from iplotLogging import setupLogger
+
+logger = setupLogger.get_logger(__name__, "INFO")
+
+# Number of samples reduced per chunk of blocks
+CHUNK_SAMPLES = 1 << 20
+
+
+def block_starts(time: np.ndarray, block_size: int = None, block_duration=None) -> np.ndarray:
+    """Index of the first sample of every non-empty block. time must be sorted for time window blocks."""
+    if (block_size is None) == (block_duration is None):
+        raise ValueError("Specify either a block size or a block duration")
+    if block_size is not None:
+        if block_size < 1:
+            raise ValueError("The block size must be positive")
+        return np.arange(0, len(time), block_size)
+
+    if not block_duration > 0:
+        raise ValueError("The block duration must be positive")
+    if not len(time):
+        return np.empty(0, dtype=np.intp)
+    time = np.asarray(time)
+    num_blocks = int((time[-1] - time[0]) // block_duration) + 1
+    edges = time[0] + np.arange(num_blocks) * block_duration
+    # empty windows are dropped
+    return np.unique(np.searchsorted(time, edges, side='left'))
+
+
+def _midpoint(first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """(first + last) / 2 without leaving the dtype of integer and datetime64 time bases."""
+    if np.issubdtype(first.dtype, np.inexact):
+        return first + (last - first) / 2
+    return first + (last - first) // 2
+
+
+def _moments(data: np.ndarray, starts: np.ndarray, counts: np.ndarray, variance: bool) \
+        -> typing.Tuple[np.ndarray, typing.Optional[np.ndarray]]:
+    """Block means, and block variances if asked, from the block sums of the samples and of their squares.
+    The samples are shifted by the first one of the chunk, so that an offset, ex: 1e9 + noise, does not cancel
+    the variance out of the sum of squares."""
+    counts = counts.reshape((-1,) + (1,) * (data.ndim - 1))
+    if not variance:
+        mean = np.add.reduceat(data, starts, axis=0, dtype=np.float64)
+        mean /= counts
+        return mean, None
+
+    shift = np.asarray(data[:1], dtype=np.float64)
+    shifted = np.subtract(data, shift, dtype=np.float64)
+    mean = np.add.reduceat(shifted, starts, axis=0)
+    mean /= counts
+    shifted *= shifted
+    var = np.add.reduceat(shifted, starts, axis=0)
+    var /= counts
+    var -= mean * mean
+    np.maximum(var, 0., out=var)
+    mean += shift
+    return mean, var
+
+
+def _reduce_chunk(data: np.ndarray, starts: np.ndarray, reductions: typing.Iterable[str]) -> dict:
+    counts = np.diff(np.append(starts, data.shape[0]))
+    results = {}
+    mean = variance = None
+    for reduction in reductions:
+        if reduction == BlockReduction.MIN:
+            results[reduction] = np.minimum.reduceat(data, starts, axis=0)
+        elif reduction == BlockReduction.MAX:
+            results[reduction] = np.maximum.reduceat(data, starts, axis=0)
+        elif reduction in (BlockReduction.MEAN, BlockReduction.STD):
+            if mean is None:
+                mean, variance = _moments(data, starts, counts, BlockReduction.STD in reductions)
+            results[reduction] = mean if reduction == BlockReduction.MEAN else np.sqrt(variance)
+    return results
+
+
+def block_reduce(time: np.ndarray, data: np.ndarray, block_size: int = None, block_duration=None,
+                 reductions: typing.Iterable[str] = (BlockReduction.MIN, BlockReduction.MAX)) \
+        -> typing.Tuple[BufferObject, typing.Dict[str, BufferObject]]:
+    """Reduce data sampled on time per block of block_size samples or per time window of block_duration.
+
+    Returns the time base of the blocks, the centre of the first and last sample of every block,
+    and a buffer object per reduction (see BlockReduction). The reductions keep the unit of data.
+    Only the first axis is blocked, ex: the time axis of a profile.
+    """
+    reductions = list(reductions)
+    for reduction in reductions:
+        if reduction not in (BlockReduction.MIN, BlockReduction.MAX, BlockReduction.MEAN, BlockReduction.STD):
+            raise ValueError(f"Unsupported block reduction: {reduction}")
+    if np.ndim(data) < 1:
+        raise InvalidNDims(np.ndim(data))
+    if len(time) != len(data):
+        raise ValueError(f"The time base has {len(time)} samples but the data has {len(data)}")
+
+    starts = block_starts(time, block_size, block_duration)
+    values = np.asarray(data)
+    chunks = {reduction: [] for reduction in reductions}
+    block = 0
+    while block < starts.size:
+        # the blocks that start in the next CHUNK_SAMPLES samples, at least one.
+        stop = max(block + 1, int(np.searchsorted(starts, starts[block] + CHUNK_SAMPLES, side='left')))
+        first = starts[block]
+        last = starts[stop] if stop < starts.size else values.shape[0]
+        results = _reduce_chunk(values[first:last], starts[block:stop] - first, reductions)
+        for reduction in reductions:
+            chunks[reduction].append(results[reduction])
+        block = stop
+
+    times = np.asarray(time)
+    if starts.size:
+        ends = np.append(starts[1:], len(time)) - 1
+        times = _midpoint(times[starts], times[ends])
+    time_out = BufferObject(input_arr=times, unit=getattr(time, 'unit', ''))
+    unit = getattr(data, 'unit', '')
+    results = {}
+    for reduction, parts in chunks.items():
+        if not parts:
+            # no samples, mean and std are computed in float64
+            dtype = values.dtype if reduction in (BlockReduction.MIN, BlockReduction.MAX) else np.float64
+            parts = [np.empty((0,) + values.shape[1:], dtype=dtype)]
+        results[reduction] = BufferObject(input_arr=np.concatenate(parts), unit=unit)
+    return time_out, results
+
+
+def envelope(signal: Signal, block_size: int = None, block_duration=None) -> Signal:
+    """The min/max envelope of a 1D signal. The result has the aliases time, dmin and dmax."""
+    indep_ids = signal.independent_accessors
+    dep_ids = signal.dependent_accessors
+    if len(indep_ids) != 1 or len(dep_ids) != 1:
+        raise InvalidNDims(len(indep_ids))
+
+    time = signal.data_store[indep_ids[0]]
+    time_out, results = block_reduce(time, signal.data_store[dep_ids[0]], block_size, block_duration,
+                                     (BlockReduction.MIN, BlockReduction.MAX))
+    result = Signal()
+    result.alias_map.clear()
+    result.alias_map.update({
+        'time': {'idx': 0, 'independent': True},
+        'dmin': {'idx': 1},
+        'dmax': {'idx': 2},
+    })
+    result.data_store[0] = time_out
+    result.data_store[1] = results[BlockReduction.MIN]
+    result.data_store[2] = results[BlockReduction.MAX]
+    return result
@@ -1,12 +1,19 @@
-from scipy.interpolate import interp1d, interp2d
+from scipy.interpolate import interp1d
+import copy
 import numpy as np
 import typing
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 
+from iplotProcessing.common import timebase
 from iplotProcessing.common.errors import InvalidNDims
 from iplotProcessing.common.interpolation import InterpolationKind
 from iplotProcessing.common.grid_mixing import GridAlignmentMode
-from iplotProcessing.common.units import DATE_TIME_PRECISE
+from iplotProcessing.common.units import DATE_TIME_PRECISE, get_conversion_factor
 from iplotProcessing.core import Signal, BufferObject
+from iplotProcessing.math.compute.interpolation import SEARCHSORTED_KINDS, Resampler, resample_2d, \
+    resample_many
+from iplotProcessing.tools.hasher import hash_buffer
 
 from iplotLogging import setupLogger
 
@@ -34,28 +41,51 @@ def _get_common_num_dims(arrays: typing.List[np.ndarray]) -> int:
     return ndim
 
 
-def align(signals: typing.List[Signal], curr_signal: Signal, mode=GridAlignmentMode.UNION,
-          kind=InterpolationKind.PREVIOUS):
-    # all signals must have same alias_map.
-    if not _check_alias_map_equal(signals):
-        return
+def _fingerprint(arr: BufferObject) -> tuple:
+    return hash_buffer(arr), getattr(arr, 'unit', None)
 
-    num_signals = len(signals)
-    indep_ids = signals[0].independent_accessors
-    num_independent = len(indep_ids)
-    common_bases = [BufferObject()] * num_independent
-    dict_result = {}
 
-    if not num_signals or not num_independent:
-        return
+def _same_base(arr1: BufferObject, arr2: BufferObject, hashes: dict) -> bool:
+    """Check whether two bases are equal. Identity first, then shape and endpoints, then content hash.
+    The content hashes are memoized in hashes by object id."""
+    if arr1 is arr2:
+        return True
+    if arr1.shape != arr2.shape or arr1.dtype != arr2.dtype or \
+            getattr(arr1, 'unit', None) != getattr(arr2, 'unit', None):
+        return False
+    if arr1.size and (arr1.flat[0] != arr2.flat[0] or arr1.flat[-1] != arr2.flat[-1]):
+        return False
+
+    for arr in (arr1, arr2):
+        if id(arr) not in hashes:
+            hashes[id(arr)] = hash_buffer(arr)
+    return hashes[id(arr1)] == hashes[id(arr2)]
+
+
+def _get_common_bases(signals: typing.List[Signal], mode: str, hashes: dict = None, num_points: int = None,
+                      window: tuple = None) -> typing.Optional[typing.List[BufferObject]]:
+    indep_ids = signals[0].independent_accessors
+    common_bases = [BufferObject()] * len(indep_ids)
+    hashes = {} if hashes is None else hashes
 
     for i in indep_ids:
         i_bases = [sig.data_store[i] for sig in signals]
 
-        if mode == GridAlignmentMode.INTERSECTION:
-            common_bases[i] = intersection(i_bases)
-        elif mode == GridAlignmentMode.UNION:
+        if mode == GridAlignmentMode.BUDGET and i == indep_ids[0]:
+            # the budget is spent on the first independent base, ex: time.
+            common_bases[i] = budget(i_bases, num_points or DEFAULT_NUM_POINTS, window)
+        elif all(_same_base(base, i_bases[0], hashes) for base in i_bases[1:]):
+            # shared base, nothing to mix.
+            common_bases[i] = i_bases[0]
+            continue
+        elif mode in (GridAlignmentMode.UNION, GridAlignmentMode.BUDGET):
             common_bases[i] = union(i_bases)
+        elif mode == GridAlignmentMode.INTERSECTION:
+            common_bases[i] = intersection(i_bases)
+        elif mode == GridAlignmentMode.OVERLAP_UNION:
+            common_bases[i] = overlap(i_bases)
+        elif mode == GridAlignmentMode.OVERLAP_DENSEST:
+            common_bases[i] = overlap(i_bases, densest=True)
         else:
             logger.warning(f"Unsupported alignment mode: {mode}")
             return
@@ -63,48 +93,350 @@ def align(signals: typing.List[Signal], curr_signal: Signal, mode=GridAlignmentM
         if i_bases[0].unit in DATE_TIME_PRECISE:  # handle time units. a little special
             common_bases[i].unit = get_finest_time_unit(i_bases)
 
-    # rebase every signal's dependent array onto the common independent arrays
-    for sig in signals:
-        try:
-            # interpolate from old base
+    return common_bases
+
+
+class AlignmentPlan:
+    """The common independent bases of a set of signals and the resampling map of every signal onto them.
+
+    A plan depends on the independent buffers only. Once built, it can be applied to new dependent data
+    sampled on the same bases, which then costs a gather and a fused multiply-add per dependent array.
+
+    The resampling maps and the rebase of the signals can run on an executor. The NumPy kernels release
+    the GIL, so a ThreadPoolExecutor spreads the signals over the cores. Results do not depend on the executor.
+    """
+
+    def __init__(self, signals: typing.List[Signal], mode=GridAlignmentMode.UNION,
+                 kind=InterpolationKind.PREVIOUS, executor: Executor = None, num_points: int = None,
+                 window: tuple = None):
+        self.mode = mode
+        self.kind = kind
+        self.indep_ids = signals[0].independent_accessors
+        # bases converted to the finest time unit, reused by the first apply only so that they are not retained.
+        self._converted = {}
+        # the window is given in the unit of the first time base, it is converted with the bases.
+        window_unit = getattr(signals[0].data_store[self.indep_ids[0]], 'unit', None) if self.indep_ids else None
+        signals = normalize_units(signals, self.indep_ids, self._converted)
+        if window is not None and window_unit is not None:
+            window = _window_to_unit(window, window_unit, signals[0].data_store[self.indep_ids[0]].unit)
+        hashes = {}
+        self.common_bases = _get_common_bases(signals, mode, hashes, num_points, window)
+        self._maps = [None] * len(signals)
+        # signals already sampled on the common bases are left untouched.
+        self._unchanged = [False] * len(signals)
+
+        if self.common_bases is None:
+            return
+
+        # the brackets are computed once per distinct source base.
+        distinct_bases = []
+        owners = {}
+        for j, sig in enumerate(signals):
+            self._unchanged[j] = all(_same_base(sig.data_store[i], self.common_bases[i], hashes)
+                                     for i in self.indep_ids)
+            if self._unchanged[j] or kind not in SEARCHSORTED_KINDS:
+                continue
+
+            base = sig.data_store[self.indep_ids[0]]
+            if base.ndim != 1 or self.common_bases[0].ndim != 1:
+                continue
+
+            for k, other_base in enumerate(distinct_bases):
+                if _same_base(base, other_base, hashes):
+                    owners[j] = k
+                    break
+            else:
+                owners[j] = len(distinct_bases)
+                distinct_bases.append(base)
+
+        resamplers = _map(executor, lambda base: Resampler(base, self.common_bases[0], kind), distinct_bases)
+        for j, k in owners.items():
+            self._maps[j] = resamplers[k]
+
+    @staticmethod
+    def make_key(signals: typing.List[Signal], mode: str, kind: str, num_points: int = None,
+                 window: tuple = None) -> tuple:
+        """A cheap fingerprint of the independent buffers of the signals and the alignment parameters."""
+        indep_ids = signals[0].independent_accessors
+        fingerprints = tuple(tuple(_fingerprint(sig.data_store[i]) for i in indep_ids) for sig in signals)
+        return mode, kind, num_points, window, fingerprints
+
+    def _rebase(self, sig: Signal, resample: typing.Optional[Resampler]) -> typing.Dict[int, BufferObject]:
+        """Interpolate the dependent arrays of a signal from its old base onto the common bases."""
+        indep_ids = self.indep_ids
+        common_bases = self.common_bases
+        kind = self.kind
+        new_data = {}
+
+        # all 1D arrays of the signal in one pass
+        ids_1d = [i for i in sig.dependent_accessors if sig.data_store[i].ndim == 1]
+        if resample is None:
+            y_news = [interp1d(sig.data_store[indep_ids[0]], sig.data_store[i], kind=kind,
+                               fill_value='extrapolate')(common_bases[0]) for i in ids_1d]
+        else:
+            y_news = resample_many(resample, [sig.data_store[i] for i in ids_1d])
+        for i, y_new in zip(ids_1d, y_news):
+            new_data[i] = BufferObject(input_arr=y_new, unit=sig.data_store[i].unit)
+
+        for i in sig.dependent_accessors:
+            if sig.data_store[i].ndim == 2:
+                # profile signal, ex: Te(t, r). Rebase the rectilinear grid slice by slice.
+                z_new = resample_2d(sig.data_store[indep_ids[0]], sig.data_store[indep_ids[1]],
+                                    sig.data_store[i], common_bases[0], common_bases[1], kind=kind)
+                new_data[i] = BufferObject(input_arr=z_new, unit=sig.data_store[i].unit)
+            elif sig.data_store[i].ndim > 2:
+                indep_vectors = [sig.data_store[i] for i in indep_ids]
+                points = list(zip(*indep_vectors))
+                f = LinearNDInterpolator(
+                    points, sig.data_store[i].ravel(), fill_value='extrapolate')
+                new_bases = reversed(common_bases)
+                new_bases = np.meshgrid(*new_bases)
+                new_data[i] = BufferObject(input_arr=f(*new_bases), unit=sig.data_store[i].unit)
+
+        return new_data
+
+    def apply(self, signals: typing.List[Signal], curr_signal: Signal, executor: Executor = None) -> dict:
+        """Rebase the dependent arrays of the signals onto the common bases.
+        The signals must be sampled on the bases this plan was built for."""
+        dict_result = {}
+        jobs = []
+        converted, self._converted = self._converted, {}
+        sources = normalize_units(signals, self.indep_ids, converted)
+        for sig, source, resample, unchanged in zip(signals, sources, self._maps, self._unchanged):
+            try:
+                is_current = sig.label == curr_signal.label
+                key = 'self' if is_current else sig.label.split(":")[0]
+            except AttributeError:
+                continue
+            jobs.append((sig, source, resample, unchanged, is_current, key))
+
+        # rebase every signal's dependent array onto the common independent arrays
+        rebased = _map(executor, lambda job: None if job[3] else self._rebase(job[1], job[2]), jobs)
+
+        # results are gathered in the order of the signals, whatever the executor.
+        for (sig, source, _, unchanged, is_current, key), new_data in zip(jobs, rebased):
             for i in sig.dependent_accessors:
-                if sig.data_store[i].ndim == 1:
-                    f = interp1d(
-                        sig.data_store[indep_ids[0]], sig.data_store[i], kind=kind, fill_value='extrapolate')
-                    if f:
-                        dunit = sig.data_store[i].unit
-                        y_data = BufferObject(input_arr=f(common_bases[0]), unit=dunit)
-                        if sig.label == curr_signal.label:
-                            sig.data_store[i] = y_data
-                        key = sig.label.split(":")[0] if sig.label != curr_signal.label else 'self'
-                        dict_result[key] = {"data": y_data}
-                elif sig.data_store[i].ndim == 2:
-                    f = interp2d(sig.data_store[indep_ids[1]], sig.data_store[indep_ids[0]],
-                                 sig.data_store[i], kind=kind)
-                    if f:
-                        dunit = sig.data_store[i].unit
-                        sig.data_store[i] = BufferObject(input_arr=f(common_bases[1], common_bases[0]), unit=dunit)
-                elif sig.data_store[i].ndim > 2:
-                    indep_vectors = [sig.data_store[i] for i in indep_ids]
-                    points = list(zip(*indep_vectors))
-                    f = LinearNDInterpolator(
-                        points, sig.data_store[i].ravel(), fill_value='extrapolate')
-                    if f:
-                        dunit = sig.data_store[i].unit
-                        new_bases = reversed(common_bases)
-                        new_bases = np.meshgrid(*new_bases)
-                        sig.data_store[i] = BufferObject(input_arr=f(*new_bases), unit=dunit)
-
-            for i in indep_ids:
-                if sig.label == curr_signal.label:
-                    sig.data_store[i] = common_bases[i]
-                key = sig.label.split(":")[0] if sig.label != curr_signal.label else 'self'
-                dict_result[key]["time"] = common_bases[i]
-
-        except AttributeError:
-            continue
+                if unchanged:
+                    dict_result[key] = {"data": sig.data_store[i]}
+                    continue
+                if is_current:
+                    sig.data_store[i] = new_data[i]
+                dict_result[key] = {"data": new_data[i]}
+
+            for i in self.indep_ids:
+                # a base converted to another unit is replaced too, even if the samples did not change.
+                if is_current and (not unchanged or source is not sig):
+                    sig.data_store[i] = self.common_bases[i]
+            if key in dict_result:
+                dict_result[key]["time"] = self.common_bases[self.indep_ids[0]]
+
+        return dict_result
+
+
+def _map(executor: typing.Optional[Executor], func: typing.Callable, items: typing.List) -> typing.List:
+    if executor is None or len(items) < 2:
+        return [func(item) for item in items]
+    return list(executor.map(func, items))
+
+
+PLAN_CACHE_SIZE = 8
+_plan_cache = OrderedDict()
+
+
+def get_plan(signals: typing.List[Signal], mode=GridAlignmentMode.UNION, kind=InterpolationKind.PREVIOUS,
+             executor: Executor = None, num_points: int = None, window: tuple = None) -> AlignmentPlan:
+    """Return the cached alignment plan for the independent buffers of these signals, build it if needed.
+    The cache keeps the PLAN_CACHE_SIZE most recently used plans."""
+    key = AlignmentPlan.make_key(signals, mode, kind, num_points, window)
+    plan = _plan_cache.get(key)
+    if plan is None:
+        plan = AlignmentPlan(signals, mode, kind, executor=executor, num_points=num_points, window=window)
+        _plan_cache[key] = plan
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    else:
+        _plan_cache.move_to_end(key)
+    return plan
+
+
+def clear_plan_cache():
+    _plan_cache.clear()
+
+
+def align(signals: typing.List[Signal], curr_signal: Signal, mode=GridAlignmentMode.UNION,
+          kind=InterpolationKind.PREVIOUS, cache_plan: bool = False, workers: int = None,
+          executor: Executor = None, num_points: int = None, window: tuple = None):
+    """Align the signals onto common independent bases.
+    With cache_plan, the alignment plan is kept and reused by later calls on the same independent buffers.
+    The signals are resampled in parallel on the given executor, or on a pool of `workers` threads.
+    The result is the same as with the serial path.
+    In GridAlignmentMode.BUDGET, the common time base has at most num_points samples (DEFAULT_NUM_POINTS)
+    inside window = (start, stop), by default the span of all the bases. The window is given in the unit of
+    the time base of the first signal, it is converted with the bases, see normalize_units."""
+    # all signals must have same alias_map.
+    if not _check_alias_map_equal(signals):
+        return
+
+    if not len(signals) or not len(signals[0].independent_accessors):
+        return
+
+    if executor is None and workers is not None and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return align(signals, curr_signal, mode, kind, cache_plan=cache_plan, executor=pool,
+                         num_points=num_points, window=window)
+
+    if cache_plan:
+        plan = get_plan(signals, mode, kind, executor=executor, num_points=num_points, window=window)
+    else:
+        plan = AlignmentPlan(signals, mode, kind, executor=executor, num_points=num_points, window=window)
+    if plan.common_bases is None:
+        return
+
+    return plan.apply(signals, curr_signal, executor=executor)
+
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def align_chunks(signals: typing.List[Signal], mode=GridAlignmentMode.UNION, kind=InterpolationKind.PREVIOUS,
+                 chunk_duration=None, chunk_size: int = None) \
+        -> typing.Iterator[typing.Tuple[BufferObject, typing.List[Signal]]]:
+    """Streaming variant of align for 1D signals with sorted time bases.
+
+    The common base is built and the dependent arrays are resampled one chunk at a time.
+    A chunk covers chunk_duration (in the unit of the bases) or, with chunk_size, at most chunk_size samples
+    of every base. Yields the time of the chunk and, for every signal, a Signal holding the aligned chunk.
+    The position in every source base is carried from one chunk to the next, so the samples around a chunk
+    boundary are interpolated as in align. Peak memory is proportional to the chunk, not to the pulse.
+    """
+    # all signals must have same alias_map.
+    if not len(signals) or not _check_alias_map_equal(signals):
+        return
+
+    indep_ids = signals[0].independent_accessors
+    if len(indep_ids) != 1:
+        raise InvalidNDims(len(indep_ids))
+    if kind not in SEARCHSORTED_KINDS:
+        logger.warning(f"Unsupported interpolation kind for chunked alignment: {kind}")
+        return
+    if chunk_duration is None and chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_SIZE
+    if (chunk_size is not None and chunk_size < 1) or (chunk_duration is not None and not chunk_duration > 0):
+        raise ValueError("The chunk size and duration must be positive")
+
+    i_bases = [sig.data_store[indep_ids[0]] for sig in normalize_units(signals, indep_ids)]
+    if _get_common_num_dims(i_bases) != 1:
+        raise InvalidNDims(_get_common_num_dims(i_bases))
+    # the bases are kept with their duplicates as in align, unsorted ones are sorted along with their data.
+    bases = []
+    orders = []
+    for base in i_bases:
+        base = np.asarray(base)
+        order = None
+        if base.size > 1 and not np.all(base[1:] >= base[:-1]):
+            order = np.argsort(base, kind='stable')
+            base = base[order]
+        bases.append(base)
+        orders.append(order)
+    if not all(base.size for base in bases):
+        return
 
-    return dict_result
+    unit = i_bases[0].unit
+    if unit in DATE_TIME_PRECISE:
+        unit = get_finest_time_unit(i_bases)
+
+    cursors = [0] * len(signals)
+    for time in _common_base_chunks(bases, mode, chunk_duration, chunk_size):
+        time = time.view(BufferObject)
+        time.unit = unit
+        chunks = []
+        for j, (sig, base, order) in enumerate(zip(signals, bases, orders)):
+            # source window: the samples bracketing the chunk, at least two of them for the linear kinds.
+            first = cursors[j] + max(np.searchsorted(base[cursors[j]:], time[0], side='right') - 1, 0)
+            last = min(first + np.searchsorted(base[first:], time[-1], side='left') + 1, base.size)
+            first = max(min(first, last - 2), 0)
+            last = min(max(last, first + 2), base.size)
+            cursors[j] = first
+
+            resampler = Resampler(base[first:last], time, kind)
+            dep_ids = sig.dependent_accessors
+            if order is None:
+                y_news = resample_many(resampler, [sig.data_store[i][first:last] for i in dep_ids])
+            else:
+                y_news = resample_many(resampler, [np.asarray(sig.data_store[i])[order[first:last]] for i in dep_ids])
+
+            chunk = Signal()
+            chunk._alias_map = dict(sig.alias_map)
+            chunk._data = [time] * len(sig.data_store)
+            for i, y_new in zip(dep_ids, y_news):
+                chunk._data[i] = BufferObject(input_arr=y_new, unit=sig.data_store[i].unit)
+            label = getattr(sig, 'label', None)
+            if label is not None:
+                chunk.label = label
+            chunks.append(chunk)
+
+        yield time, chunks
+
+
+def _common_base_chunks(bases: typing.List[np.ndarray], mode: str, chunk_duration=None,
+                        chunk_size: int = None) -> typing.Iterator[np.ndarray]:
+    if mode == GridAlignmentMode.UNION:
+        vmin = min(base[0] for base in bases)
+        vmax = max(base[-1] for base in bases)
+    elif mode in (GridAlignmentMode.INTERSECTION, GridAlignmentMode.OVERLAP_UNION,
+                  GridAlignmentMode.OVERLAP_DENSEST):
+        vmin = max(base[0] for base in bases)
+        vmax = min(base[-1] for base in bases)
+        if vmin > vmax:
+            return
+    else:
+        logger.warning(f"Unsupported alignment mode: {mode}")
+        return
+
+    if mode == GridAlignmentMode.INTERSECTION:
+        # the linspace of intersection, generated slice by slice.
+        num_points = max(base.size for base in bases) + 1
+        vdtype = timebase.common_dtype(bases)
+        step = timebase.offsets(np.asarray(vmax).astype(vdtype), np.asarray(vmin).astype(vdtype)) / (num_points - 1)
+        if chunk_size is not None:
+            per_chunk = chunk_size
+        elif step:
+            per_chunk = max(1, int(timebase.offsets(vmin + chunk_duration, vmin) / step))
+        else:
+            per_chunk = num_points
+        for start in range(0, num_points, per_chunk):
+            yield timebase.linspace(vmin, vmax, num_points, dtype=vdtype, start=start, stop=start + per_chunk)
+        return
+
+    sources = [base[np.searchsorted(base, vmin, side='left'):np.searchsorted(base, vmax, side='right')]
+               for base in bases]
+    if mode == GridAlignmentMode.OVERLAP_DENSEST:
+        sources = [max(sources, key=lambda arr: arr.size)]
+
+    cursors = [0] * len(sources)
+    lo = vmin
+    while any(cursor < src.size for cursor, src in zip(cursors, sources)):
+        if chunk_size is not None:
+            # no base contributes more than chunk_size samples to a chunk
+            ends = [src[cursor + chunk_size] for cursor, src in zip(cursors, sources) if cursor + chunk_size < src.size]
+            hi = min(ends) if ends else None
+        else:
+            lo = lo + chunk_duration
+            hi = lo if lo <= vmax else None
+
+        # a run of equal samples longer than chunk_size goes in one chunk, else the cursors would not advance
+        side = 'left'
+        if hi is not None and hi <= min(src[cursor] for cursor, src in zip(cursors, sources) if cursor < src.size):
+            side = 'right'
+        runs = []
+        for j, src in enumerate(sources):
+            stop = src.size if hi is None else cursors[j] + np.searchsorted(src[cursors[j]:], hi, side=side)
+            runs.append(src[cursors[j]:stop])
+            cursors[j] = stop
+
+        chunk = union(runs)
+        if chunk.size:
+            yield np.asarray(chunk)
 
 
 def get_finest_time_unit(arrays: typing.List[BufferObject]) -> str:
@@ -118,6 +450,69 @@ def get_finest_time_unit(arrays: typing.List[BufferObject]) -> str:
     return DATE_TIME_PRECISE[idx]
 
 
+def _to_unit(base: BufferObject, unit: str) -> BufferObject:
+    """The time base converted to unit in one vectorized pass. The source buffer is left as is."""
+    values = np.asarray(base)
+    factor = get_conversion_factor(base.unit, unit)
+    if factor == 1 or timebase.is_time_dtype(values.dtype):
+        # datetime64 values carry their own unit
+        converted = values
+    elif np.issubdtype(values.dtype, np.integer) and isinstance(factor, int):
+        limit = np.iinfo(np.int64).max // factor
+        if values.size and (values.min() < -limit or values.max() > limit):
+            raise OverflowError(f"Converting the time base from {base.unit} to {unit} overflows int64")
+        converted = np.multiply(values, factor, dtype=np.int64)
+    else:
+        if np.issubdtype(values.dtype, np.integer):
+            logger.warning(f"Converting an integer time base from {base.unit} to {unit} is not exact, using float64")
+        converted = np.multiply(values, factor, dtype=np.result_type(values.dtype, np.float64))
+    return BufferObject(input_arr=converted, unit=unit)
+
+
+def _window_to_unit(window: tuple, from_unit: str, unit: str) -> tuple:
+    """window = (start, stop) converted from from_unit to unit, as normalize_units converts the time bases."""
+    if from_unit == unit or from_unit not in DATE_TIME_PRECISE or unit not in DATE_TIME_PRECISE \
+            or timebase.is_time_dtype(np.asarray(window).dtype):
+        return window
+    factor = get_conversion_factor(from_unit, unit)
+    return tuple(value * factor for value in window)
+
+
+def normalize_units(signals: typing.List[Signal], indep_ids: typing.List[int] = None,
+                    converted: dict = None) -> typing.List[Signal]:
+    """The signals with the independent time bases converted to the finest time unit among them, ex: ms to ns.
+    Signals already in that unit are returned as is, the others are shallow copies sharing the dependent data.
+    The conversions are memoized in converted by id of the source buffer."""
+    indep_ids = signals[0].independent_accessors if indep_ids is None else indep_ids
+    targets = {}
+    for i in indep_ids:
+        i_bases = [sig.data_store[i] for sig in signals]
+        units = set(getattr(base, 'unit', None) for base in i_bases)
+        if len(units) > 1 and units.issubset(DATE_TIME_PRECISE):
+            targets[i] = get_finest_time_unit(i_bases)
+    if not targets:
+        return signals
+
+    converted = {} if converted is None else converted
+    result = []
+    for sig in signals:
+        ids = [i for i, unit in targets.items() if sig.data_store[i].unit != unit]
+        if not ids:
+            result.append(sig)
+            continue
+
+        source = copy.copy(sig)
+        source._data = list(sig.data_store)
+        for i in ids:
+            base = sig.data_store[i]
+            if id(base) not in converted:
+                # the source buffer is kept alive with its conversion, so that its id is not reused.
+                converted[id(base)] = (base, _to_unit(base, targets[i]))
+            source._data[i] = converted[id(base)][1]
+        result.append(source)
+    return result
+
+
 def get_coarsest_time_unit(arrays: typing.List[BufferObject]) -> str:
     idx = len(DATE_TIME_PRECISE) - 1
     for arr in arrays:
@@ -138,27 +533,53 @@ def intersection(arrays: typing.List[BufferObject]):
         return
 
     if ndim == 1:
-        num_points = 0
-        vmin = np.iinfo(np.int64).min
-        vmax = np.iinfo(np.int64).max
-        vdtype = np.int64
+        bases = [np.asarray(arr) for arr in arrays if hasattr(arr, 'dtype')]
+        bases = [arr for arr in bases if arr.size]
+        if not bases:
+            return np.empty(0, dtype=np.int64).view(BufferObject)
+
+        # min/max of the bases in their own dtype, int64 and datetime64 bases are never routed through float.
+        vdtype = timebase.common_dtype(bases)
+        vmin = max(arr.min().astype(vdtype) for arr in bases)
+        vmax = min(arr.max().astype(vdtype) for arr in bases)
+        num_points = max(arr.size for arr in bases)
+
+        return timebase.linspace(vmin, vmax, num_points + 1, dtype=vdtype).view(BufferObject)
+    else:
+        raise InvalidNDims(ndim)
 
-        for arr in arrays:
-            try:
-                vmin = max(min(arr), vmin)
-                vmax = min(max(arr), vmax)
-                num_points = max(arr.size, num_points)
-                if 'float' in str(arr.dtype):
-                    vdtype = np.float64
-            except AttributeError:
-                continue
 
-        return np.linspace(vmin, vmax, num_points + 1, dtype=vdtype).view(BufferObject)
+def union(arrays: typing.List[BufferObject]):
+    if not len(arrays):
+        return
+
+    ndim = _get_common_num_dims(arrays)
+    if ndim < 0:
+        return
+
+    if ndim == 1:
+        bases = [arr for arr in arrays if hasattr(arr, 'dtype')]
+        if not bases:
+            return np.empty(0, dtype=np.int64).view(BufferObject)
+
+        vdtype = timebase.common_dtype(bases)
+        runs = [_sorted_unique(np.asarray(arr).astype(vdtype, copy=False)) for arr in bases]
+        if len(runs) == 1:
+            return runs[0].view(BufferObject)
+
+        # A stable sort on the concatenated runs is a timsort, which detects the sorted runs
+        # and only merges them, O(n log k). No element-wise re-sorting takes place.
+        tvec = np.concatenate(runs)
+        tvec.sort(kind='stable')
+        return _drop_duplicates(tvec).view(BufferObject)
     else:
         raise InvalidNDims(ndim)
 
 
-def union(arrays: typing.List[BufferObject]):
+def overlap(arrays: typing.List[BufferObject], densest: bool = False):
+    """Real samples inside the window where all bases overlap.
+    Every base is clipped to the window with np.searchsorted. The common base is the union of the clipped bases
+    or, with densest, the clipped base that has the most samples."""
     if not len(arrays):
         return
 
@@ -167,15 +588,87 @@ def union(arrays: typing.List[BufferObject]):
         return
 
     if ndim == 1:
-        tvec = []
-        vdtype = np.int64
-        for arr in arrays:
-            try:
-                tvec.extend(arr.tolist())
-                if 'float' in str(arr.dtype):
-                    vdtype = np.float64
-            except AttributeError:
-                continue
-        return np.unique(np.array(tvec, dtype=vdtype)).view(BufferObject)
+        bases = [_sorted_unique(np.asarray(arr)) for arr in arrays if hasattr(arr, 'dtype')]
+        bases = [arr for arr in bases if arr.size]
+        if not bases:
+            return np.empty(0, dtype=np.int64).view(BufferObject)
+
+        vmin = max(arr[0] for arr in bases)
+        vmax = min(arr[-1] for arr in bases)
+        clipped = [arr[np.searchsorted(arr, vmin, side='left'):np.searchsorted(arr, vmax, side='right')]
+                   for arr in bases]
+
+        if densest:
+            return max(clipped, key=lambda arr: arr.size).view(BufferObject)
+        return union(clipped)
     else:
         raise InvalidNDims(ndim)
+
+
+DEFAULT_NUM_POINTS = 4000
+
+
+def budget(arrays: typing.List[BufferObject], num_points: int = DEFAULT_NUM_POINTS, window: tuple = None):
+    """Union of the bases reduced to at most num_points real samples inside window = (start, stop).
+    The window is split in num_points buckets and every bucket keeps the first sample of any base
+    that falls in it. Besides a pass that checks the order of every base, only np.searchsorted is run on the bases,
+    so the cost mostly depends on num_points and the number of bases. Unsorted bases are sorted first."""
+    if not len(arrays):
+        return
+
+    ndim = _get_common_num_dims(arrays)
+    if ndim < 0:
+        return
+
+    if ndim == 1:
+        bases = [np.asarray(arr) for arr in arrays if hasattr(arr, 'dtype')]
+        bases = [arr if np.all(arr[1:] >= arr[:-1]) else np.sort(arr) for arr in bases if arr.size]
+        if not bases:
+            return np.empty(0, dtype=np.int64).view(BufferObject)
+
+        vdtype = timebase.common_dtype(bases)
+        if window is None:
+            vmin = min(arr[0] for arr in bases)
+            vmax = max(arr[-1] for arr in bases)
+        else:
+            vmin, vmax = window
+
+        clipped = [arr[np.searchsorted(arr, vmin, side='left'):np.searchsorted(arr, vmax, side='right')]
+                   for arr in bases]
+        if sum(arr.size for arr in clipped) <= num_points:
+            return union(clipped)
+
+        clipped = [arr.astype(vdtype, copy=False) for arr in clipped if arr.size]
+        edges = timebase.linspace(vmin, vmax, num_points + 1, dtype=vdtype)
+        first = np.empty(num_points, dtype=vdtype)
+        found = np.zeros(num_points, dtype=bool)
+        for arr in clipped:
+            lo = np.searchsorted(arr, edges[:-1], side='left')
+            hi = np.searchsorted(arr, edges[1:], side='left')
+            hi[-1] = arr.size
+            in_bucket = lo < hi
+            candidate = arr.take(np.minimum(lo, arr.size - 1))
+            better = in_bucket & (~found | (candidate < first))
+            first[better] = candidate[better]
+            found |= in_bucket
+
+        return first[found].view(BufferObject)
+    else:
+        raise InvalidNDims(ndim)
+
+
+def _drop_duplicates(arr: np.ndarray) -> np.ndarray:
+    """Drop the repeated values of a sorted array."""
+    keep = np.empty(arr.size, dtype=bool)
+    keep[:1] = True
+    np.not_equal(arr[1:], arr[:-1], out=keep[1:])
+    return arr if keep.all() else arr[keep]
+
+
+def _sorted_unique(arr: np.ndarray) -> np.ndarray:
+    """Return arr as a sorted array without duplicates. Sorted input is not re-sorted."""
+    if arr.size < 2 or np.all(arr[1:] > arr[:-1]):
+        return arr
+    if np.all(arr[1:] >= arr[:-1]):
+        return _drop_duplicates(arr)
+    return np.unique(arr)
@@ -0,0 +1,10 @@
+# Description: The tests write the member index of the parser into a temporary directory, not the user cache.
+
+import atexit
+import os
+import shutil
+import tempfile
+
+if 'IPLOT_CACHE_PATH' not in os.environ:
+    os.environ['IPLOT_CACHE_PATH'] = tempfile.mkdtemp(prefix='iplot_cache_')
+    atexit.register(shutil.rmtree, os.environ['IPLOT_CACHE_PATH'], True)
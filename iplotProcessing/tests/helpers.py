@@ -0,0 +1,26 @@
+# Description: Signal factories shared by the tests.
+
+import typing
+
+from iplotProcessing.core import BufferObject, Signal
+
+
+def make_signal(time, *data, label: str = None, time_unit: str = 's', data_unit: str = 'A',
+                alias_map: typing.Dict[str, typing.Any] = None) -> Signal:
+    """A signal with time in data_store[0] and the data arrays after it, ex: make_signal(t, y, label="ip:ds").
+    Buffer objects are stored as is, the other arrays are wrapped with time_unit or data_unit.
+    alias_map replaces the default alias map when given."""
+    sig = Signal()
+    if label is not None:
+        sig.label = label
+    if alias_map is not None:
+        sig.alias_map.clear()
+        sig.alias_map.update(alias_map)
+    for idx, arr in enumerate((time,) + data):
+        if not isinstance(arr, BufferObject):
+            arr = BufferObject(input_arr=arr, unit=time_unit if idx == 0 else data_unit)
+        if idx < len(sig.data_store):
+            sig.data_store[idx] = arr
+        else:
+            sig.data_store.append(arr)
+    return sig
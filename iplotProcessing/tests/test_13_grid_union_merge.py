@@ -0,0 +1,43 @@
+# Description: Tests the sorted merge behind the grid union.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.math.pre_processing.grid_mixing import union
+
+
+class TestGridUnionMerge(unittest.TestCase):
+    def test_sorted_bases(self):
+        res = union([BufferObject([0, 10, 20, 40, 50]), BufferObject([30, 50]), BufferObject([0, 45])])
+        self.assertListEqual(res.tolist(), [0, 10, 20, 30, 40, 45, 50])
+        self.assertEqual(res.dtype, np.int64)
+
+    def test_unsorted_and_duplicates(self):
+        res = union([BufferObject([3, 1, 2, 1]), BufferObject([2, 2, 5])])
+        self.assertListEqual(res.tolist(), [1, 2, 3, 5])
+
+    def test_matches_unique(self):
+        rng = np.random.default_rng(0)
+        arrays = [np.sort(rng.integers(0, 1000, size)) for size in (10, 250, 999, 1)]
+        res = union([BufferObject(arr) for arr in arrays])
+        self.assertListEqual(res.tolist(), np.unique(np.concatenate(arrays)).tolist())
+
+    def test_native_dtype(self):
+        t0 = 1_700_000_000_000_000_000
+        res = union([BufferObject(np.array([t0, t0 + 1])), BufferObject(np.array([t0 + 1, t0 + 3]))])
+        self.assertEqual(res.dtype, np.int64)
+        self.assertListEqual(res.tolist(), [t0, t0 + 1, t0 + 3])
+
+        res = union([BufferObject(np.array(['2024-01-01', '2024-01-03'], dtype='datetime64[ns]')),
+                     BufferObject(np.array(['2024-01-02'], dtype='datetime64[ns]'))])
+        self.assertEqual(res.dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(res.size, 3)
+
+        res = union([BufferObject([0, 2]), BufferObject([0.5, 1.5])])
+        self.assertEqual(res.dtype, np.float64)
+        self.assertListEqual(res.tolist(), [0., 0.5, 1.5, 2.])
+
+    def test_empty(self):
+        res = union([BufferObject(np.array([], dtype=np.int64)), BufferObject([1, 2])])
+        self.assertListEqual(res.tolist(), [1, 2])
@@ -0,0 +1,67 @@
+# Description: Tests reusable alignment plans.
+
+import unittest
+import numpy as np
+from scipy.interpolate import interp1d
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.math.pre_processing import grid_mixing
+from iplotProcessing.math.pre_processing.grid_mixing import AlignmentPlan, align, get_plan
+from iplotProcessing.common.grid_mixing import GridAlignmentMode
+from iplotProcessing.common.interpolation import InterpolationKind
+from iplotProcessing.tests.helpers import make_signal
+
+
+class TestAlignmentPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        grid_mixing.clear_plan_cache()
+        self.times = [[0, 10, 20, 40, 50], [30, 50], [0, 45]]
+        self.signals = [make_signal(t, np.sin(t), label=f"s{i}:ds") for i, t in enumerate(self.times)]
+        return super().setUp()
+
+    def test_matches_interp1d(self):
+        for kind in [InterpolationKind.LINEAR, InterpolationKind.PREVIOUS,
+                     InterpolationKind.NEXT, InterpolationKind.NEAREST]:
+            signals = [make_signal(t, np.sin(t), label=f"s{i}:ds") for i, t in enumerate(self.times)]
+            result = align(signals, signals[0], mode=GridAlignmentMode.UNION, kind=kind)
+            common = [0, 10, 20, 30, 40, 45, 50]
+            self.assertListEqual(result['self']['time'].tolist(), common)
+            for i, key in enumerate(['self', 's1', 's2']):
+                f = interp1d(self.times[i], np.sin(self.times[i]), kind=kind, fill_value='extrapolate')
+                np.testing.assert_allclose(result[key]['data'], f(common), equal_nan=True)
+                self.assertEqual(result[key]['data'].unit, 'A')
+
+    def test_reuse(self):
+        plan = AlignmentPlan(self.signals, GridAlignmentMode.UNION, InterpolationKind.LINEAR)
+        first = plan.apply(self.signals, self.signals[0])
+
+        refreshed = [make_signal(t, np.cos(t), label=f"s{i}:ds") for i, t in enumerate(self.times)]
+        second = plan.apply(refreshed, refreshed[0])
+        self.assertListEqual(first['s1']['time'].tolist(), second['s1']['time'].tolist())
+        f = interp1d(self.times[1], np.cos(self.times[1]), kind='linear', fill_value='extrapolate')
+        np.testing.assert_allclose(second['s1']['data'], f(second['s1']['time']))
+
+    def test_cache(self):
+        plan = get_plan(self.signals, GridAlignmentMode.UNION, InterpolationKind.LINEAR)
+        refreshed = [make_signal(np.array(t), np.cos(t), label=f"s{i}:ds") for i, t in enumerate(self.times)]
+        self.assertIs(get_plan(refreshed, GridAlignmentMode.UNION, InterpolationKind.LINEAR), plan)
+        self.assertIsNot(get_plan(refreshed, GridAlignmentMode.UNION, InterpolationKind.PREVIOUS), plan)
+
+        refreshed[2].data_store[0] = BufferObject(input_arr=[0, 46], unit='s')
+        self.assertIsNot(get_plan(refreshed, GridAlignmentMode.UNION, InterpolationKind.LINEAR), plan)
+
+    def test_cache_collision(self):
+        # two bases with the same crc32, an older fingerprint of the buffers.
+        bases = [np.array([0, 2507097273660968062]), np.array([0, 2492500576784602499])]
+        plans = [get_plan([make_signal(base, [0., 1.], label="s:ds"), make_signal([0, 1], [0., 1.], label="t:ds")])
+                 for base in bases]
+        self.assertIsNot(plans[0], plans[1])
+
+    def test_align_cached(self):
+        align(self.signals, self.signals[0], kind=InterpolationKind.LINEAR, cache_plan=True)
+        self.assertEqual(len(grid_mixing._plan_cache), 1)
+        refreshed = [make_signal(t, np.cos(t), label=f"s{i}:ds") for i, t in enumerate(self.times)]
+        result = align(refreshed, refreshed[0], kind=InterpolationKind.LINEAR, cache_plan=True)
+        self.assertEqual(len(grid_mixing._plan_cache), 1)
+        self.assertListEqual(refreshed[0].time.tolist(), [0, 10, 20, 30, 40, 45, 50])
+        self.assertAlmostEqual(result['s2']['data'][0], 1.)
@@ -0,0 +1,44 @@
+# Description: Tests that align leaves signals sharing the common base untouched.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.math.pre_processing.grid_mixing import align
+from iplotProcessing.common.grid_mixing import GridAlignmentMode
+from iplotProcessing.common.interpolation import InterpolationKind
+from iplotProcessing.tests.helpers import make_signal
+
+
+class TestSharedBaseAlignment(unittest.TestCase):
+    def test_same_object(self):
+        time = BufferObject(input_arr=np.arange(10), unit='s')
+        signals = [make_signal(time, np.arange(10) * i, label=f"s{i}:ds") for i in range(3)]
+        data = [sig.data_store[1] for sig in signals]
+
+        for mode in [GridAlignmentMode.UNION, GridAlignmentMode.INTERSECTION]:
+            result = align(signals, signals[0], mode=mode, kind=InterpolationKind.LINEAR)
+            self.assertIs(signals[0].time, time)
+            self.assertIs(result['self']['data'], data[0])
+            self.assertIs(result['s1']['data'], data[1])
+            self.assertIs(result['s2']['data'], data[2])
+            self.assertIs(result['s2']['time'], time)
+
+    def test_equal_content(self):
+        signals = [make_signal(np.arange(10), np.arange(10) * i, label=f"s{i}:ds") for i in range(3)]
+        data = [sig.data_store[1] for sig in signals]
+        result = align(signals, signals[0], mode=GridAlignmentMode.INTERSECTION, kind=InterpolationKind.LINEAR)
+        for key, arr in zip(['self', 's1', 's2'], data):
+            self.assertIs(result[key]['data'], arr)
+            self.assertListEqual(result[key]['time'].tolist(), list(range(10)))
+
+    def test_only_differing_signals_interpolated(self):
+        signals = [make_signal([0, 1, 2, 3], [0, 1, 2, 3], label="s0:ds"),
+                   make_signal([0, 1, 2, 3], [0, 10, 20, 30], label="s1:ds"),
+                   make_signal([0, 2], [0, 200], label="s2:ds")]
+        data = [sig.data_store[1] for sig in signals]
+        result = align(signals, signals[0], mode=GridAlignmentMode.UNION, kind=InterpolationKind.LINEAR)
+        self.assertIs(result['self']['data'], data[0])
+        self.assertIs(result['s1']['data'], data[1])
+        self.assertListEqual(result['s2']['data'].tolist(), [0., 100., 200., 300.])
+
@@ -0,0 +1,72 @@
+# Description: Tests the searchsorted based resampler against scipy.
+
+import unittest
+import numpy as np
+from scipy.interpolate import interp1d
+
+from iplotProcessing.core import Signal, BufferObject
+from iplotProcessing.common.interpolation import InterpolationKind
+from iplotProcessing.math.compute.interpolation import SEARCHSORTED_KINDS, Resampler, resample, resample_many
+from iplotProcessing.math.pre_processing.grid_mixing import align
+
+
+class TestResampler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.x = np.array([0, 10, 20, 40, 45])
+        self.y = np.array([1., 2., 4., -3., 0.5])
+        self.x_new = np.array([-5, 0, 3, 5, 10, 15, 20, 25, 40, 42.5, 45, 50])
+        return super().setUp()
+
+    def test_matches_interp1d(self):
+        for kind in SEARCHSORTED_KINDS:
+            expected = interp1d(self.x, self.y, kind=kind, fill_value='extrapolate')(self.x_new)
+            np.testing.assert_allclose(resample(self.x, self.y, self.x_new, kind), expected,
+                                       equal_nan=True, err_msg=kind)
+
+    def test_integer_data(self):
+        res = resample(self.x, np.array([0, 1, 2, 3, 4]), [5, 30], InterpolationKind.LINEAR)
+        self.assertEqual(res.dtype, np.float64)
+        self.assertListEqual(res.tolist(), [0.5, 2.5])
+        res = resample(self.x, np.arange(5, dtype=np.int16), [-5, 30], InterpolationKind.PREVIOUS)
+        self.assertEqual(res.dtype, np.float64)
+        np.testing.assert_array_equal(res, [np.nan, 2.])
+
+    def test_unsorted_base(self):
+        order = np.array([3, 0, 4, 2, 1])
+        x = self.x[order]
+        y = np.square(x).astype(float)
+        for kind in SEARCHSORTED_KINDS:
+            expected = interp1d(x, y, kind=kind, fill_value='extrapolate')(self.x_new)
+            resampler = Resampler(x, self.x_new, kind)
+            np.testing.assert_allclose(resampler(y), expected, equal_nan=True, err_msg=kind)
+            sub, first, last = resampler.chunk(3, 9)
+            np.testing.assert_allclose(sub(y[first:last]), expected[3:9], equal_nan=True, err_msg=kind)
+
+    def test_finer_time_unit(self):
+        x = np.array([0, 1], dtype='datetime64[ms]')
+        x_new = np.array([999990], dtype='datetime64[ns]')
+        self.assertEqual(resample(x, [0., 10.], x_new, InterpolationKind.NEXT)[0], 10.)
+        np.testing.assert_allclose(resample(x, [0., 10.], x_new, InterpolationKind.LINEAR), [9.9999])
+        self.assertEqual(resample(x_new, [5.], x, InterpolationKind.PREVIOUS)[1], 5.)
+
+    def test_many(self):
+        for kind in SEARCHSORTED_KINDS:
+            resampler = Resampler(self.x, self.x_new, kind)
+            arrays = [self.y, 2 * self.y, np.arange(5)]
+            for res, arr in zip(resample_many(resampler, arrays), arrays):
+                np.testing.assert_allclose(res, resampler(arr), equal_nan=True)
+
+    def test_unsupported_kind(self):
+        self.assertRaises(ValueError, Resampler, self.x, self.x_new, InterpolationKind.CUBIC)
+
+    def test_align_spline_fallback(self):
+        signals = []
+        for i, time in enumerate([[0, 1, 2, 3, 4], [0.5, 1.5, 2.5, 3.5]]):
+            sig = Signal()
+            sig.label = f"s{i}:ds"
+            sig.data_store[0] = BufferObject(input_arr=time, unit='s')
+            sig.data_store[1] = BufferObject(input_arr=np.square(time), unit='A')
+            signals.append(sig)
+
+        result = align(signals, signals[0], kind=InterpolationKind.CUBIC)
+        np.testing.assert_allclose(np.asarray(result['s1']['data']), np.square(result['s1']['time']), atol=1e-12)
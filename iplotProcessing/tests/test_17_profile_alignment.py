@@ -0,0 +1,60 @@
+# Description: Tests the rebase of 2D profile signals, ex: Te(t, r).
+
+import unittest
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.common.interpolation import InterpolationKind
+from iplotProcessing.math.compute.interpolation import resample_2d
+from iplotProcessing.math.pre_processing.grid_mixing import align
+from iplotProcessing.tests.helpers import make_signal
+
+
+def profile(t, r):
+    return np.outer(1 + t, 1 - r ** 2)
+
+
+def make_profile(label, time, radius):
+    return make_signal(time, BufferObject(input_arr=radius, unit='m'),
+                       BufferObject(input_arr=profile(np.asarray(time), np.asarray(radius)), unit='eV'),
+                       label=label, alias_map={'time': {'idx': 0, 'independent': True},
+                                               'r': {'idx': 1, 'independent': True},
+                                               'te': {'idx': 2}})
+
+
+class TestProfileAlignment(unittest.TestCase):
+    def setUp(self) -> None:
+        self.t = np.linspace(0., 10., 2001)
+        self.r = np.linspace(0., 1., 33)
+        self.z = np.sin(self.t)[:, None] * np.cos(3 * self.r)[None, :]
+        self.t_new = np.linspace(0., 10., 1234)
+        self.r_new = np.linspace(0., 1., 50)
+        return super().setUp()
+
+    def test_linear(self):
+        res = resample_2d(self.t, self.r, self.z, self.t_new, self.r_new, kind=InterpolationKind.LINEAR)
+        tt, rr = np.meshgrid(self.t_new, self.r_new, indexing='ij')
+        expected = RegularGridInterpolator((self.t, self.r), self.z)((tt, rr))
+        self.assertEqual(res.shape, (self.t_new.size, self.r_new.size))
+        np.testing.assert_allclose(res, expected, atol=1e-12)
+
+    def test_chunks(self):
+        for kind in [InterpolationKind.LINEAR, InterpolationKind.PREVIOUS, InterpolationKind.NEAREST]:
+            full = resample_2d(self.t, self.r, self.z, self.t_new, self.r_new, kind=kind)
+            chunked = resample_2d(self.t, self.r, self.z, self.t_new, self.r_new, kind=kind, chunk_size=7)
+            np.testing.assert_array_equal(full, chunked)
+
+    def test_align(self):
+        signals = [make_profile("s0:ds", [0., 1., 2., 3.], [0., 0.5, 1.]),
+                   make_profile("s1:ds", [0.5, 1.5, 2.5], [0., 0.25, 0.5, 0.75, 1.])]
+        result = align(signals, signals[0], kind=InterpolationKind.LINEAR)
+
+        self.assertListEqual(signals[0].time.tolist(), [0., 0.5, 1., 1.5, 2., 2.5, 3.])
+        self.assertListEqual(signals[0].r.tolist(), [0., 0.25, 0.5, 0.75, 1.])
+        self.assertEqual(signals[0].te.shape, (7, 5))
+        self.assertEqual(signals[0].te.unit, 'eV')
+        self.assertEqual(result['s1']['data'].shape, (7, 5))
+        self.assertListEqual(result['s1']['time'].tolist(), [0., 0.5, 1., 1.5, 2., 2.5, 3.])
+        # linear in time, so exact along time, the radius samples of s1 are kept.
+        np.testing.assert_allclose(result['s1']['data'], profile(result['s1']['time'], signals[0].r))
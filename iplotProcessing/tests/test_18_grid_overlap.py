@@ -0,0 +1,42 @@
+# Description: Tests the sample preserving overlap alignment modes.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.core import Signal, BufferObject
+from iplotProcessing.math.pre_processing.grid_mixing import align, overlap
+from iplotProcessing.common.grid_mixing import GridAlignmentMode
+from iplotProcessing.common.interpolation import InterpolationKind
+
+
+class TestGridOverlap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bases = [BufferObject(input_arr=[0, 10, 20, 40, 50], unit='s'),
+                      BufferObject(input_arr=[5, 15, 25, 30, 35, 45], unit='s'),
+                      BufferObject(input_arr=[12, 42, 60], unit='s')]
+        return super().setUp()
+
+    def test_overlap_union(self):
+        self.assertListEqual(overlap(self.bases).tolist(), [12, 15, 20, 25, 30, 35, 40, 42, 45])
+
+    def test_overlap_densest(self):
+        self.assertListEqual(overlap(self.bases, densest=True).tolist(), [15, 25, 30, 35, 45])
+
+    def test_disjoint(self):
+        self.assertEqual(overlap([BufferObject([0, 1]), BufferObject([2, 3])]).size, 0)
+
+    def test_align(self):
+        signals = []
+        for i, base in enumerate(self.bases):
+            sig = Signal()
+            sig.label = f"s{i}:ds"
+            sig.data_store[0] = base
+            sig.data_store[1] = BufferObject(input_arr=2. * base, unit='A')
+            signals.append(sig)
+
+        result = align(signals, signals[0], mode=GridAlignmentMode.OVERLAP_UNION, kind=InterpolationKind.LINEAR)
+        common = [12, 15, 20, 25, 30, 35, 40, 42, 45]
+        self.assertListEqual(signals[0].time.tolist(), common)
+        self.assertEqual(signals[0].time.unit, 's')
+        for key in ['self', 's1', 's2']:
+            np.testing.assert_allclose(result[key]['data'], 2. * np.array(common))
@@ -0,0 +1,86 @@
+# Description: Tests the streaming alignment against align.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.core import Signal, BufferObject
+from iplotProcessing.math.pre_processing.grid_mixing import align, align_chunks
+from iplotProcessing.common.grid_mixing import GridAlignmentMode
+from iplotProcessing.common.interpolation import InterpolationKind
+from iplotProcessing.tests.helpers import make_signal
+
+
+def make_signals():
+    rng = np.random.default_rng(1)
+    signals = []
+    for i, (start, stop, size) in enumerate([(0, 1000, 500), (100, 1200, 77), (-50, 900, 1000)]):
+        time = np.unique(rng.integers(start, stop, size))
+        sig = Signal()
+        sig.label = f"s{i}:ds"
+        sig.alias_map.update({'dmax': {'idx': 2}})
+        sig.data_store[0] = BufferObject(input_arr=time, unit='ns')
+        sig.data_store[1] = BufferObject(input_arr=np.sin(time / 50.), unit='A')
+        sig.data_store[2] = BufferObject(input_arr=np.cos(time / 50.), unit='A')
+        signals.append(sig)
+    return signals
+
+
+class TestChunkedAlignment(unittest.TestCase):
+    def check(self, mode, kind, **kwargs):
+        signals = make_signals()
+        times, chunks = [], [[] for _ in signals]
+        for time, aligned in align_chunks(signals, mode=mode, kind=kind, **kwargs):
+            times.append(time)
+            self.assertEqual(time.unit, 'ns')
+            for j, sig in enumerate(aligned):
+                self.assertIs(sig.time, time)
+                chunks[j].append((sig.data, sig.dmax))
+
+        reference = make_signals()
+        result = align(reference, reference[0], mode=mode, kind=kind)
+        np.testing.assert_array_equal(np.concatenate(times), reference[0].time)
+        np.testing.assert_allclose(np.concatenate([data for data, _ in chunks[0]]), reference[0].data,
+                                   equal_nan=True)
+        # the result of align holds the last dependent array
+        for j, key in enumerate(['self', 's1', 's2']):
+            np.testing.assert_allclose(np.concatenate([dmax for _, dmax in chunks[j]]), result[key]['data'],
+                                       equal_nan=True)
+        return len(times)
+
+    def test_union(self):
+        for kind in [InterpolationKind.LINEAR, InterpolationKind.PREVIOUS, InterpolationKind.NEXT,
+                     InterpolationKind.NEAREST]:
+            self.assertGreater(self.check(GridAlignmentMode.UNION, kind, chunk_size=64), 5)
+            self.assertGreater(self.check(GridAlignmentMode.UNION, kind, chunk_duration=100), 5)
+
+    def test_overlap(self):
+        self.check(GridAlignmentMode.OVERLAP_UNION, InterpolationKind.LINEAR, chunk_size=10)
+        self.check(GridAlignmentMode.OVERLAP_DENSEST, InterpolationKind.LINEAR, chunk_duration=33)
+
+    def test_intersection(self):
+        self.check(GridAlignmentMode.INTERSECTION, InterpolationKind.LINEAR, chunk_size=100)
+
+    def test_chunk_size(self):
+        signals = make_signals()
+        for time, _ in align_chunks(signals, mode=GridAlignmentMode.UNION, chunk_size=16):
+            self.assertLessEqual(time.size, 3 * 16)
+
+    def test_duplicate_and_unsorted_base(self):
+        for time, data in [([0, 1, 1, 2, 3, 4], [0, 10, 11, 20, 30, 40]), ([0, 2, 1, 4, 3], [0, 20, 10, 40, 30])]:
+            sig = make_signal(np.array(time), np.array(data, dtype=float), time_unit='ns')
+            other = make_signal(np.arange(5), np.zeros(5), time_unit='ns')
+            chunks = list(align_chunks([sig, other], kind=InterpolationKind.PREVIOUS, chunk_size=2))
+            aligned = np.concatenate([chunk[0].data for _, chunk in chunks])
+            np.testing.assert_array_equal(np.concatenate([t for t, _ in chunks]), np.arange(5))
+            np.testing.assert_array_equal(aligned[[0, 2, 3, 4]], [0, 20, 30, 40])
+
+    def test_duplicate_run(self):
+        # more equal samples in a row than chunk_size
+        sig = make_signal(np.array([0, 0, 0, 0, 1, 2]), np.arange(6.), time_unit='ns')
+        other = make_signal(np.array([0, 1, 2]), np.zeros(3), time_unit='ns')
+        chunks = list(align_chunks([sig, other], kind=InterpolationKind.PREVIOUS, chunk_size=2))
+        np.testing.assert_array_equal(np.concatenate([t for t, _ in chunks]), [0, 1, 2])
+        np.testing.assert_array_equal(np.concatenate([chunk[0].data for _, chunk in chunks])[1:], [4., 5.])
+
+    def test_invalid_chunk(self):
+        self.assertRaises(ValueError, lambda: next(align_chunks(make_signals(), chunk_duration=0)))
@@ -0,0 +1,47 @@
+# Description: Tests that parallel alignment gives the same result as the serial one.
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from iplotProcessing.core import Signal, BufferObject
+from iplotProcessing.math.pre_processing.grid_mixing import align
+from iplotProcessing.common.interpolation import InterpolationKind
+
+
+def make_signals(num_signals=12):
+    rng = np.random.default_rng(2)
+    signals = []
+    for i in range(num_signals):
+        time = np.unique(rng.integers(0, 100000, 5000))
+        sig = Signal()
+        sig.label = f"s{i}:ds"
+        sig.data_store[0] = BufferObject(input_arr=time, unit='ns')
+        sig.data_store[1] = BufferObject(input_arr=rng.normal(size=time.size), unit='T')
+        signals.append(sig)
+    # a couple of channels from the same acquisition system
+    signals[1].data_store[0] = signals[0].data_store[0]
+    signals[1].data_store[1] = BufferObject(input_arr=rng.normal(size=signals[0].time.size), unit='T')
+    return signals
+
+
+class TestParallelAlignment(unittest.TestCase):
+    def test_deterministic(self):
+        for kind in [InterpolationKind.LINEAR, InterpolationKind.PREVIOUS, InterpolationKind.CUBIC]:
+            serial_signals = make_signals()
+            serial = align(serial_signals, serial_signals[0], kind=kind)
+
+            pooled_signals = make_signals()
+            pooled = align(pooled_signals, pooled_signals[0], kind=kind, workers=4)
+
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                injected_signals = make_signals()
+                injected = align(injected_signals, injected_signals[0], kind=kind, executor=executor)
+
+            self.assertListEqual(list(serial.keys()), list(pooled.keys()))
+            self.assertListEqual(list(serial.keys()), list(injected.keys()))
+            for key in serial:
+                np.testing.assert_array_equal(serial[key]['data'], pooled[key]['data'])
+                np.testing.assert_array_equal(serial[key]['data'], injected[key]['data'])
+                np.testing.assert_array_equal(serial[key]['time'], injected[key]['time'])
+            np.testing.assert_array_equal(serial_signals[0].data, injected_signals[0].data)
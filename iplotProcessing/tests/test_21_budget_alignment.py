@@ -0,0 +1,60 @@
+# Description: Tests the point budget alignment mode.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.core import Signal, BufferObject
+from iplotProcessing.math.pre_processing.grid_mixing import align, budget, union
+from iplotProcessing.common.grid_mixing import GridAlignmentMode
+from iplotProcessing.common.interpolation import InterpolationKind
+
+
+class TestBudgetAlignment(unittest.TestCase):
+    def setUp(self) -> None:
+        self.signals = []
+        for i, step in enumerate([3, 7, 11]):
+            time = np.arange(i, 300000, step, dtype=np.int64)
+            sig = Signal()
+            sig.label = f"s{i}:ds"
+            sig.data_store[0] = BufferObject(input_arr=time, unit='ns')
+            sig.data_store[1] = BufferObject(input_arr=2 * time, unit='V')
+            sig.data_store[2] = BufferObject(input_arr=3 * time, unit='V')
+            sig.alias_map.update({'data2': {'idx': 2}})
+            self.signals.append(sig)
+        return super().setUp()
+
+    def test_budget(self):
+        bases = [sig.time for sig in self.signals]
+        res = budget(bases, 1000)
+        self.assertLessEqual(res.size, 1000)
+        self.assertGreater(res.size, 900)
+        self.assertTrue(np.all(np.diff(res) > 0))
+        self.assertTrue(np.all(np.isin(res, union(bases))))
+
+    def test_window(self):
+        bases = [sig.time for sig in self.signals]
+        res = budget(bases, 500, window=(1000, 2000))
+        self.assertLessEqual(res.size, 500)
+        self.assertGreaterEqual(res[0], 1000)
+        self.assertLessEqual(res[-1], 2000)
+
+        res = budget(bases, 5000, window=(1000, 2000))
+        self.assertListEqual(res.tolist(), [v for v in union(bases).tolist() if 1000 <= v <= 2000])
+
+    def test_unsorted(self):
+        base = BufferObject(input_arr=np.array([5, 1, 3, 2, 4, 0], dtype=np.int64), unit='ns')
+        ref = BufferObject(input_arr=np.arange(6, dtype=np.int64), unit='ns')
+        self.assertListEqual(budget([base], 3).tolist(), budget([ref], 3).tolist())
+        self.assertListEqual(budget([base], 10, window=(1, 3)).tolist(), [1, 2, 3])
+        self.assertListEqual(budget([base, ref[::2]], 10).tolist(), list(range(6)))
+
+    def test_align(self):
+        result = align(self.signals, self.signals[0], mode=GridAlignmentMode.BUDGET,
+                       kind=InterpolationKind.LINEAR, num_points=4000, window=(50000, 150000))
+        time = self.signals[0].time
+        self.assertLessEqual(time.size, 4000)
+        self.assertEqual(time.unit, 'ns')
+        self.assertTrue(50000 <= time[0] and time[-1] <= 150000)
+        np.testing.assert_allclose(self.signals[0].data, 2 * time)
+        for key in ['self', 's1', 's2']:
+            np.testing.assert_allclose(result[key]['data'], 3 * time)
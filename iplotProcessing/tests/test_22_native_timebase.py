@@ -0,0 +1,91 @@
+# Description: Tests that int64 and datetime64 time bases are aligned in their own dtype.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.common import timebase
+from iplotProcessing.math.compute.interpolation import resample
+from iplotProcessing.math.pre_processing.grid_mixing import align, align_chunks, budget, intersection, union
+from iplotProcessing.common.grid_mixing import GridAlignmentMode
+from iplotProcessing.common.interpolation import InterpolationKind
+from iplotProcessing.tests.helpers import make_signal
+
+# absolute CODAC timestamp, ns since epoch. Above 2**53, so float64 cannot hold every ns.
+T0 = 1_700_000_000_000_000_000
+
+
+class TestNativeTimebase(unittest.TestCase):
+    def test_linspace_exact(self):
+        res = timebase.linspace(T0 + 1, T0 + 11, 3, dtype=np.int64)
+        self.assertEqual(res.dtype, np.int64)
+        self.assertListEqual(res.tolist(), [T0 + 1, T0 + 6, T0 + 11])
+        self.assertListEqual(timebase.linspace(T0, T0 + 10, 11, dtype=np.int64, start=3, stop=6).tolist(),
+                             [T0 + 3, T0 + 4, T0 + 5])
+
+    def test_intersection_ns(self):
+        t1 = T0 + np.arange(1, 102, dtype=np.int64)
+        t2 = T0 + np.arange(3, 200, 2, dtype=np.int64)
+        res = intersection([t1, t2])
+        self.assertEqual(res.dtype, np.int64)
+        self.assertEqual(res[0], T0 + 3)
+        self.assertEqual(res[-1], T0 + 101)
+        self.assertEqual(res.size, 102)
+
+    def test_union_ns(self):
+        t1 = T0 + np.arange(0, 10, 2, dtype=np.int64)
+        t2 = T0 + np.arange(1, 10, 2, dtype=np.int64)
+        res = union([t1, t2])
+        self.assertEqual(res.dtype, np.int64)
+        self.assertTrue(np.array_equal(res, T0 + np.arange(10)))
+
+    def test_datetime64(self):
+        t1 = np.datetime64('2024-01-01T00:00:00', 'ns') + np.arange(0, 10, 2).astype('m8[s]')
+        t2 = np.datetime64('2024-01-01T00:00:01', 'ns') + np.arange(0, 10, 2).astype('m8[s]')
+        res = union([t1, t2])
+        self.assertEqual(res.dtype, np.dtype('M8[ns]'))
+        self.assertEqual(res.size, 10)
+
+        res = intersection([t1, t2])
+        self.assertEqual(res.dtype, np.dtype('M8[ns]'))
+        self.assertEqual(res[0], t2[0])
+        self.assertEqual(res[-1], t1[-1])
+
+        res = budget([t1, t2], 4)
+        self.assertEqual(res.dtype, np.dtype('M8[ns]'))
+        self.assertLessEqual(res.size, 4)
+
+        y = np.arange(t1.size, dtype=np.float64)
+        res = resample(t1, y, t2, kind=InterpolationKind.LINEAR)
+        self.assertTrue(np.allclose(res, y + 0.5))
+
+    def test_resample_ns(self):
+        # a ramp of 1 per ns, offsets of a few ns from T0 are exact.
+        x = T0 + np.arange(0, 20, 4, dtype=np.int64)
+        x_new = T0 + np.arange(0, 17, dtype=np.int64)
+        res = resample(x, (x - T0).astype(np.float64), x_new, kind=InterpolationKind.LINEAR)
+        self.assertTrue(np.array_equal(res, np.arange(17, dtype=np.float64)))
+
+    def test_align_ns(self):
+        sig1 = make_signal(T0 + np.arange(0, 20, 4, dtype=np.int64), np.arange(0, 20, 4.),
+                           label="s1:ds", time_unit='ns')
+        sig2 = make_signal(T0 + np.arange(1, 20, 2, dtype=np.int64), np.arange(1, 20, 2.),
+                           label="s2:ds", time_unit='ns')
+        res = align([sig1, sig2], sig1, mode=GridAlignmentMode.INTERSECTION, kind=InterpolationKind.LINEAR)
+        time = np.asarray(res['self']['time'])
+        self.assertEqual(time.dtype, np.int64)
+        self.assertTrue(np.allclose(np.asarray(res['self']['data']), (time - T0).astype(np.float64)))
+
+        # align rebased sig1 in place
+        sig1 = make_signal(T0 + np.arange(0, 20, 4, dtype=np.int64), np.arange(0, 20, 4.),
+                           label="s1:ds", time_unit='ns')
+        chunks = list(align_chunks([sig1, sig2], mode=GridAlignmentMode.INTERSECTION, chunk_size=3))
+        self.assertTrue(np.array_equal(np.concatenate([np.asarray(time) for time, _ in chunks]), time))
+
+    def test_mixed_dtype_warning(self):
+        with self.assertLogs(timebase.logger, level='WARNING'):
+            res = union([np.arange(5, dtype=np.int64), np.arange(5, dtype=np.float64) + 0.5])
+        self.assertEqual(res.dtype, np.float64)
+
+
+if __name__ == "__main__":
+    unittest.main()
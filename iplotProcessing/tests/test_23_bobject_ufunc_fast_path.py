@@ -0,0 +1,51 @@
+# Description: Tests that the single operand/output ufunc path of a buffer object matches the generic one.
+
+import unittest
+import numpy as np
+from iplotProcessing.core import BufferObject
+
+
+class TestBObjectUfuncFastPath(unittest.TestCase):
+    def setUp(self) -> None:
+        self.b1 = BufferObject([0., 1., 2., 3.], unit='s')
+        self.b2 = BufferObject([4., 5., 6., 7.], unit='s')
+        return super().setUp()
+
+    def check_same(self, fast, generic):
+        self.assertIsInstance(fast, BufferObject)
+        self.assertEqual(fast.dtype, generic.dtype)
+        self.assertEqual(fast.shape, generic.shape)
+        self.assertTrue(np.array_equal(fast, generic))
+        # IDV-280
+        self.assertEqual(fast.unit, '')
+        self.assertEqual(generic.unit, '')
+
+    def test_binary(self):
+        self.check_same(self.b1 + self.b2, np.add(self.b1, self.b2, where=True))
+        self.check_same(self.b1 * 2, np.multiply(self.b1, 2, where=True))
+        self.check_same(2. - self.b1, np.subtract(2., self.b1, where=True))
+        self.check_same(self.b1 + np.ones(4), np.add(self.b1, np.ones(4), where=True))
+
+    def test_unary(self):
+        self.check_same(np.sin(self.b1), np.sin(self.b1, where=True))
+        self.check_same(-self.b1, np.negative(self.b1, where=True))
+
+    def test_0d(self):
+        b = BufferObject(input_arr=np.float64(2.), unit='V')
+        self.check_same(np.sqrt(b), np.sqrt(b, where=True))
+        self.assertEqual(np.sqrt(b).shape, (1,))
+
+    def test_attributes(self):
+        self.b1.label = 'ip'
+        self.assertEqual((self.b1 * 2).label, 'ip')
+        self.assertEqual(self.b1.unit, 's')
+
+    def test_out(self):
+        out = BufferObject(shape=(4,), unit='s')
+        res = np.add(self.b1, self.b2, out=out)
+        self.assertIs(res, out)
+        self.assertTrue(np.array_equal(out, [4., 6., 8., 10.]))
+
+
+if __name__ == "__main__":
+    unittest.main()
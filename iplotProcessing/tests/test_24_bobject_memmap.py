@@ -0,0 +1,55 @@
+# Description: Tests memory mapped buffer objects.
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from iplotProcessing.core import BufferObject
+
+
+class TestBObjectMemmap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = np.arange(1000, dtype=np.float64)
+        self.npy = os.path.join(self.tmp.name, 'ip.npy')
+        np.save(self.npy, self.data)
+        self.raw = os.path.join(self.tmp.name, 'ip.bin')
+        self.data.astype(np.int32).tofile(self.raw)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def test_from_file_npy(self):
+        b = BufferObject.from_file(self.npy, unit='A')
+        self.assertIsInstance(b, BufferObject)
+        self.assertIsInstance(b.base, np.memmap)
+        self.assertEqual(b.unit, 'A')
+        self.assertTrue(np.array_equal(b, self.data))
+
+    def test_from_file_raw(self):
+        b = BufferObject.from_file(self.raw, unit='A', dtype=np.int32, offset=400, shape=(10,))
+        self.assertEqual(b.dtype, np.int32)
+        self.assertTrue(np.array_equal(b, self.data[100:110]))
+
+    def test_from_memmap(self):
+        mm = np.load(self.npy, mmap_mode='r')
+        b = BufferObject.from_memmap(mm, unit='A')
+        self.assertTrue(np.shares_memory(b, mm))
+        self.assertEqual(b.unit, 'A')
+
+    def test_slice_and_ufunc(self):
+        b = BufferObject.from_file(self.npy, unit='A')
+        window = b[100:200]
+        self.assertTrue(np.shares_memory(window, b))
+        self.assertEqual(window.unit, 'A')
+
+        res = window * 2
+        self.assertIsInstance(res, BufferObject)
+        self.assertEqual(res.unit, '')
+        self.assertTrue(np.array_equal(res, self.data[100:200] * 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
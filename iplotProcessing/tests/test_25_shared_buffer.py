@@ -0,0 +1,75 @@
+# Description: Tests buffer objects in shared memory and their hand-off to worker processes.
+
+import gc
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.core.shared import SharedHandle, allocate_shared, get_handle, to_shared
+
+
+def double(handle: SharedHandle) -> float:
+    buffer = handle.attach()
+    np.multiply(buffer, 2, out=buffer)
+    return float(np.asarray(buffer).sum())
+
+
+def exists(name: str) -> bool:
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class TestSharedBuffer(unittest.TestCase):
+    def test_allocate(self):
+        b = allocate_shared((3, 4), np.int32, unit='A')
+        self.assertIsInstance(b, BufferObject)
+        self.assertEqual(b.shape, (3, 4))
+        self.assertEqual(b.dtype, np.int32)
+        self.assertEqual(b.unit, 'A')
+        self.assertFalse(b.any())
+
+    def test_handle_pickle(self):
+        b = to_shared(BufferObject(np.arange(5.), unit='V'))
+        handle = pickle.loads(pickle.dumps(get_handle(b)))
+        self.assertEqual(handle.unit, 'V')
+        other = handle.attach()
+        other[0] = 10.
+        self.assertEqual(b[0], 10.)
+
+    def test_view_has_no_handle(self):
+        b = to_shared(np.arange(5.))
+        self.assertRaises(ValueError, get_handle, b[1:])
+        self.assertRaises(ValueError, get_handle, BufferObject(np.arange(5.)))
+
+    def test_worker(self):
+        b = to_shared(BufferObject(np.arange(10.), unit='V'))
+        with ProcessPoolExecutor(1) as executor:
+            self.assertEqual(executor.submit(double, get_handle(b)).result(), 90.)
+        self.assertTrue(np.array_equal(b, 2 * np.arange(10.)))
+
+    def test_lifecycle(self):
+        b = to_shared(np.arange(10.))
+        view = b[2:4]
+        handle = get_handle(b)
+        name = handle.name
+
+        del b
+        gc.collect()
+        self.assertTrue(exists(name))
+        del handle
+        gc.collect()
+        self.assertTrue(exists(name))
+        del view
+        gc.collect()
+        self.assertFalse(exists(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
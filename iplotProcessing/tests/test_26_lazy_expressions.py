@@ -0,0 +1,65 @@
+# Description: Tests the lazy evaluation of expressions on buffer objects and signals.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.core import BufferObject, Signal
+from iplotProcessing.core.lazy import LazyExpr, evaluate, is_lazy, lazy
+
+
+class TestLazyExpressions(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.a, self.b, self.c, self.d = [BufferObject(input_arr=rng.random(1000), unit='V') for _ in range(4)]
+        return super().setUp()
+
+    def test_chain(self):
+        expr = (lazy(self.a) + self.b) * self.c - self.d
+        self.assertIsInstance(expr, LazyExpr)
+        self.assertEqual(expr.shape, (1000,))
+        for chunk_size in [None, 1, 7, 1000, 5000]:
+            res = expr.evaluate(chunk_size)
+            self.assertIsInstance(res, BufferObject)
+            self.assertEqual(res.unit, '')
+            self.assertTrue(np.array_equal(res, (self.a + self.b) * self.c - self.d))
+
+    def test_shared_subexpression(self):
+        s = lazy(self.a) + self.b
+        res = (s * s + np.sin(s)).evaluate(chunk_size=64)
+        ref = (self.a + self.b) * (self.a + self.b) + np.sin(self.a + self.b)
+        self.assertTrue(np.array_equal(res, ref))
+
+    def test_dtype(self):
+        self.assertEqual((lazy(np.arange(5)) + 1).dtype, np.int64)
+        self.assertEqual((lazy(np.arange(5, dtype=np.int32)) + 1.5).dtype, np.float64)
+        self.assertEqual((lazy(np.arange(5)) / 2).evaluate().dtype, np.float64)
+
+    def test_broadcast(self):
+        m = BufferObject(input_arr=np.arange(300 * 7, dtype=np.float64).reshape(300, 7))
+        v = np.arange(7.)
+        res = (lazy(m) * (lazy(v) + 2) - 3).evaluate(chunk_size=50)
+        self.assertTrue(np.array_equal(res, m * (v + 2) - 3))
+
+    def test_eager_fallback(self):
+        expr = lazy(self.a) * 2
+        self.assertAlmostEqual(float(np.sum(expr)[0]), float(np.sum(self.a * 2)[0]))
+        self.assertTrue(np.array_equal(np.asarray(expr), self.a * 2))
+
+    def test_signal(self):
+        s1 = Signal()
+        s1.data_store[0] = BufferObject(input_arr=np.arange(5), unit='s')
+        s1.data_store[1] = BufferObject(input_arr=np.arange(5.), unit='V')
+        s2 = Signal()
+        s2.data_store[0] = s1.data_store[0]
+        s2.data_store[1] = BufferObject(input_arr=np.ones(5), unit='V')
+
+        res = s2 + lazy(s1) * 2
+        self.assertTrue(is_lazy(res))
+        self.assertIs(res.time, s1.time)
+        evaluate(res)
+        self.assertFalse(is_lazy(res))
+        self.assertTrue(np.array_equal(res.data, (s2 + s1 * 2).data))
+
+
+if __name__ == "__main__":
+    unittest.main()
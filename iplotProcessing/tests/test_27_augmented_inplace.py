@@ -0,0 +1,87 @@
+# Description: Tests that augmented operators write into the existing buffers when the result fits.
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.tests.helpers import make_signal
+
+
+class TestAugmentedInplace(unittest.TestCase):
+    def test_buffer_inplace(self):
+        b = BufferObject(input_arr=np.arange(5.), unit='V')
+        ref = b
+        b += 1
+        b *= BufferObject(input_arr=np.full(5, 2.))
+        self.assertIs(b, ref)
+        self.assertTrue(np.array_equal(b, [2., 4., 6., 8., 10.]))
+        self.assertEqual(b.unit, '')
+
+    def test_buffer_fallback(self):
+        b = BufferObject(input_arr=np.arange(5))
+        ref = b
+        b += 1.5
+        self.assertIsNot(b, ref)
+        self.assertEqual(b.dtype, np.float64)
+        self.assertTrue(np.array_equal(ref, np.arange(5)))
+
+        b = BufferObject(input_arr=np.arange(5))
+        b /= 2
+        self.assertEqual(b.dtype, np.float64)
+
+        b = BufferObject(input_arr=np.arange(5.))
+        b -= np.ones((2, 5))
+        self.assertEqual(b.shape, (2, 5))
+
+    def test_memmap(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "data.npy")
+            np.save(filename, np.arange(5))
+            b = BufferObject.from_file(filename, mode='r+')
+            b += 1
+            b.base.flush()
+            self.assertListEqual(np.load(filename).tolist(), [1, 2, 3, 4, 5])
+            # the result does not fit in the int64 buffer: a new buffer, the file is left as is.
+            b += 0.5
+            self.assertNotIsInstance(b.base, np.memmap)
+            self.assertListEqual(np.load(filename).tolist(), [1, 2, 3, 4, 5])
+            del b
+
+    def test_signal_inplace(self):
+        s1 = make_signal(np.arange(5), np.arange(5.))
+        s2 = make_signal(np.arange(5), np.ones(5))
+        ref, data, time = s1, s1.data, s1.time
+        s1 += s2
+        s1 *= 2
+        self.assertIs(s1, ref)
+        self.assertIs(s1.data, data)
+        self.assertIs(s1.time, time)
+        self.assertTrue(np.array_equal(s1.data, [2., 4., 6., 8., 10.]))
+        self.assertTrue(np.array_equal(s1.time, np.arange(5)))
+
+    def test_signal_fallback(self):
+        s1 = make_signal(np.arange(5), np.arange(5))
+        data = s1.data
+        s1 += 0.5
+        self.assertIsNot(s1.data, data)
+        self.assertTrue(np.array_equal(s1.data, np.arange(5) + 0.5))
+        self.assertTrue(np.array_equal(data, np.arange(5)))
+
+    def test_signal_ufunc_out(self):
+        s1 = make_signal(np.arange(5), np.arange(5.))
+        s1.data_store[2] = BufferObject(input_arr=np.zeros(5))
+        s1.alias_map.update({'data2': {'idx': 2}})
+        s2 = make_signal(np.arange(5), np.ones(5))
+        s2.data_store[2] = BufferObject(input_arr=np.full(5, 3.))
+        s2.alias_map.update({'data2': {'idx': 2}})
+
+        res = np.add(s1, s2, out=(s1,))
+        self.assertIs(res, s1)
+        self.assertTrue(np.array_equal(s1.data, np.arange(5.) + 1))
+        self.assertTrue(np.array_equal(s1.data2, np.full(5, 3.)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# Description: Tests the block reductions and min/max envelopes.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.common.binning import BlockReduction
+from iplotProcessing.core import BufferObject, Signal
+from iplotProcessing.math.pre_processing import binning
+from iplotProcessing.math.pre_processing.binning import block_reduce, block_starts, envelope
+
+ALL = (BlockReduction.MIN, BlockReduction.MAX, BlockReduction.MEAN, BlockReduction.STD)
+
+
+class TestBlockReduction(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.time = BufferObject(input_arr=np.arange(1000, dtype=np.int64) * 10, unit='ns')
+        self.data = BufferObject(input_arr=rng.normal(size=1000), unit='V')
+        return super().setUp()
+
+    def check(self, res: dict, blocks: list):
+        for name, func in [(BlockReduction.MIN, np.min), (BlockReduction.MAX, np.max),
+                           (BlockReduction.MEAN, np.mean), (BlockReduction.STD, np.std)]:
+            ref = [func(np.asarray(block)) for block in blocks]
+            self.assertTrue(np.allclose(np.asarray(res[name]), ref), name)
+            self.assertEqual(res[name].unit, 'V')
+
+    def test_block_size(self):
+        time, res = block_reduce(self.time, self.data, block_size=64, reductions=ALL)
+        self.assertEqual(time.size, 16)
+        self.assertEqual(time.unit, 'ns')
+        self.assertEqual(time.dtype, np.int64)
+        self.assertEqual(time[0], (0 + 630) // 2)
+        self.assertEqual(time[-1], (9600 + 9990) // 2)
+        self.check(res, np.array_split(np.asarray(self.data), np.arange(64, 1000, 64)))
+
+    def test_block_duration(self):
+        time = self.time.copy()
+        time[100:200] += 5000  # a gap, the empty windows are dropped
+        time = np.sort(time)
+        starts = block_starts(time, block_duration=300)
+        self.assertTrue(np.all(np.diff(starts) > 0))
+        time_out, res = block_reduce(time, self.data, block_duration=300, reductions=ALL)
+        self.assertEqual(time_out.size, starts.size)
+        self.check(res, np.split(np.asarray(self.data), starts[1:]))
+
+    def test_chunks(self):
+        chunk_samples = binning.CHUNK_SAMPLES
+        try:
+            binning.CHUNK_SAMPLES = 100
+            _, res = block_reduce(self.time, self.data, block_size=7, reductions=ALL)
+        finally:
+            binning.CHUNK_SAMPLES = chunk_samples
+        self.check(res, np.array_split(np.asarray(self.data), np.arange(7, 1000, 7)))
+
+    def test_2d(self):
+        profile = np.arange(1000 * 3, dtype=np.float64).reshape(1000, 3)
+        _, res = block_reduce(self.time, profile, block_size=100, reductions=[BlockReduction.MAX])
+        self.assertEqual(res[BlockReduction.MAX].shape, (10, 3))
+        self.assertTrue(np.array_equal(res[BlockReduction.MAX][0], profile[99]))
+
+    def test_large_offset(self):
+        data = BufferObject(input_arr=1e9 + np.asarray(self.data), unit='V')
+        _, res = block_reduce(self.time, data, block_size=100, reductions=[BlockReduction.STD])
+        ref = np.std(np.asarray(data).reshape(10, 100), axis=1)
+        np.testing.assert_allclose(np.asarray(res[BlockReduction.STD]), ref, rtol=1e-6)
+
+    def test_buffer_method(self):
+        time, res = self.data.block_reduce(self.time, block_size=64, reductions=ALL)
+        self.assertEqual(time.size, 16)
+        self.check(res, np.array_split(np.asarray(self.data), np.arange(64, 1000, 64)))
+        time, res = self.data.block_reduce(block_size=100)
+        self.assertListEqual(time.tolist(), list(range(49, 1000, 100)))
+        self.assertEqual(res[BlockReduction.MAX].unit, 'V')
+
+    def test_empty(self):
+        data = BufferObject(input_arr=np.empty(0, dtype=np.int32), unit='V')
+        for kwargs in [{'block_size': 10}, {'block_duration': 10}]:
+            time, res = data.block_reduce(self.time[:0], reductions=ALL, **kwargs)
+            self.assertEqual(time.size, 0)
+            self.assertEqual(time.unit, 'ns')
+            for name in ALL:
+                self.assertEqual(res[name].size, 0)
+                self.assertEqual(res[name].unit, 'V')
+            self.assertEqual(res[BlockReduction.MIN].dtype, np.int32)
+            self.assertEqual(res[BlockReduction.MEAN].dtype, np.float64)
+        time, res = data.block_reduce(block_size=10)
+        self.assertEqual(time.size, 0)
+
+    def test_envelope(self):
+        sig = Signal()
+        sig.data_store[0] = self.time
+        sig.data_store[1] = self.data
+        env = envelope(sig, block_size=100)
+        self.assertEqual(env.time.unit, 'ns')
+        self.assertTrue(np.all(env.dmin <= env.dmax))
+        self.assertEqual(env.dmax.size, 10)
+        self.assertEqual(np.asarray(env.dmax).max(), np.asarray(self.data).max())
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, block_reduce, self.time, self.data)
+        self.assertRaises(ValueError, block_reduce, self.time, self.data, block_size=0)
+        self.assertRaises(ValueError, block_reduce, self.time, self.data, block_size=10, reductions=['median'])
+
+
+if __name__ == "__main__":
+    unittest.main()
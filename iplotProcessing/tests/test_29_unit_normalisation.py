@@ -0,0 +1,89 @@
+# Description: Tests that time bases in different units are converted to the finest unit before alignment.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.common.units import get_conversion_factor
+from iplotProcessing.core import BufferObject
+from iplotProcessing.math.pre_processing.grid_mixing import AlignmentPlan, align, align_chunks, normalize_units
+from iplotProcessing.common.grid_mixing import GridAlignmentMode
+from iplotProcessing.common.interpolation import InterpolationKind
+from iplotProcessing.tests.helpers import make_signal
+
+
+class TestUnitNormalisation(unittest.TestCase):
+    def test_conversion_factor(self):
+        self.assertEqual(get_conversion_factor('ms', 'ns'), 1000000)
+        self.assertIsInstance(get_conversion_factor('s', 'us'), int)
+        self.assertEqual(get_conversion_factor('Y', 'M'), 12)
+        self.assertEqual(get_conversion_factor('h', 'm'), 60)
+        self.assertAlmostEqual(get_conversion_factor('ns', 'us'), 1e-3)
+
+    def test_normalize(self):
+        sig_ms = make_signal(np.array([1, 2, 3], dtype=np.int64), [1., 2., 3.], label="ms:ds", time_unit='ms')
+        sig_ns = make_signal(np.array([1500000, 2500000], dtype=np.int64), [1.5, 2.5], label="ns:ds", time_unit='ns')
+        res = normalize_units([sig_ms, sig_ns])
+        self.assertIs(res[1], sig_ns)
+        self.assertIsNot(res[0], sig_ms)
+        self.assertEqual(res[0].time.unit, 'ns')
+        self.assertEqual(res[0].time.dtype, np.int64)
+        self.assertListEqual(res[0].time.tolist(), [1000000, 2000000, 3000000])
+        self.assertIs(res[0].data, sig_ms.data)
+        self.assertEqual(res[0].label, "ms:ds")
+        # the source is left as is
+        self.assertEqual(sig_ms.time.unit, 'ms')
+        self.assertListEqual(sig_ms.time.tolist(), [1, 2, 3])
+
+    def test_overflow(self):
+        sig_s = make_signal(np.array([0, 10 ** 10], dtype=np.int64), [0., 1.], label="s:ds", time_unit='s')
+        sig_ns = make_signal(np.array([0, 1], dtype=np.int64), [0., 1.], label="ns:ds", time_unit='ns')
+        self.assertRaises(OverflowError, normalize_units, [sig_s, sig_ns])
+
+    def test_float_base(self):
+        sig_s = make_signal(np.array([0., 0.5, 1.]), [0., 1., 2.], label="s:ds", time_unit='s')
+        sig_ms = make_signal(np.array([250., 750.]), [0., 1.], label="ms:ds", time_unit='ms')
+        res = normalize_units([sig_s, sig_ms])
+        self.assertEqual(res[0].time.unit, 'ms')
+        self.assertListEqual(res[0].time.tolist(), [0., 500., 1000.])
+
+    def test_align(self):
+        sig_ms = make_signal(np.array([0, 1, 2, 3], dtype=np.int64), [0., 1., 2., 3.], label="ms:ds", time_unit='ms')
+        sig_ns = make_signal(np.array([500000, 1500000], dtype=np.int64), [0.5, 1.5], label="ns:ds", time_unit='ns')
+        res = align([sig_ms, sig_ns], sig_ms, mode=GridAlignmentMode.UNION, kind=InterpolationKind.LINEAR)
+        time = res['self']['time']
+        self.assertEqual(time.unit, 'ns')
+        self.assertListEqual(np.asarray(time).tolist(), [0, 500000, 1000000, 1500000, 2000000, 3000000])
+        self.assertTrue(np.allclose(np.asarray(res['self']['data']), [0., 0.5, 1., 1.5, 2., 3.]))
+        self.assertIs(sig_ms.time, time)
+
+    def test_budget_window(self):
+        # the window is in the unit of the first signal, s here, and the common base in ms.
+        sig_s = make_signal(np.arange(10, dtype=np.int64), np.arange(10.), label="s:ds", time_unit='s')
+        sig_ms = make_signal(np.arange(0, 10000, 500, dtype=np.int64), np.arange(20.), label="ms:ds", time_unit='ms')
+        res = align([sig_s, sig_ms], sig_s, mode=GridAlignmentMode.BUDGET, kind=InterpolationKind.LINEAR,
+                    window=(2, 5))
+        time = res['self']['time']
+        self.assertEqual(time.unit, 'ms')
+        self.assertListEqual(np.asarray(time).tolist(), list(range(2000, 5001, 500)))
+
+    def test_plan_does_not_retain_conversions(self):
+        sig_ms = make_signal(np.array([0, 1, 2, 3], dtype=np.int64), [0., 1., 2., 3.], label="ms:ds", time_unit='ms')
+        sig_ns = make_signal(np.array([500000, 1500000], dtype=np.int64), [0.5, 1.5], label="ns:ds", time_unit='ns')
+        plan = AlignmentPlan([sig_ms, sig_ns], kind=InterpolationKind.LINEAR)
+        for _ in range(3):
+            sig_ms.data_store[0] = BufferObject(input_arr=np.array([0, 1, 2, 3], dtype=np.int64), unit='ms')
+            res = plan.apply([sig_ms, sig_ns], sig_ns)
+            self.assertTrue(np.allclose(np.asarray(res['ms']['data']), [0., 0.5, 1., 1.5, 2., 3.]))
+            self.assertEqual(len(plan._converted), 0)
+
+    def test_align_chunks(self):
+        sig_ms = make_signal(np.array([0, 1, 2, 3], dtype=np.int64), [0., 1., 2., 3.], label="ms:ds", time_unit='ms')
+        sig_ns = make_signal(np.array([500000, 1500000], dtype=np.int64), [0.5, 1.5], label="ns:ds", time_unit='ns')
+        chunks = list(align_chunks([sig_ms, sig_ns], mode=GridAlignmentMode.UNION, chunk_size=2))
+        time = np.concatenate([np.asarray(time) for time, _ in chunks])
+        self.assertListEqual(time.tolist(), [0, 500000, 1000000, 1500000, 2000000, 3000000])
+        self.assertEqual(chunks[0][0].unit, 'ns')
+
+
+if __name__ == "__main__":
+    unittest.main()
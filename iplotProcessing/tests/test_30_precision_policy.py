@@ -0,0 +1,84 @@
+# Description: Tests the compact storage of buffer objects and signals and the dtypes used in computations.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.common import precision
+from iplotProcessing.core import BufferObject, Signal
+from iplotProcessing.core.lazy import lazy
+from iplotProcessing.math.compute.interpolation import resample
+
+
+class TestPrecisionPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        # 16-bit ADC values stored as float64
+        self.adc = BufferObject(input_arr=rng.integers(-32768, 32768, 1000).astype(np.float64), unit='V')
+        return super().setUp()
+
+    def test_compact_dtype(self):
+        self.assertEqual(precision.compact_dtype(np.array([1., -300.])), np.int16)
+        self.assertEqual(precision.compact_dtype(np.array([0.5, 0.25])), np.float32)
+        self.assertEqual(precision.compact_dtype(np.array([0.1])), np.float64)
+        self.assertEqual(precision.compact_dtype(np.array([np.nan, 1.])), np.float64)
+        self.assertEqual(precision.compact_dtype(np.arange(100, dtype=np.int64)), np.int8)
+
+    def test_compact(self):
+        b = self.adc.compact()
+        self.assertEqual(b.dtype, np.int16)
+        self.assertEqual(b.unit, 'V')
+        self.assertTrue(np.array_equal(b, self.adc))
+        self.assertEqual(self.adc.compact(np.float32).dtype, np.float32)
+        self.assertRaises(ValueError, self.adc.compact, np.int8)
+        self.assertRaises(ValueError, BufferObject(input_arr=[0.5]).compact, np.int32)
+
+    def test_signal_compact(self):
+        sig = Signal()
+        sig.data_store[0] = BufferObject(input_arr=np.arange(1000, dtype=np.int64), unit='ns')
+        sig.data_store[1] = self.adc
+        before = sig.nbytes
+        sig.compact()
+        self.assertEqual(sig.data.dtype, np.int16)
+        self.assertEqual(sig.time.dtype, np.int64)
+        self.assertEqual(sig.nbytes, before - 6000)
+
+    def test_arithmetic(self):
+        b = self.adc.compact()
+        self.assertEqual((b + b).dtype, np.int64)
+        self.assertTrue(np.array_equal(b + b, 2 * self.adc))
+        self.assertTrue(np.array_equal(b * b, self.adc * self.adc))
+        self.assertEqual((b + 0.5).dtype, np.float64)
+        self.assertEqual(np.maximum(b, b).dtype, np.int16)
+        self.assertEqual((lazy(b) - b).evaluate().dtype, np.int64)
+
+        c = b
+        c += b
+        self.assertIsNot(c, b)
+        self.assertTrue(np.array_equal(c, 2 * self.adc))
+
+    def test_int32_arithmetic(self):
+        # int32 is not widened, it follows numpy
+        b = BufferObject(input_arr=np.arange(10, dtype=np.int32), unit='V')
+        self.assertEqual((b + b).dtype, np.int32)
+        self.assertEqual((b * 2).dtype, np.int32)
+        self.assertEqual((lazy(b) - b).evaluate().dtype, np.int32)
+        c = b
+        c += b
+        self.assertIs(c, b)
+        self.assertListEqual(b.tolist(), list(range(0, 20, 2)))
+
+    def test_reductions(self):
+        f = self.adc.compact(np.float32)
+        self.assertEqual(np.sum(f).dtype, np.float64)
+        self.assertEqual(np.mean(f).dtype, np.float64)
+        self.assertEqual(np.max(f).dtype, np.float32)
+        self.assertEqual(np.sum(self.adc.compact()).dtype, np.int64)
+
+    def test_interpolation(self):
+        x = np.arange(1000)
+        self.assertEqual(resample(x, self.adc.compact(), x + 0.5).dtype, np.float64)
+        self.assertEqual(resample(x, self.adc.compact(np.float32), x + 0.5).dtype, np.float32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# Description: Tests pickling buffer objects and signals, in-band and with out-of-band buffers (protocol 5).
+
+import pickle
+import unittest
+import numpy as np
+
+from iplotProcessing.core import BufferObject, Signal
+
+
+class TestPickleOutOfBand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.time = BufferObject(input_arr=np.arange(1000, dtype=np.int64), unit='ns')
+        self.data = BufferObject(input_arr=np.sin(np.arange(1000.)), unit='V')
+        return super().setUp()
+
+    def test_in_band(self):
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            res = pickle.loads(pickle.dumps(self.data, protocol=protocol))
+            self.assertIsInstance(res, BufferObject)
+            self.assertEqual(res.unit, 'V')
+            self.assertTrue(np.array_equal(res, self.data))
+            self.assertTrue(res.flags.writeable)
+
+    def test_out_of_band(self):
+        buffers = []
+        payload = pickle.dumps(self.data, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 1)
+        self.assertLess(len(payload), self.data.nbytes)
+        res = pickle.loads(payload, buffers=buffers)
+        self.assertEqual(res.unit, 'V')
+        self.assertTrue(np.shares_memory(res, self.data))
+
+    def test_layouts(self):
+        fortran = BufferObject(input_arr=np.asfortranarray(np.arange(6.).reshape(2, 3)), unit='A')
+        res = pickle.loads(pickle.dumps(fortran, protocol=5))
+        self.assertTrue(np.array_equal(res, fortran))
+        self.assertTrue(res.flags.f_contiguous)
+
+        strided = self.data[::3]
+        res = pickle.loads(pickle.dumps(strided, protocol=5))
+        self.assertTrue(np.array_equal(res, strided))
+        self.assertEqual(res.unit, 'V')
+
+        dates = BufferObject(input_arr=np.arange(3).astype('M8[ns]'), unit='ns')
+        self.assertTrue(np.array_equal(pickle.loads(pickle.dumps(dates, protocol=5)), dates))
+
+    def test_legacy_pickle(self):
+        class Legacy:
+            # the default ndarray reduce, which buffer objects used before they pickled their attributes.
+            def __reduce__(this):
+                return np.ndarray.__reduce__(self.data)
+
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            res = pickle.loads(pickle.dumps(Legacy(), protocol=protocol))
+            self.assertIsInstance(res, BufferObject)
+            self.assertTrue(np.array_equal(res, self.data))
+
+    def test_signal(self):
+        sig = Signal()
+        sig.label = "ip:ds"
+        sig.data_store[0] = self.time
+        sig.data_store[1] = self.data
+        sig.data_store[2] = BufferObject(input_arr=np.cos(np.arange(1000.)), unit='V')
+        sig.alias_map.update({'data2': {'idx': 2}})
+
+        buffers = []
+        payload = pickle.dumps(sig, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 3)
+        self.assertLess(len(payload), 1000)
+        res = pickle.loads(payload, buffers=buffers)
+        self.assertEqual(res.label, "ip:ds")
+        self.assertDictEqual(res.alias_map, sig.alias_map)
+        self.assertEqual(res.time.unit, 'ns')
+        self.assertEqual(res.data2.unit, 'V')
+        self.assertTrue(np.shares_memory(res.data, self.data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# Description: Tests that the accessors of a signal follow the modifications of its alias map.
+
+import copy
+import pickle
+import unittest
+import numpy as np
+
+from iplotProcessing.core import BufferObject
+from iplotProcessing.tests.helpers import make_signal
+
+
+class TestSignalAccessors(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sig = make_signal(np.arange(5), np.arange(5.), BufferObject(input_arr=np.ones(5), unit='A'),
+                               data_unit='V')
+        return super().setUp()
+
+    def test_alias_map_modifications(self):
+        sig = self.sig
+        self.assertEqual(sig.dependent_accessors, [1])
+        sig.alias_map.update({'current': {'idx': 2}})
+        self.assertEqual(sig.dependent_accessors, [1, 2])
+        self.assertIs(sig.current, sig.data_store[2])
+
+        del sig.alias_map['current']
+        self.assertEqual(sig.dependent_accessors, [1])
+        with self.assertRaises(AttributeError):
+            _ = sig.current
+
+        sig.alias_map.clear()
+        self.assertEqual(sig.dependent_accessors, [])
+        with self.assertRaises(AttributeError):
+            _ = sig.time
+
+    def test_nested_modifications(self):
+        sig = self.sig
+        sig.alias_map['data']['idx'] = 2
+        self.assertIs(sig.data, sig.data_store[2])
+        sig.alias_map['data']['independent'] = True
+        self.assertEqual(sig.independent_accessors, [0, 2])
+        self.assertEqual(sig.rank, 0)
+
+    def test_cached(self):
+        sig = self.sig
+        accessors = sig._get_accessors()
+        self.assertIs(sig._get_accessors(), accessors)
+        self.assertIs(sig.time, sig.data_store[0])
+        result = sig + 1
+        self.assertIs(result._get_accessors().index, accessors.index)
+        # the entries are shared with the copies of the alias map, as with dict(alias_map)
+        result.alias_map['data']['idx'] = 2
+        self.assertIsNot(sig._get_accessors(), accessors)
+        self.assertIs(sig.data, sig.data_store[2])
+
+    def test_replaced_alias_map(self):
+        sig = self.sig
+        sig._alias_map = {'time': {'idx': 0, 'independent': True}, 'current': {'idx': 2}}
+        self.assertIs(sig.current, sig.data_store[2])
+        self.assertEqual(sig.dependent_accessors, [2])
+        sig.alias_map['current']['idx'] = 1
+        self.assertIs(sig.current, sig.data_store[1])
+        with self.assertRaises(AttributeError):
+            _ = sig.data
+
+    def test_copy_and_pickle(self):
+        sig = self.sig
+        sig.alias_map['current'] = {'idx': 2}
+        for other in [copy.deepcopy(sig), pickle.loads(pickle.dumps(sig))]:
+            self.assertEqual(other.dependent_accessors, [1, 2])
+            other.alias_map['data2'] = {'idx': 1}
+            self.assertEqual(other.dependent_accessors, [1, 2, 1])
+        self.assertEqual(sig.dependent_accessors, [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# Description: Tests the cache of compiled expressions in the parser.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.common.errors import InvalidExpression
+from iplotProcessing.tools import Parser
+
+
+class TestExpressionCache(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.parser = Parser()
+        self.parser.clear_expr().cache_clear()
+
+    def tearDown(self) -> None:
+        self.parser.cache_size = 256
+        self.parser.clear_expr().cache_clear()
+        super().tearDown()
+
+    def evaluate(self, expr: str, subst: dict):
+        self.parser.set_expression(expr)
+        self.parser.substitute_var(subst)
+        return self.parser.eval_expr().result
+
+    def test_hits(self):
+        expr = "np.sin(${x}) + ${y} * 2"
+        subst = {"x": np.arange(4.), "y": 1.}
+        ref = self.evaluate(expr, subst)
+        code = self.parser._compiled_obj
+        self.parser.clear_expr()
+        res = self.evaluate(expr, subst)
+        self.assertIs(self.parser._compiled_obj, code)
+        self.assertTrue(np.array_equal(res, ref))
+        self.assertEqual(self.parser.cache_info()[:2], (1, 1))
+        self.assertEqual(self.parser.cache_info().currsize, 1)
+
+    def test_variable_numbering(self):
+        # without clear_expr, the variables of the next expression are numbered after the previous ones.
+        expr = "${x} - ${y} + 1s"
+        first = self.evaluate(expr, {"x": np.datetime64(10, 's'), "y": np.timedelta64(2, 's')})
+        var_map = dict(self.parser.var_map)
+        second = self.evaluate(expr, {"x": np.datetime64(10, 's'), "y": np.timedelta64(2, 's')})
+        self.assertEqual(self.parser.cache_info().hits, 1)
+        self.assertEqual(first, second)
+        self.assertTrue(self.parser.has_time_units)
+        self.assertEqual(self.parser.var_map, {"x": "key2", "y": "key3"})
+        self.assertNotEqual(self.parser.var_map, var_map)
+        self.assertIn("key3", self.parser.expression)
+        self.assertEqual(self.parser._var_counter, 4)
+
+    def test_lru(self):
+        self.parser.cache_size = 2
+        for expr in ["${a} + 1", "${a} + 2", "${a} + 1", "${a} + 3", "${a} + 2"]:
+            self.parser.clear_expr().set_expression(expr)
+        # "${a} + 2" was the least recently used when "${a} + 3" was added.
+        self.assertEqual(self.parser.cache_info()[:2], (1, 4))
+        self.assertEqual(self.parser.cache_info().currsize, 2)
+
+    def test_invalid_not_cached(self):
+        for _ in range(2):
+            self.assertRaises(InvalidExpression, self.parser.set_expression, "undefined_name(${x})")
+        self.assertEqual(self.parser.cache_info()[:2], (0, 2))
+
+    def test_inject_invalidates(self):
+        self.assertRaises(InvalidExpression, self.parser.set_expression, "cached_member(${x})")
+        self.parser.set_expression("np.cos(${x})")
+        self.parser.inject({"cached_member": np.cos})
+        self.assertEqual(self.parser.cache_info().currsize, 0)
+        self.assertEqual(self.evaluate("cached_member(${x})", {"x": 0.}), 1.)
+
+
+if __name__ == "__main__":
+    unittest.main()
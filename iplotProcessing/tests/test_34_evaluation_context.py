@@ -0,0 +1,68 @@
+# Description: Tests the evaluation of expressions in separate contexts, from several threads.
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from iplotProcessing.common.errors import InvalidExpression
+from iplotProcessing.tools import EvaluationContext, Parser
+
+
+def evaluate(context: EvaluationContext, expr: str, subst: dict):
+    return context.clear_expr().set_expression(expr).substitute_var(subst).eval_expr().result
+
+
+class TestEvaluationContext(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.parser = Parser()
+
+    def test_independent_contexts(self):
+        c1 = self.parser.new_context()
+        c2 = self.parser.new_context()
+        c1.set_expression("np.sin(${x})").substitute_var({"x": 0.})
+        c2.set_expression("${x} + ${y}").substitute_var({"x": 1., "y": 2.})
+        self.assertEqual(c1.eval_expr().result, 0.)
+        self.assertEqual(c2.eval_expr().result, 3.)
+        self.assertEqual(c1.var_map, {"x": "key0"})
+        self.assertRaises(InvalidExpression, c1.set_expression, "undefined_name(${x})")
+        self.assertEqual(c2.var_map, {"x": "key0", "y": "key1"})
+
+    def test_concurrent_evaluation(self):
+        rows = [(f"${{x}} * {i} + np.cos(${{y}})", {"x": np.arange(100.) + i, "y": np.full(100, float(i))})
+                for i in range(40)]
+        barrier = threading.Barrier(4)
+
+        def job(row):
+            expr, subst = row
+            try:
+                barrier.wait(timeout=1)
+            except threading.BrokenBarrierError:
+                pass
+            return evaluate(self.parser.new_context(), expr, subst)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(job, rows * 5))
+        for (expr, subst), result in zip(rows * 5, results):
+            self.assertTrue(np.array_equal(result, subst["x"] * float(expr.split()[2]) + np.cos(subst["y"])))
+
+    def test_legacy_api_per_thread(self):
+        self.parser.clear_expr().set_expression("${a} + 1").substitute_var({"a": 1})
+        other = {}
+
+        def job():
+            other["expression"] = self.parser.expression
+            self.parser.clear_expr().set_expression("${b} * 10").substitute_var({"b": 2})
+            other["result"] = self.parser.eval_expr().result
+
+        thread = threading.Thread(target=job)
+        thread.start()
+        thread.join()
+        self.assertEqual(other, {"expression": "", "result": 20})
+        self.assertEqual(self.parser.eval_expr().result, 2)
+        self.assertIs(self.parser.var_map, self.parser.context.var_map)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+# Description: Tests that the parser namespace imports and walks modules on first reference only.
+
+import importlib
+import inspect
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+import warnings
+import numpy as np
+
+from iplotProcessing.tools import BatchEvaluator, Parser
+from iplotProcessing.tools.namespace import LazyNamespace
+
+PACKAGE = "iplot_lazy_ns_pkg"
+
+
+def eager_namespace(entries: list) -> dict:
+    """The namespace Parser.load_modules built by importing and walking every entry in order."""
+    namespace = {}
+
+    def load_submodules(module, parent_name):
+        namespace.update(inspect.getmembers(module))
+        for name, obj in inspect.getmembers(module):
+            full_name = f"{parent_name}.{name}" if parent_name else name
+            if inspect.ismodule(obj) and parent_name in obj.__name__:
+                load_submodules(obj, full_name)
+            elif inspect.isclass(obj):
+                namespace.update(inspect.getmembers(obj))
+
+    for entry in entries:
+        module_name, _, alias = entry.partition(' as ')
+        recursive = module_name.endswith('.*')
+        module_name = module_name[:-2] if recursive else module_name
+        module = importlib.import_module(module_name)
+        namespace[module_name] = module
+        if alias:
+            namespace[alias] = module
+        if recursive:
+            load_submodules(module, module_name)
+        else:
+            namespace.update(inspect.getmembers(module))
+    return namespace
+
+
+class TestLazyNamespace(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = os.path.join(cls.tmp.name, PACKAGE)
+        os.mkdir(root)
+        with open(os.path.join(root, "__init__.py"), "w") as f:
+            f.write(textwrap.dedent("""
+                from . import sub
+                value = 1
+                shared = 'top'
+
+                class Thing:
+                    def method(self):
+                        return 'method'
+                """))
+        with open(os.path.join(root, "sub.py"), "w") as f:
+            f.write("deep = 'deep'\nshared = 'sub'\nvalue = 2\n")
+        with open(os.path.join(cls.tmp.name, f"{PACKAGE}_extra.py"), "w") as f:
+            f.write("extra = 5\n")
+        sys.path.insert(0, cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        sys.path.remove(cls.tmp.name)
+        for name in [PACKAGE, f"{PACKAGE}.sub"]:
+            sys.modules.pop(name, None)
+        cls.tmp.cleanup()
+        super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        for name in [PACKAGE, f"{PACKAGE}.sub"]:
+            sys.modules.pop(name, None)
+
+    def test_import_on_reference(self):
+        ns = LazyNamespace()
+        ns.add_module(f"{PACKAGE} as pkg")
+        self.assertNotIn(PACKAGE, sys.modules)
+        self.assertEqual(ns["value"], 1)
+        self.assertIn(PACKAGE, sys.modules)
+        self.assertIs(ns["pkg"], sys.modules[PACKAGE])
+        self.assertIs(ns[PACKAGE], sys.modules[PACKAGE])
+        self.assertFalse(ns.resolve("deep"))
+        with self.assertRaises(KeyError):
+            _ = ns["deep"]
+
+    def test_missing_module(self):
+        ns = LazyNamespace()
+        self.assertRaises(ModuleNotFoundError, ns.add_module, "iplot_no_such_module")
+        self.assertEqual(ns.modules, [])
+
+    def test_recursive(self):
+        ns = LazyNamespace()
+        ns.add_module(f"{PACKAGE}.*")
+        # the members of submodules and classes come after the top level members.
+        self.assertEqual(ns["shared"], "sub")
+        self.assertEqual(ns["value"], 2)
+        self.assertEqual(ns["deep"], "deep")
+        self.assertTrue(ns.resolve("method"))
+        self.assertFalse(ns.resolve("iplot_undefined_name"))
+
+    def test_precedence(self):
+        ns = LazyNamespace()
+        ns.inject({"value": 0, "own": 1})
+        ns.add_module(PACKAGE)
+        self.assertEqual(ns["value"], 1)
+        self.assertEqual(ns["own"], 1)
+        ns.inject({"value": 3})
+        self.assertEqual(ns["value"], 3)
+        self.assertEqual(ns.load_all()["shared"], "top")
+
+    def test_eager_bindings(self):
+        entries = ["numpy.*", "numpy as np", "scipy.*"]
+        ns = LazyNamespace()
+        for entry in entries:
+            ns.add_module(entry)
+        with warnings.catch_warnings():
+            # the walks read deprecated attributes
+            warnings.simplefilter("ignore")
+            eager = eager_namespace(entries)
+            for name in ["fft", "convolve", "correlate", "abs", "append", "trapezoid", "np", "sin", "interp1d"]:
+                self.assertIs(ns[name], eager[name], name)
+
+    def test_prepare(self):
+        ns = LazyNamespace()
+        ns.add_module(f"{PACKAGE} as pkg")
+        code = compile("pkg.value + value", "<string>", "eval")
+        # with separate locals, eval reads the globals without __missing__.
+        self.assertRaises(NameError, eval, code, ns, {})
+        ns.prepare(code.co_names)
+        self.assertEqual(eval(code, ns, {}), 2)
+
+    def test_load_modules_after_compile(self):
+        parser = Parser().new_context()
+        parser.set_expression("np.sqrt(${a})")
+        batch = BatchEvaluator({"b": "np.sqrt(${a}) + 1"})
+        # the resolved names are dropped, eval does not resolve them again by itself.
+        Parser().load_modules(f"{PACKAGE}_extra")
+        self.assertEqual(parser.substitute_var({"a": 4.}).eval_expr().result, 2.)
+        self.assertEqual(batch.evaluate({"a": 4.}), {"b": 3.})
+        self.assertEqual(parser.clear_expr().set_expression("extra * ${a}").substitute_var({"a": 2.})
+                         .eval_expr().result, 10.)
+
+    def test_parser(self):
+        parser = Parser()
+        self.assertIsInstance(parser.supported_members, LazyNamespace)
+        self.assertTrue(parser.is_supported("np"))
+        self.assertFalse(parser.is_supported("iplot_undefined_name"))
+        parser.clear_expr().set_expression("np.sin(${x}) + cos(${x})").substitute_var({"x": 0.}).eval_expr()
+        self.assertEqual(parser.result, 1.)
+        parser.clear_expr().set_expression("fft(${x})").substitute_var({"x": np.ones(4)}).eval_expr()
+        self.assertEqual(parser.result.tolist(), [4, 0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
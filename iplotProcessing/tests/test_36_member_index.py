@@ -0,0 +1,104 @@
+# Description: Tests the member index file of the parser namespace.
+
+import json
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from iplotProcessing.tools.namespace import LazyNamespace
+
+PACKAGE = "iplot_member_index_pkg"
+
+
+class TestMemberIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        root = os.path.join(self.tmp.name, PACKAGE)
+        os.mkdir(root)
+        self.init_file = os.path.join(root, "__init__.py")
+        with open(self.init_file, "w") as f:
+            f.write(textwrap.dedent("""
+                from . import sub
+                value = 1
+
+                class Thing:
+                    def method(self):
+                        return 'method'
+                """))
+        with open(os.path.join(root, "sub.py"), "w") as f:
+            f.write("deep = 'deep'\n")
+        sys.path.insert(0, self.tmp.name)
+        self.index_path = os.path.join(self.tmp.name, "member_index.json")
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.tmp.name)
+        for name in [PACKAGE, f"{PACKAGE}.sub"]:
+            sys.modules.pop(name, None)
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def namespace(self, *entries) -> LazyNamespace:
+        ns = LazyNamespace(self.index_path)
+        for entry in entries:
+            ns.add_module(entry)
+        return ns
+
+    def test_index(self):
+        ns = self.namespace(f"{PACKAGE}.*")
+        self.assertEqual(ns["deep"], "deep")
+        with open(self.index_path) as f:
+            index = json.load(f)
+        entry = index["entries"][f"{PACKAGE}.*"]
+        self.assertEqual(entry["key"]["module"], PACKAGE)
+        self.assertEqual(entry["members"]["deep"], [PACKAGE, "sub", "deep"])
+        self.assertEqual(entry["members"]["method"], [PACKAGE, "Thing", "method"])
+
+        # a new namespace finds the members from the index, without walking the package.
+        ns = self.namespace(f"{PACKAGE}.*")
+        self.assertEqual(ns["deep"], "deep")
+        self.assertTrue(callable(ns["method"]))
+        self.assertFalse(ns.resolve("iplot_undefined_name"))
+        self.assertIsNone(ns.modules[0]._members)
+
+    def test_outdated(self):
+        self.namespace(f"{PACKAGE}.*").load_all()
+        stat = os.stat(self.init_file)
+        os.utime(self.init_file, (stat.st_atime, stat.st_mtime + 10))
+        ns = self.namespace(f"{PACKAGE}.*")
+        self.assertEqual(ns["deep"], "deep")
+        self.assertIsNotNone(ns.modules[0]._members)
+
+    def test_configuration_change(self):
+        self.namespace(f"{PACKAGE}.*").load_all()
+        self.namespace(f"{PACKAGE} as pkg", "json.*").load_all()
+        with open(self.index_path) as f:
+            index = json.load(f)
+        self.assertEqual(set(index["entries"]), {f"{PACKAGE} as pkg", "json.*"})
+
+    def test_cache_directory(self):
+        self.index_path = os.path.join(self.tmp.name, "cache", "iplot", "member_index.json")
+        self.namespace(f"{PACKAGE}.*").load_all()
+        self.assertTrue(os.path.isfile(self.index_path))
+
+        # a file where the directory should be: the index is not written, and not tried again.
+        self.index_path = os.path.join(self.init_file, "member_index.json")
+        ns = self.namespace(f"{PACKAGE}.*")
+        self.assertEqual(ns["deep"], "deep")
+        self.assertFalse(ns._index_writable)
+        ns.add_module("json.*")
+        self.assertTrue(ns.resolve("JSONDecoder"))
+
+    def test_invalid_file(self):
+        with open(self.index_path, "w") as f:
+            f.write("{not json")
+        ns = self.namespace(f"{PACKAGE}.*")
+        self.assertEqual(ns["deep"], "deep")
+        with open(self.index_path) as f:
+            self.assertIn(f"{PACKAGE}.*", json.load(f)["entries"])
+
+
+if __name__ == "__main__":
+    unittest.main()
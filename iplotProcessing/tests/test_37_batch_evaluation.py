@@ -0,0 +1,69 @@
+# Description: Tests the evaluation of a table of expressions referencing each other, with shared subexpressions.
+
+import unittest
+import numpy as np
+
+from iplotProcessing.common.errors import InvalidExpression, InvalidVariable
+from iplotProcessing.core import BufferObject
+from iplotProcessing.tools import BatchEvaluator, Parser
+
+
+def evaluate_row(expr: str, values: dict):
+    parser = Parser().new_context()
+    return parser.set_expression(expr, is_expression=True).substitute_var(values).eval_expr().result
+
+
+class TestBatchEvaluation(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.values = {"ip": np.linspace(0., 2e6, 11), "bt": np.linspace(1., 2., 11)}
+
+    def test_shared_subexpressions(self):
+        rows = {f"row{i}": f"${{ip}}/1e6 * {i} + np.abs(${{ip}}/1e6 - ${{bt}})" for i in range(20)}
+        batch = BatchEvaluator(rows)
+        # ${ip}/1e6 and np.abs(${ip}/1e6 - ${bt}), the difference only appears inside np.abs.
+        self.assertEqual(batch.shared, 2)
+        results = batch.evaluate(self.values)
+        self.assertEqual(batch.errors, {})
+        for alias, expr in rows.items():
+            self.assertTrue(np.array_equal(results[alias], evaluate_row(expr, self.values)))
+
+    def test_alias_references(self):
+        rows = {"total": "${a} + ${b}", "b": "${a} * 2", "a": "${ip}/1e6", "pi": "np.pi"}
+        batch = BatchEvaluator(rows)
+        self.assertLess(batch.order.index("a"), batch.order.index("b"))
+        self.assertLess(batch.order.index("b"), batch.order.index("total"))
+        results = batch.evaluate(self.values)
+        self.assertTrue(np.array_equal(results["total"], self.values["ip"] / 1e6 * 3))
+        self.assertEqual(results["pi"], np.pi)
+        # the plan is reused for other values.
+        results = batch.evaluate({"ip": np.ones(3) * 1e6})
+        self.assertTrue(np.array_equal(results["total"], np.full(3, 3.)))
+
+    def test_signals(self):
+        time = BufferObject(input_arr=np.arange(4), unit='s')
+        data = BufferObject(input_arr=np.arange(4.), unit='V')
+        batch = BatchEvaluator({"scaled": "${sig} * 2", "offset": "${sig} * 2 + 1"})
+        self.assertEqual(batch.shared, 1)
+        results = batch.evaluate({"sig": None}, dict_result={"sig": {"time": time, "data": data}})
+        self.assertTrue(np.array_equal(results["offset"].data, np.arange(4.) * 2 + 1))
+        self.assertIs(results["offset"].time, time)
+
+    def test_errors(self):
+        rows = {"ok": "${ip} + 1", "bad": "${missing} + 1", "dependent": "${bad} * 2", "shared": "(${missing} + 1) * 3"}
+        batch = BatchEvaluator(rows)
+        results = batch.evaluate(self.values)
+        self.assertEqual(list(results), ["ok"])
+        self.assertEqual(set(batch.errors), {"bad", "dependent", "shared"})
+        self.assertIsInstance(batch.errors["dependent"], InvalidVariable)
+        self.assertEqual(batch.errors["bad"].invalid_keys, {"missing"})
+
+    def test_invalid(self):
+        self.assertRaises(InvalidExpression, BatchEvaluator, {"a": "${b} + 1", "b": "${a} * 2"})
+        self.assertRaises(InvalidExpression, BatchEvaluator, {"a": "${a} + 1"})
+        self.assertRaises(InvalidExpression, BatchEvaluator, {"a": "undefined_name(${x})"})
+        self.assertRaises(InvalidExpression, BatchEvaluator, {"a": "${x}**2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 from .hasher import hash_code
-from .parsers import Parser
+from .parsers import EvaluationContext, Parser
+from .batch import BatchEvaluator
 
-__all__ = ["hash_code", "Parser"]
+__all__ = ["hash_code", "BatchEvaluator", "EvaluationContext", "Parser"]
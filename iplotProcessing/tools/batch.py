@@ -0,0 +1,154 @@
+# Description: Evaluate a table of expressions that reference each other by alias, ${alias}.
+#   The expressions are ordered along their references and a subexpression that appears more than once in the
+#   table, ex: ${ip}/1e6 in twenty rows, is computed once. Expressions are assumed to have no side effects.
+
+import ast
+import graphlib
+import typing
+
+from iplotProcessing.common import InvalidExpression, InvalidVariable
+from iplotProcessing.tools.parsers import Parser, SignalProxy
+from iplotLogging import setupLogger
+
+logger = setupLogger.get_logger(__name__, "INFO")
+
+# Nodes computed once when they appear several times. Names, constants and attributes are cheap to repeat.
+_SHARED_NODES = (ast.BinOp, ast.UnaryOp, ast.Call, ast.Subscript, ast.Compare)
+# Nodes whose operands are not always evaluated, or depend on the lambda arguments: nothing is shared inside them.
+_OPAQUE_NODES = (ast.BoolOp, ast.IfExp, ast.Lambda)
+
+
+class BatchEvaluator:
+    """Compile a table {alias: expression} once, evaluate it for many sets of values.
+
+    A variable ${name} of an expression is the result of the expression of that alias when there is one,
+    otherwise it is taken from the values given to evaluate. Each expression is validated by the parser."""
+
+    def __init__(self, expressions: typing.Dict[str, str], parser: Parser = None):
+        self.parser = parser or Parser()
+        self.expressions = dict(expressions)
+        self.errors = {}
+        self._var_ids = {}
+        self._var_names = {}
+        self._trees = {}
+        self._temps = {}
+
+        for alias in self.expressions:
+            self._var_id(alias)
+        for alias, expr in self.expressions.items():
+            context = self.parser.new_context().set_expression(expr, is_expression=True)
+            renames = {key: self._var_id(var) for var, key in context.var_map.items()}
+            tree = ast.parse(context.expression, mode='eval').body
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Name) and node.id in renames:
+                    node.id = renames[node.id]
+            self._trees[alias] = tree
+
+        self._share_subexpressions()
+        self._inputs = {}
+        self._deps = {}
+        for node, tree in {**self._temps, **self._trees}.items():
+            names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+            variables = {self._var_names[name] for name in names if name in self._var_names}
+            self._inputs[node] = {var: self._var_ids[var] for var in variables if var not in self._trees}
+            self._deps[node] = {name for name in names if name in self._temps} | (variables & self._trees.keys())
+        self.order = self._sort()
+        self._code = {}
+        for node in self.order:
+            tree = self._trees[node] if node in self._trees else self._temps[node]
+            self._code[node] = compile(ast.fix_missing_locations(ast.Expression(tree)), "<batch>", "eval")
+
+    @property
+    def shared(self) -> int:
+        """Number of subexpressions computed once for several uses."""
+        return len(self._temps)
+
+    def _var_id(self, var: str) -> str:
+        if var not in self._var_ids:
+            self._var_ids[var] = f"_var{len(self._var_ids)}"
+            self._var_names[self._var_ids[var]] = var
+        return self._var_ids[var]
+
+    def _share_subexpressions(self):
+        counts = {}
+
+        def count(node):
+            if isinstance(node, _SHARED_NODES):
+                key = ast.dump(node)
+                counts[key] = counts.get(key, 0) + 1
+                if counts[key] > 1:
+                    # the operands were counted with the first occurrence
+                    return
+            if not isinstance(node, _OPAQUE_NODES):
+                for child in ast.iter_child_nodes(node):
+                    count(child)
+
+        for tree in self._trees.values():
+            count(tree)
+
+        temps = {}
+        evaluator = self
+
+        class Share(ast.NodeTransformer):
+            def visit(self, node):
+                if isinstance(node, _OPAQUE_NODES):
+                    return node
+                if isinstance(node, _SHARED_NODES) and counts.get(ast.dump(node), 0) > 1:
+                    key = ast.dump(node)
+                    if key not in temps:
+                        temps[key] = f"_cse{len(temps)}"
+                        while temps[key] in evaluator.expressions:
+                            temps[key] = f"_{temps[key]}"
+                        evaluator._temps[temps[key]] = self.generic_visit(node)
+                    return ast.Name(id=temps[key], ctx=ast.Load())
+                return self.generic_visit(node)
+
+        for alias in self._trees:
+            self._trees[alias] = Share().visit(self._trees[alias])
+
+    def _sort(self) -> list:
+        try:
+            return list(graphlib.TopologicalSorter(self._deps).static_order())
+        except graphlib.CycleError as e:
+            cycle = [node for node in e.args[1] if node in self._trees]
+            raise InvalidExpression(f"Circular reference between the aliases {cycle}")
+
+    def evaluate(self, values: dict = None, dict_result: dict = None) -> dict:
+        """Evaluate every expression, values and dict_result provide the variables as in Parser.substitute_var.
+        Returns {alias: result} for the expressions that could be evaluated, the others are in self.errors."""
+        values = values or {}
+        dict_result = dict_result or {}
+        local_vars = {}
+        for var, var_id in self._var_ids.items():
+            if var in self._trees:
+                continue
+            if var in dict_result:
+                local_vars[var_id] = SignalProxy(dict_result[var])
+            elif var in values:
+                local_vars[var_id] = values[var]
+
+        self.errors = {}
+        failed = {}
+        results = {}
+        for node in self.order:
+            inputs = self._inputs[node]
+            error = next((failed[dep] for dep in self._deps[node] if dep in failed), None)
+            if error is None and any(var_id not in local_vars for var_id in inputs.values()):
+                error = InvalidVariable(inputs, {var: None for var, var_id in inputs.items() if var_id in local_vars})
+            if error is None:
+                try:
+                    self.parser.supported_members.prepare(self._code[node].co_names)
+                    local_vars[self._var_ids.get(node, node)] = eval(self._code[node], self.parser.supported_members,
+                                                                     local_vars)
+                except ValueError as ve:
+                    error = InvalidExpression(f"Value error {ve}")
+                except TypeError as te:
+                    logger.warning(f"Type error {te}")
+                    error = InvalidVariable(inputs, local_vars)
+            if error is not None:
+                failed[node] = error
+                if node in self._trees:
+                    self.errors[node] = error
+            elif node in self._trees:
+                results[node] = local_vars[self._var_ids[node]]
+        return results
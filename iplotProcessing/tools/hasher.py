@@ -2,9 +2,12 @@
 # Author: Abadie Lana
 # Changelog:
 #   Sept 2021: Refactored hash_code to use hash_tuple. Expose hash_tuple [Jaswant Sai Panchumarti]
+#   Oct 2026: Added hash_buffer to fingerprint array contents, with blake2b
 
 import hashlib
 
+import numpy as np
+
 
 def hash_tuple(payload: tuple):
     """Creates a hash code based on given payload"""
@@ -17,3 +20,12 @@ def hash_code(obj, propnames=None):
         propnames = []
     payload = tuple([getattr(obj, prop) for prop in sorted(propnames) if hasattr(obj, prop)])
     return hash_tuple(payload)
+
+
+def hash_buffer(arr) -> str:
+    """Creates a hash code based on the shape, dtype and content of an array.
+    The content is hashed with a 128 bits blake2b digest, faster than md5 for large buffers. Equal hash codes
+    are used as equal contents, a short checksum such as crc32 would let different buffers collide."""
+    arr = np.ascontiguousarray(arr)
+    digest = hashlib.blake2b(arr.view(np.uint8).ravel() if arr.size else b'', digest_size=16).hexdigest()
+    return hash_tuple((arr.shape, arr.dtype.str, digest))
@@ -0,0 +1,287 @@
+# Description: The namespace of the expression parser, modules and members are resolved on first reference.
+#   A configured module ("numpy", "numpy as np", "numpy.*") is only imported when a name looked up in the namespace
+#   may come from it. A name resolves to the same member as when every module was loaded eagerly in order.
+#   Member lists are saved in an index file, where each member is stored with the path to get it back, so that
+#   a "module.*" entry is only walked once.
+
+import importlib
+import importlib.metadata
+import importlib.util
+import inspect
+import json
+import os
+import threading
+import warnings
+
+from iplotLogging import setupLogger
+
+logger = setupLogger.get_logger(__name__, "INFO")
+
+_MISSING = object()
+
+# Version of the layout of the member index file.
+INDEX_FORMAT = 1
+
+
+def module_key(module_name: str) -> dict:
+    """What the member index of a module depends on: its name, the version of its distribution and the
+    modification time of its file."""
+    try:
+        version = importlib.metadata.version(module_name.split('.')[0])
+    except (importlib.metadata.PackageNotFoundError, ValueError):
+        version = ""
+    try:
+        origin = importlib.util.find_spec(module_name).origin
+        mtime = os.path.getmtime(origin) if origin else 0.
+    except (ImportError, AttributeError, OSError, ValueError):
+        mtime = 0.
+    return {"module": module_name, "version": version, "mtime": mtime}
+
+
+class ModuleProvider:
+    """The members a module entry of the parser configuration puts in the namespace.
+    "module" and "module as alias" provide the module and its members.
+    "module.*" also provides the members of its submodules and classes."""
+
+    def __init__(self, entry: str):
+        self.entry = entry
+        self.alias = None
+        self.recursive = False
+        if ' as ' in entry:
+            self.module_name, self.alias = entry.split(' as ')
+        else:
+            module_parts = entry.split('.')
+            if module_parts[-1] == '*':
+                self.recursive = True
+                self.module_name = '.'.join(module_parts[:-1])
+            else:
+                self.module_name = entry
+
+        if importlib.util.find_spec(self.module_name) is None:
+            raise ModuleNotFoundError(f"No module named '{self.module_name}'")
+        self._module = None
+        self._names = None
+        self._members = None
+        # member name -> (module name, attribute, ...), from the walk or from the index file.
+        self.locations = None
+        self.walked = False
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+            self._names = set(dir(self._module))
+        return self._module
+
+    def lookup(self, name: str):
+        """The module or top level member called name, _MISSING if there is none."""
+        module = self.module
+        value = getattr(module, name, _MISSING) if name in self._names else _MISSING
+        if value is _MISSING and name in (self.module_name, self.alias):
+            return module
+        return value
+
+    def members(self) -> dict:
+        """All the members provided by the entry. For "module.*", this walks the submodules and classes once."""
+        if self._members is None:
+            # the module and its alias come first, the members of the module replace them as in Parser.load_modules
+            members = {}
+            locations = {}
+            for name in (self.module_name, self.alias):
+                if name:
+                    members[name] = self.module
+                    locations[name] = (self.module_name,)
+            with warnings.catch_warnings():
+                # the walk reads every attribute, deprecated ones included.
+                warnings.simplefilter('ignore', DeprecationWarning)
+                if self.recursive:
+                    self._collect(self.module, self.module_name, (self.module_name,), members, locations)
+                else:
+                    for name, obj in inspect.getmembers(self.module):
+                        members[name] = obj
+                        locations[name] = (self.module_name, name)
+            self._members = members
+            self.locations = locations
+            self.walked = True
+        return self._members
+
+    def _collect(self, module, parent_name: str, path: tuple, members: dict, locations: dict):
+        # same traversal as Parser.load_submodules, path holds the attributes leading to module from the entry module.
+        module_members = inspect.getmembers(module)
+        for name, obj in module_members:
+            members[name] = obj
+            locations[name] = path + (name,)
+        for name, obj in module_members:
+            full_name = f"{parent_name}.{name}" if parent_name else name
+            if inspect.ismodule(obj) and parent_name in obj.__name__:
+                self._collect(obj, full_name, path + (name,), members, locations)
+            elif inspect.isclass(obj):
+                for member, value in inspect.getmembers(obj):
+                    members[member] = value
+                    locations[member] = path + (name, member)
+
+    def find(self, name: str):
+        """The member called name among all the members of the entry, _MISSING if there is none.
+        With an index, only the module holding the member is imported."""
+        if self._members is None and self.locations is not None:
+            path = self.locations.get(name)
+            if path is None:
+                return _MISSING
+            try:
+                value = importlib.import_module(path[0])
+                for attr in path[1:]:
+                    try:
+                        value = getattr(value, attr)
+                    except AttributeError:
+                        # inspect.getmembers also lists class attributes that getattr does not return
+                        value = inspect.getattr_static(value, attr)
+                return value
+            except Exception as e:
+                logger.warning(f"Outdated member index for {self.entry}, {name}: {e}")
+        return self.members().get(name, _MISSING)
+
+
+class LazyNamespace(dict):
+    """The globals of the parser expressions. Resolved names are stored in the dictionary, a name that is not there
+    yet is resolved on first reference, see __missing__. eval does not call __missing__, see prepare.
+
+    Later injected members and modules have precedence over earlier ones, and within a "module.*" entry the
+    last member of the walk of its submodules and classes wins, as when the modules were loaded eagerly.
+    This needs the member list of the "module.*" entries for most names, which comes from the index file."""
+
+    def __init__(self, index_path: str = None):
+        super().__init__()
+        self._layers = []
+        self._unknown = set()
+        self._lock = threading.RLock()
+        self.index_path = index_path
+        self._index = None
+        # the index is not written again after a failure, ex: a read-only directory.
+        self._index_writable = True
+
+    def inject(self, members: dict):
+        with self._lock:
+            if self._layers and isinstance(self._layers[-1], dict):
+                self._layers[-1].update(members)
+            else:
+                self._layers.append(dict(members))
+            self.update(members)
+            self._unknown.difference_update(members)
+
+    def add_module(self, entry: str) -> ModuleProvider:
+        """Register a module entry, it is imported on first reference. Raises ModuleNotFoundError if it is missing."""
+        provider = ModuleProvider(entry)
+        with self._lock:
+            self._layers.append(provider)
+            # the names resolved so far may come from the new module
+            self.clear()
+            self._unknown.clear()
+        return provider
+
+    @property
+    def modules(self) -> list:
+        return [layer for layer in self._layers if isinstance(layer, ModuleProvider)]
+
+    def _search(self, name: str):
+        for layer in reversed(self._layers):
+            if isinstance(layer, dict):
+                value = layer.get(name, _MISSING)
+            elif layer.recursive:
+                value = layer.find(name)
+            else:
+                value = layer.lookup(name)
+            if value is not _MISSING:
+                return value
+        return _MISSING
+
+    def _resolve(self, name: str):
+        with self._lock:
+            value = dict.get(self, name, _MISSING)
+            if value is not _MISSING or name in self._unknown:
+                return value
+            try:
+                self._load_index()
+                value = self._search(name)
+                self._save_index()
+            except Exception as e:
+                logger.error(f"Error loading a module for {name}: {e}")
+                value = _MISSING
+            if value is _MISSING:
+                self._unknown.add(name)
+            else:
+                self[name] = value
+            return value
+
+    def prepare(self, names):
+        """Resolve the names that are not in the dictionary yet. eval reads its globals without calling __missing__,
+        so the names of a code object are resolved before each evaluation, after add_module they may be gone."""
+        for name in names:
+            if name not in self:
+                self._resolve(name)
+
+    def __missing__(self, name: str):
+        value = self._resolve(name)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def resolve(self, name: str) -> bool:
+        """Whether name is defined in the namespace, resolving it if needed."""
+        return self._resolve(name) is not _MISSING
+
+    def load_all(self) -> "LazyNamespace":
+        """Resolve every member of the configured modules, this imports and walks all of them."""
+        names = set()
+        for layer in list(self._layers):
+            names.update(layer if isinstance(layer, dict) else layer.members())
+        for name in names:
+            self._resolve(name)
+        with self._lock:
+            self._save_index()
+        return self
+
+    def _load_index(self):
+        """Give the modules their member lists from the index file, when these are up to date."""
+        if self.index_path is None:
+            return
+        if self._index is None:
+            self._index = {}
+            try:
+                with open(self.index_path, 'r') as file:
+                    index = json.load(file)
+                if index.get("format") == INDEX_FORMAT:
+                    self._index = index.get("entries", {})
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Ignoring the member index {self.index_path}: {e}")
+        for provider in self.modules:
+            if provider.locations is not None or provider.entry not in self._index:
+                continue
+            entry = self._index[provider.entry]
+            if entry.get("key") == module_key(provider.module_name):
+                provider.locations = entry.get("members", {})
+            else:
+                del self._index[provider.entry]
+
+    def _save_index(self):
+        """Write the member lists walked since the last save. Only the configured modules are kept."""
+        walked = [provider for provider in self.modules if provider.walked]
+        if self.index_path is None or not self._index_writable or not walked:
+            return
+        if self._index is None:
+            self._load_index()
+        for provider in walked:
+            provider.walked = False
+            self._index[provider.entry] = {"key": module_key(provider.module_name), "members": provider.locations}
+        configured = {provider.entry for provider in self.modules}
+        entries = {entry: value for entry, value in self._index.items() if entry in configured}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump({"format": INDEX_FORMAT, "entries": entries}, file)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            self._index_writable = False
+            logger.warning(f"Cannot write the member index {self.index_path}: {e}")
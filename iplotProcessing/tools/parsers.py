@@ -2,29 +2,61 @@
 # Author: Abadie Lana
 # Changelog:
 #   Sept 2021: Added generic get_member_list function to inject outsider functions/attributes [Jaswant Sai Panchumarti]
+import collections
 import inspect
 import json
 from inspect import getmembers
 import typing
 import re
+import threading
+import types
 from iplotProcessing.common import InvalidExpression, InvalidVariable, DATE_TIME, PRECISE_TIME
 from iplotProcessing.core import BufferObject
 from iplotProcessing.core import Signal as ProcessingSignal
+from iplotProcessing.tools.namespace import LazyNamespace
 from iplotLogging import setupLogger
-import importlib
 import os
 
 logger = setupLogger.get_logger(__name__, "INFO")
 
 ParserT = typing.TypeVar("ParserT", bound="Parser")
+ContextT = typing.TypeVar("ContextT", bound="EvaluationContext")
 
 EXEC_PATH = __file__
 ROOT = os.path.dirname(EXEC_PATH)
 DEFAULT_PYTHON_MODULES_JSON = os.path.join(os.getenv('IPLOT_PMODULE_PATH', default=ROOT), 'default_modules.json')
+# Member lists of the configured modules, see LazyNamespace. A cache, kept in the user cache directory
+# since the package may be installed read-only.
+CACHE_PATH = os.getenv('IPLOT_CACHE_PATH', default=os.path.join(
+    os.getenv('XDG_CACHE_HOME', default=os.path.join(os.path.expanduser('~'), '.cache')), 'iplotProcessing'))
+MEMBER_INDEX_JSON = os.path.join(CACHE_PATH, 'member_index.json')
 
 DEFAULT_MODULES = "modules"
 USER_MODULES = "user_modules"
 
+# Number of compiled expressions kept by the parser, the least recently used one is dropped first.
+EXPRESSION_CACHE_SIZE = 256
+
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class CompiledExpression:
+    """The outcome of Parser.set_expression for an expression string, compiled with variable names
+    numbered from var_base."""
+
+    __slots__ = ('expression', 'code', 'var_map', 'var_base', 'marker_in_count', 'has_time_units', 'renamable')
+
+    def __init__(self, expression: str, code: types.CodeType, var_map: dict, var_base: int, marker_in_count: int,
+                 has_time_units: bool):
+        self.expression = expression
+        self.code = code
+        self.var_map = var_map
+        self.var_base = var_base
+        self.marker_in_count = marker_in_count
+        self.has_time_units = has_time_units
+        # names of nested code objects (ex: lambda) cannot be renamed by code.replace
+        self.renamable = not any(isinstance(c, types.CodeType) for c in code.co_consts)
+
 
 class SignalProxy(ProcessingSignal):
 
@@ -35,12 +67,29 @@ class SignalProxy(ProcessingSignal):
             self.data_store[1] = dict_result["data"]
 
 
+def _context_attribute(name: str) -> property:
+    """An attribute of the evaluation context of the calling thread, for the legacy Parser API."""
+
+    def fget(self):
+        return getattr(self.context, name)
+
+    def fset(self, value):
+        setattr(self.context, name, value)
+
+    return property(fget, fset)
+
+
 class Parser:
     """
         This class has been designed following the Singleton design pattern in order to guarantee the existence of a
         single instance of the class in the application.
         This avoids the injection and continuous loading of the modules that are imported by the user when processing
         the different expressions.
+
+        The parser holds what is shared: the module namespace, the supported members and the compiled expressions.
+        The state of an evaluation (expression, variables, result) lives in an EvaluationContext.
+        Threads evaluate expressions concurrently with their own contexts, see new_context().
+        The expression methods and attributes of the parser act on a default context private to the calling thread.
     """
 
     marker_in = "${"
@@ -49,34 +98,56 @@ class Parser:
     date_time_unit_pattern = rf"(\d+)([{''.join(DATE_TIME)}]\b|{'|'.join(PRECISE_TIME)})"
 
     _instance = None
+    _instance_lock = threading.Lock()
+
+    expression = _context_attribute('expression')
+    marker_in_count = _context_attribute('marker_in_count')
+    _compiled_obj = _context_attribute('_compiled_obj')
+    result = _context_attribute('result')
+    is_valid = _context_attribute('is_valid')
+    has_time_units = _context_attribute('has_time_units')
+    locals = _context_attribute('locals')
+    var_map = _context_attribute('var_map')
+    _var_counter = _context_attribute('_var_counter')
 
     def __new__(cls):
-        if not cls._instance:
-            cls._instance = super(Parser, cls).__new__(cls)
-            cls._instance._initialized = False
+        with Parser._instance_lock:
+            if not cls._instance:
+                cls._instance = super(Parser, cls).__new__(cls)
+                cls._instance._initialized = False
         return cls._instance
 
     def __init__(self):
-        if not self._initialized:
-            self._initialized = True
-            self.expression = ""
-            self.marker_in_count = 0
-            self._compiled_obj = None
-            self.result = None
-            self.is_valid = False
-            self.has_time_units = False
-            self._supported_member_names = set()
-            self._supported_members = dict()
+        with Parser._instance_lock:
+            if not self._initialized:
+                self._initialized = True
+                self._local = threading.local()
+                self._supported_members = LazyNamespace(MEMBER_INDEX_JSON)
 
-            self.inject(Parser.get_member_list(ProcessingSignal))
-            self.inject(Parser.get_member_list(BufferObject))
-            self.locals = {}
-            self.var_map = {}
-            self._var_counter = 0
+                self.cache_size = EXPRESSION_CACHE_SIZE
+                self._expr_cache = collections.OrderedDict()
+                self._cache_lock = threading.Lock()
+                self._cache_hits = 0
+                self._cache_misses = 0
 
-            self.config = {DEFAULT_MODULES: [], USER_MODULES: []}
-            self._access_to_config = True
-            self.init_modules()
+                self.inject(Parser.get_member_list(ProcessingSignal))
+                self.inject(Parser.get_member_list(BufferObject))
+
+                self.config = {DEFAULT_MODULES: [], USER_MODULES: []}
+                self._access_to_config = True
+                self.init_modules()
+
+    @property
+    def context(self) -> "EvaluationContext":
+        """The evaluation context of the calling thread, used by the expression methods of the parser."""
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            context = self._local.context = EvaluationContext(self)
+        return context
+
+    def new_context(self) -> "EvaluationContext":
+        """A new evaluation context on the namespace of this parser."""
+        return EvaluationContext(self)
 
     def has_access_to_config(self):
         return self._access_to_config
@@ -126,31 +197,10 @@ class Parser:
         if new_module == "":
             return
 
-        alias = None
-        recursive = False
-        # Check new module
-        if ' as ' in new_module:
-            module_parts = new_module.split(' as ')
-            module_name = module_parts[0]
-            alias = module_parts[1]
-        else:
-            module_parts = new_module.split('.')
-            if module_parts[-1] == '*':
-                recursive = True
-                module_name = '.'.join(module_parts[:-1])
-            else:
-                module_name = new_module
-
-        loaded_module = importlib.import_module(module_name)
-
-        self.inject({module_name: loaded_module})
-        if alias:
-            self.inject({alias: loaded_module})
-
-        if recursive:
-            self.load_submodules(loaded_module, module_name)
-        else:
-            self.inject(self.get_member_list(loaded_module))
+        # the module is imported on first reference to one of its names, see LazyNamespace
+        self._supported_members.add_module(new_module)
+        with self._cache_lock:
+            self._expr_cache.clear()
 
     def format_modules(self):
         # The correct format is set before starting to evaluate the modules
@@ -213,15 +263,143 @@ class Parser:
         return deleted_index
 
     @property
-    def supported_members(self) -> dict:
+    def supported_members(self) -> LazyNamespace:
         return self._supported_members
 
+    def is_supported(self, name: str) -> bool:
+        return self._supported_members.resolve(name)
+
     def inject(self, members: dict) -> ParserT:
-        self._supported_members.update(members)
-        for k in members.keys():
-            self._supported_member_names.add(k)
+        self._supported_members.inject(members)
+        # compiled expressions were validated against the previous names
+        with self._cache_lock:
+            self._expr_cache.clear()
+        return self
+
+    def cache_info(self) -> CacheInfo:
+        with self._cache_lock:
+            return CacheInfo(self._cache_hits, self._cache_misses, self.cache_size, len(self._expr_cache))
+
+    def cache_clear(self) -> ParserT:
+        with self._cache_lock:
+            self._expr_cache.clear()
+            self._cache_hits = 0
+            self._cache_misses = 0
         return self
 
+    def get_compiled(self, key: tuple, var_counter: int):
+        """The cached compilation of key usable from var_counter, None on a cache miss."""
+        with self._cache_lock:
+            entry = self._expr_cache.get(key)
+            if entry is None or (var_counter != entry.var_base and not entry.renamable):
+                self._cache_misses += 1
+                return None
+            self._expr_cache.move_to_end(key)
+            self._cache_hits += 1
+            return entry
+
+    def put_compiled(self, key: tuple, entry: CompiledExpression):
+        with self._cache_lock:
+            if self.cache_size <= 0:
+                return
+            self._expr_cache[key] = entry
+            self._expr_cache.move_to_end(key)
+            while len(self._expr_cache) > self.cache_size:
+                self._expr_cache.popitem(last=False)
+
+    def replace_var(self, expr: str) -> str:
+        return self.context.replace_var(expr)
+
+    def clear_expr(self) -> ParserT:
+        self.context.clear_expr()
+        return self
+
+    def is_syntax_valid(self, expr: str) -> bool:
+        return self.context.is_syntax_valid(expr)
+
+    def set_expression(self, expr: str, is_expression: bool = False) -> ParserT:
+        self.context.set_expression(expr, is_expression)
+        return self
+
+    def validate_pre_compile(self):
+        self.context.validate_pre_compile()
+
+    def validate_post_compile(self):
+        self.context.validate_post_compile()
+
+    @staticmethod
+    def get_member_list(parent):
+        return dict(getmembers(parent))
+
+    def substitute_var(self, val_map, dict_result=None) -> ParserT:
+        self.context.substitute_var(val_map, dict_result)
+        return self
+
+    def eval_expr(self) -> ParserT:
+        self.context.eval_expr()
+        return self
+
+    @staticmethod
+    def get_var_expression(expr: str):
+        import re
+        matches = re.findall(r'\$\{.*?\}', expr)
+        variables = []
+        for exp in matches:
+            marker_in_pos = exp.find(Parser.marker_in)
+            marker_out_pos = exp.find(Parser.marker_out)
+            var = exp[marker_in_pos + len(Parser.marker_in):marker_out_pos]
+            variables.append(var)
+
+        return variables
+
+
+class EvaluationContext:
+    """The state of the evaluation of an expression: the expression, its variables and the result.
+    Contexts of the same parser share its namespace and compiled expressions, a context is used by one thread at a time.
+    """
+
+    def __init__(self, parser: Parser):
+        self.parser = parser
+        self.expression = ""
+        self.marker_in_count = 0
+        self._compiled_obj = None
+        self.result = None
+        self.is_valid = False
+        self.has_time_units = False
+        self.locals = {}
+        self.var_map = {}
+        self._var_counter = 0
+
+    def _load_compiled(self, key: tuple) -> bool:
+        """Set up the context from the cached compilation of an expression. Returns False on a cache miss."""
+        entry = self.parser.get_compiled(key, self._var_counter)
+        if entry is None:
+            return False
+        offset = self._var_counter - entry.var_base
+
+        expression, code, var_map = entry.expression, entry.code, entry.var_map
+        if offset:
+            # the variables are numbered from the current counter, as replace_var would do
+            prefix = self.parser.prefix
+            names = {v: prefix + str(int(v[len(prefix):]) + offset) for v in var_map.values()}
+            var_map = {k: names[v] for k, v in var_map.items()}
+            code = code.replace(co_names=tuple(names.get(name, name) for name in code.co_names))
+            expression = re.sub(rf"\b{prefix}\d+\b", lambda m: names.get(m.group(0), m.group(0)), expression)
+
+        self.expression = expression
+        self._compiled_obj = code
+        self.var_map = dict(var_map)
+        self._var_counter += len(var_map)
+        self.marker_in_count = entry.marker_in_count
+        self.is_valid = True
+        if entry.has_time_units:
+            self.has_time_units = True
+        return True
+
+    def _store_compiled(self, key: tuple, var_base: int, has_time_units: bool):
+        self.parser.put_compiled(key, CompiledExpression(self.expression, self._compiled_obj, dict(self.var_map),
+                                                         var_base, self.marker_in_count, has_time_units))
+
     def replace_var(self, expr: str) -> str:
         new_expr = expr
         self.var_map = {}
@@ -229,16 +407,16 @@ class Parser:
         counter = 0
         while True:
 
-            if new_expr.find(self.marker_in) == -1 or new_expr.find(self.marker_out) == -1:
+            if new_expr.find(self.parser.marker_in) == -1 or new_expr.find(self.parser.marker_out) == -1:
                 break
-            marker_in_pos = new_expr.find(self.marker_in)
-            marker_out_pos = new_expr.find(self.marker_out)
-            var = new_expr[marker_in_pos + len(self.marker_in):marker_out_pos]
+            marker_in_pos = new_expr.find(self.parser.marker_in)
+            marker_out_pos = new_expr.find(self.parser.marker_out)
+            var = new_expr[marker_in_pos + len(self.parser.marker_in):marker_out_pos]
 
             if var not in self.var_map.keys():
-                self.var_map[var] = self.prefix + str(self._var_counter)
+                self.var_map[var] = self.parser.prefix + str(self._var_counter)
                 self._var_counter = self._var_counter + 1
-                match = self.marker_in + var + self.marker_out
+                match = self.parser.marker_in + var + self.parser.marker_out
                 replc = self.var_map[var]
                 new_expr = new_expr.replace(match, replc)
                 logger.debug(f"new_expr = {new_expr} and new_key = {var}")
@@ -250,7 +428,7 @@ class Parser:
 
         return new_expr
 
-    def clear_expr(self) -> ParserT:
+    def clear_expr(self) -> ContextT:
         self.expression = ""
         self._compiled_obj = None
         self.result = None
@@ -281,19 +459,23 @@ class Parser:
 
         return True
 
-    def set_expression(self, expr: str, is_expression: bool = False) -> ParserT:
-        if expr.find(self.marker_in) == -1 and expr.find(self.marker_out) == -1 and not is_expression:
+    def set_expression(self, expr: str, is_expression: bool = False) -> ContextT:
+        if expr.find(self.parser.marker_in) == -1 and expr.find(self.parser.marker_out) == -1 and not is_expression:
             self.expression = expr
             self.is_valid = False
+        elif self._load_compiled((expr, is_expression)):
+            return self
         else:
             if not self.is_syntax_valid(expr):
                 raise InvalidExpression(f"Invalid expression {expr}, variable should be '${{varname1}}  ${{varname2}}'")
             else:
+                var_base = self._var_counter
                 self.expression = self.replace_var(expr)
                 self.is_valid = True
 
                 # parse time vector math
-                for digit, unit in re.findall(self.date_time_unit_pattern, self.expression):
+                time_units = re.findall(self.parser.date_time_unit_pattern, self.expression)
+                for digit, unit in time_units:
                     self.has_time_units = True
                     match = f"{digit}{unit}"
                     replc = "np.timedelta64({},'{}')".format(int(digit), unit)
@@ -308,6 +490,7 @@ class Parser:
                     raise InvalidExpression(f"Syntax error {se}")
                 except ValueError as ve:
                     raise InvalidExpression(f"Parsing error {ve}")
+                self._store_compiled((expr, is_expression), var_base, bool(time_units))
 
         return self
 
@@ -328,14 +511,10 @@ class Parser:
         # print(self.supported_members)
         if self._compiled_obj:
             for name in self._compiled_obj.co_names:
-                if name not in self._supported_member_names and name not in self.var_map.values():
+                if name not in self.var_map.values() and not self.parser.is_supported(name):
                     raise InvalidExpression(f"Undefined name {name}")
 
-    @staticmethod
-    def get_member_list(parent):
-        return dict(getmembers(parent))
-
-    def substitute_var(self, val_map, dict_result=None) -> ParserT:
+    def substitute_var(self, val_map, dict_result=None) -> ContextT:
         for k in val_map.keys():
             if self.var_map.get(k):
                 if not dict_result:
@@ -349,11 +528,12 @@ class Parser:
                         self.locals[self.var_map[k]] = SignalProxy(dict_result[k])
         return self
 
-    def eval_expr(self) -> ParserT:
+    def eval_expr(self) -> ContextT:
         if self._compiled_obj is not None:
             try:
                 # logger.debug("eval exception ")
-                self.result = eval(self._compiled_obj, self.supported_members, self.locals)
+                self.parser.supported_members.prepare(self._compiled_obj.co_names)
+                self.result = eval(self._compiled_obj, self.parser.supported_members, self.locals)
             except ValueError as ve:
                 raise InvalidExpression(f"Value error {ve}")
             except TypeError as te:
@@ -361,16 +541,3 @@ class Parser:
                 raise InvalidVariable(self.var_map, self.locals)
 
         return self
-
-    @staticmethod
-    def get_var_expression(expr: str):
-        import re
-        matches = re.findall(r'\$\{.*?\}', expr)
-        variables = []
-        for exp in matches:
-            marker_in_pos = exp.find(Parser.marker_in)
-            marker_out_pos = exp.find(Parser.marker_out)
-            var = exp[marker_in_pos + len(Parser.marker_in):marker_out_pos]
-            variables.append(var)
-
-        return variables